@@ -0,0 +1,58 @@
+# 파일 경로: batch_render.py
+# 저장된 .wsb 프로젝트를 Tk 창 없이 PNG/JPG/WebP 로 일괄 렌더링하는 명령줄 도구
+#
+# 사용 예:
+#   python batch_render.py projects/ -o out/ -f JPG -j 4
+#   python batch_render.py projects/ -f WEBP --max-kb 500
+
+import sys
+import os
+import time
+import argparse
+
+application_path = os.path.dirname(os.path.abspath(__file__))
+if application_path not in sys.path:
+    sys.path.insert(0, application_path)
+
+from tabs.easel.services.batch_service import BatchRenderService
+from tabs.easel.services.encoder_service import ENCODER_FORMATS
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CiTRUS .wsb 프로젝트 일괄 렌더링")
+    parser.add_argument("inputs", nargs="+", help=".wsb 파일 또는 .wsb 파일이 들어있는 폴더")
+    parser.add_argument("-o", "--output-dir", default=None, help="출력 폴더 (기본값: 각 프로젝트 파일과 같은 폴더)")
+    parser.add_argument("-f", "--format", choices=list(ENCODER_FORMATS), default=None, help="출력 형식 (기본값: 프로젝트 설정)")
+    parser.add_argument("--max-kb", type=int, default=None, help="파일당 최대 용량(KB). 넘으면 품질을 낮춰 다시 인코딩 (0=제한 없음, 기본값: 프로젝트 설정)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="동시에 렌더링할 프로세스 수 (기본값: CPU 코어 수)")
+    return parser.parse_args(argv)
+
+def print_result(result):
+    name = os.path.basename(result['project'])
+    if result['ok']:
+        print(f"[OK]   {name} -> {result['output']} ({result['seconds']:.2f}s)")
+    else:
+        print(f"[FAIL] {name}: {result['error']} ({result['seconds']:.2f}s)")
+    for missing in result.get('missing_files', []):
+        print(f"       누락된 이미지: {missing}")
+    for path in result.get('oversize', []):
+        print(f"       용량 초과: {path}")
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    project_paths = BatchRenderService.collect_project_paths(args.inputs)
+    if not project_paths:
+        print("렌더링할 .wsb 프로젝트가 없습니다.")
+        return 1
+
+    print(f"--- {len(project_paths)}개 프로젝트 렌더링 시작 ---")
+    started = time.perf_counter()
+    results = BatchRenderService.render_projects(
+        project_paths, output_dir=args.output_dir, output_format=args.format,
+        workers=args.jobs, on_result=print_result, max_file_kb=args.max_kb
+    )
+    failed = [r for r in results if not r['ok']]
+    print(f"--- 완료: 성공 {len(results) - len(failed)}개, 실패 {len(failed)}개, 총 {time.perf_counter() - started:.2f}s ---")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
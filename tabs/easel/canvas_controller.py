@@ -1,11 +1,24 @@
 import tkinter as tk
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image
 import math
 import os
 
 from .models.layer import Layer, ImageLayer, TextLayer, ShapeLayer
-from .services.font_service import FontService
 from .services.image_service import ImageService
+from .services.shape_rasterizer import ShapeRasterizer, DISPLAY_SUPERSAMPLE
+from .services.render_cache import display_render_cache, display_fingerprint
+from .services.display_render_pool import DisplayRenderPool
+from .services.tiled_display import TiledDisplay
+from .photo_image_pool import PhotoImagePool
+from .services.frame_profiler import frame_profiler, profiled
+
+# 회전/리사이즈 제스처 중 미리보기용 리샘플링 필터 (놓는 순간 고품질로 다시 그림)
+INTERACTIVE_RESAMPLE = Image.Resampling.BILINEAR
+# 보이는 영역 바깥 이 여백(px) 안에 걸치는 레이어까지 미리 그림 (스크롤 직후 빈 화면 방지)
+VIEWPORT_CULL_MARGIN = 256
+# 배경 합성 미리보기: 캔버스가 이보다 크면 합성 비트맵 대신 개별 항목으로 표시 (타일/컬링 사용)
+FLATTEN_MAX_PIXELS = 4096 * 4096
+FLATTENED_KEY = '__flattened__'
 
 class CanvasController:
     def __init__(self, canvas: tk.Canvas, controller):
@@ -14,6 +27,13 @@ class CanvasController:
         self.canvas_objects = {}
         self.active_selection_path: str | None = None
         self.fit_scale = 1.0
+        # 진행 중인 회전/리사이즈 제스처: {'path', 'base': 회전 전 기준 비트맵, 'scale': 기준 비트맵의 scale 값}
+        self._interactive: dict | None = None
+        self.render_pool = DisplayRenderPool(canvas)
+        self.photo_pool = PhotoImagePool()
+        # 배경 합성 미리보기 항목: {'id', 'tk_img', 'signature', 'image'}
+        self._flattened: dict | None = None
+        self._flatten_after_id = None
 
     def add_layer_to_canvas(self, layer: Layer):
         if layer.path in self.canvas_objects:
@@ -26,6 +46,7 @@ class CanvasController:
 
         self.canvas_objects[layer.path] = {
             'id': item_id,
+            'path': layer.path,
             'type': layer.type,
             'tk_img': None,
             'pil_for_display': None,
@@ -48,10 +69,18 @@ class CanvasController:
         if layer.path in self.canvas_objects:
             item_id = self.canvas_objects[layer.path]['id']
             self.canvas.delete(item_id)
+            self.photo_pool.release(self.canvas_objects[layer.path]['tk_img'])
+            self._clear_placeholder(self.canvas_objects[layer.path])
+            self._clear_tiles(self.canvas_objects[layer.path])
+            self.render_pool.invalidate(layer.path)
+            if self.canvas_objects[layer.path].get('flattened'):
+                self.schedule_flatten_refresh()
             del self.canvas_objects[layer.path]
+            self.controller.view.render_scheduler.discard_object(layer.path)
             if self.active_selection_path == layer.path:
                 self.clear_resize_handles()
 
+    @profiled('update_object_display')
     def update_object_display(self, layer_or_logo: Layer | dict, zoom: float):
         is_logo = isinstance(layer_or_logo, dict) and layer_or_logo.get('type') == 'logo'
         path = layer_or_logo.get('path') if is_logo else layer_or_logo.path
@@ -67,116 +96,477 @@ class CanvasController:
 
         actual_zoom = self.fit_scale * zoom
 
-        pil_img = None
+        x = obj_info['rel_x'] * canvas_w
+        y = obj_info['rel_y'] * canvas_h
+        self.canvas.coords(item_id, x, y)
+
         if is_logo:
-             pil_img = self.controller._get_display_pil_for_logo(actual_zoom)
-        else:
-             pil_img = self._get_display_pil_for_layer(layer_or_logo, actual_zoom)
+             self._apply_display(path, obj_info, self.controller._get_display_pil_for_logo(actual_zoom))
+             return
+
+        if obj_info.get('flattened') and path not in self._get_live_paths():
+             self.schedule_flatten_refresh() # 배경 합성에 포함된 레이어는 합성 비트맵을 다시 만듦
+             return
+
+        if not self._is_in_viewport(layer_or_logo, (x, y), actual_zoom):
+             self._cull_object(path, obj_info)
+             return
+        obj_info['culled'] = False
+
+        job = self._prepare_layer_display(layer_or_logo, actual_zoom)
+        if job.get('load'):
+             # 디코딩이 필요한 레벨은 작업 스레드에서 읽은 뒤 메인 스레드에서 다시 준비
+             self._show_placeholder(obj_info, (x, y), job['size'])
+             self.render_pool.submit(path, job['load'], lambda _result, path=path: self._on_levels_loaded(path))
+             return
+        if job.get('tiled'):
+             self.render_pool.invalidate(path)
+             self._apply_tiled_display(path, obj_info, job['tiled'])
+             return
+        if job['render'] is None:
+             self.render_pool.invalidate(path) # 진행 중인 이전 작업 결과가 덮어쓰지 않도록
+             self._apply_display(path, obj_info, job['image'])
+             return
+
+        self._show_placeholder(obj_info, (x, y), job['size'])
+        self.render_pool.submit(path, job['render'], lambda pil_img, path=path: self._on_display_ready(path, pil_img))
+
+    def _is_in_viewport(self, layer: Layer, center: tuple[float, float], actual_zoom: float) -> bool:
+        """레이어의 예상 표시 영역이 보이는 영역(+여백)과 겹치는지. 진행 중인 제스처 대상은 항상 그림"""
+        if self._get_interactive(layer):
+            return True
+        region = self.controller.view.get_visible_canvas_region()
+        size = self.controller._get_temp_display_size(layer, layer.scale_var.get(), actual_zoom)
+        if region is None or size is None:
+            return True
+        x, y = center
+        half_w, half_h = size[0] / 2 + VIEWPORT_CULL_MARGIN, size[1] / 2 + VIEWPORT_CULL_MARGIN
+        x0, y0, x1, y1 = region
+        return x + half_w > x0 and x - half_w < x1 and y + half_h > y0 and y - half_h < y1
+
+    def _cull_object(self, path: str, obj_info: dict):
+        """보이지 않는 레이어는 그리지 않고 표시용 비트맵을 해제합니다. 스크롤로 보이게 되면 그때 그립니다."""
+        self.render_pool.invalidate(path)
+        self._clear_placeholder(obj_info)
+        self._clear_tiles(obj_info)
+        obj_info['culled'] = True
+        obj_info['pil_for_display'] = None
+        self.canvas.itemconfig(obj_info['id'], image='', state='hidden')
+        self.photo_pool.release(obj_info['tk_img'])
+        obj_info['tk_img'] = None
+        if self.active_selection_path == path:
+            # 선택은 유지하고 핸들만 지움 (다시 보이면 _apply_display 에서 핸들을 다시 만듦)
+            self.clear_resize_handles()
+            self.active_selection_path = path
+
+    def update_newly_visible_objects(self):
+        """스크롤 후 보이는 영역에 들어온, 그리기가 미뤄진 레이어만 그립니다."""
+        zoom = self.controller.get_zoom()
+        for layer in self.controller.get_layers():
+            obj_info = self.canvas_objects.get(layer.path)
+            if obj_info and obj_info.get('culled') and layer.is_visible.get():
+                self.update_object_display(layer, zoom)
+            elif obj_info and obj_info.get('tiled'):
+                self._update_tiles(obj_info)
+
+    def _get_live_paths(self) -> set:
+        """배경 합성에서 빼고 개별 항목으로 그릴 레이어: 선택된 레이어, 핸들이 활성화된 레이어, 제스처 중인 레이어"""
+        live = {layer.path for layer in self.controller.get_layers() if layer.selected}
+        if self.active_selection_path:
+            live.add(self.active_selection_path)
+        if self._interactive:
+            live.add(self._interactive['path'])
+        return live
+
+    def schedule_flatten_refresh(self):
+        if self._flatten_after_id is None:
+            self._flatten_after_id = self.canvas.after_idle(self.refresh_flattened)
+
+    def refresh_flattened(self):
+        """
+        배경 합성 미리보기가 켜져 있으면 활성 레이어를 제외한 모든 표시 레이어를 캔버스 크기 비트맵 한 장으로 합성해
+        가장 아래 항목 하나로 표시합니다. 합성 대상 레이어의 상태(지문)가 바뀌었을 때만 다시 합성합니다.
+        """
+        self._flatten_after_id = None
+        zoom = self.controller.get_zoom()
+        canvas_w, canvas_h = self.get_canvas_size(zoom)
+        actual_zoom = self.fit_scale * zoom
+        enabled = self.controller.settings['flatten_preview'].get() and canvas_w * canvas_h <= FLATTEN_MAX_PIXELS
+        live = self._get_live_paths()
+        flat_layers = [layer for layer in self.controller.get_layers()
+                       if enabled and layer.is_visible.get() and layer.path in self.canvas_objects and layer.path not in live]
+        flat_paths = {layer.path for layer in flat_layers}
+
+        # 합성에서 빠진 레이어는 다시 개별 항목으로 그림
+        for layer in self.controller.get_layers():
+            obj_info = self.canvas_objects.get(layer.path)
+            if obj_info and obj_info.get('flattened') and layer.path not in flat_paths:
+                obj_info['flattened'] = False
+                self.update_object_display(layer, zoom)
+        if not flat_layers:
+            self._clear_flattened()
+            return
+
+        for layer in flat_layers:
+            obj_info = self.canvas_objects[layer.path]
+            if not obj_info.get('flattened'):
+                self._flatten_object(layer.path, obj_info)
+            size = self.controller._get_temp_display_size(layer, layer.scale_var.get(), actual_zoom) or (0, 0)
+            x, y = obj_info['rel_x'] * canvas_w, obj_info['rel_y'] * canvas_h
+            obj_info['flat_bbox'] = (x - size[0] / 2, y - size[1] / 2, x + size[0] / 2, y + size[1] / 2)
 
+        signature = (canvas_w, canvas_h, tuple(self._flatten_signature(layer) for layer in flat_layers))
+        if self._flattened and self._flattened['signature'] == signature:
+            return
+
+        # 아래 레이어부터 합성 (목록 앞쪽이 위)
+        jobs = []
+        for layer in reversed(flat_layers):
+            obj_info = self.canvas_objects[layer.path]
+            center = (obj_info['rel_x'] * canvas_w, obj_info['rel_y'] * canvas_h)
+            jobs.append((center, self._prepare_layer_display(layer, actual_zoom)))
+
+        def render():
+            composite = Image.new('RGBA', (canvas_w, canvas_h), (0, 0, 0, 0))
+            for (x, y), job in jobs:
+                tiled = job.get('tiled')
+                if tiled:
+                    left, top = int(x - tiled.width / 2), int(y - tiled.height / 2)
+                    for column, row in tiled.tiles_in_region((-left, -top, canvas_w - left, canvas_h - top)):
+                        x0, y0, _x1, _y1 = tiled.tile_rect(column, row)
+                        ImageService._composite_clipped(composite, tiled.render_tile(column, row).convert('RGBA'), (left + x0, top + y0))
+                    continue
+                bitmap = job['image'] if job['render'] is None else job['render']()
+                if bitmap is not None:
+                    pos = (int(x - bitmap.width / 2), int(y - bitmap.height / 2))
+                    ImageService._composite_clipped(composite, bitmap.convert('RGBA'), pos)
+            return composite
+
+        if self._flattened is None:
+            item_id = self.canvas.create_image(0, 0, anchor='nw', tags=('flattened',))
+            self._flattened = {'id': item_id, 'tk_img': None, 'image': None}
+        self._flattened['signature'] = signature
+        self.render_pool.submit(FLATTENED_KEY, render, self._apply_flattened)
+
+    def _flatten_signature(self, layer: Layer) -> tuple:
+        obj_info = self.canvas_objects[layer.path]
+        return (layer.path, layer.source_version, layer.scale_var.get(), layer.angle, obj_info['rel_x'], obj_info['rel_y'],
+                getattr(layer, 'crop_box', None), getattr(layer, 'text', None), getattr(layer, 'font_family', None),
+                getattr(layer, 'color', None), getattr(layer, 'shape_type', None))
+
+    def _flatten_object(self, path: str, obj_info: dict):
+        """배경 합성에 포함되는 레이어의 개별 항목을 숨기고 표시용 자원을 해제합니다."""
+        self.render_pool.invalidate(path)
+        self._clear_placeholder(obj_info)
+        self._clear_tiles(obj_info)
+        obj_info['flattened'] = True
+        obj_info['culled'] = False
+        obj_info['pil_for_display'] = None
+        self.canvas.itemconfig(obj_info['id'], image='', state='hidden')
+        self.photo_pool.release(obj_info['tk_img'])
+        obj_info['tk_img'] = None
+
+    def _apply_flattened(self, composite: Image.Image | None):
+        if self._flattened is None or composite is None:
+            return
+        with frame_profiler.measure('photo_upload'):
+            self._flattened['tk_img'] = self.photo_pool.acquire(composite, self._flattened['tk_img'])
+        self._flattened['image'] = composite
+        self.canvas.itemconfig(self._flattened['id'], image=self._flattened['tk_img'])
+        self.canvas.tag_lower(self._flattened['id'])
+
+    def _clear_flattened(self):
+        self.render_pool.invalidate(FLATTENED_KEY)
+        if self._flattened:
+            self.canvas.delete(self._flattened['id'])
+            self.photo_pool.release(self._flattened['tk_img'])
+            self._flattened = None
+
+    def find_flattened_item_at(self, x: float, y: float) -> int | None:
+        """
+        배경 합성에 포함된 레이어는 캔버스 항목이 없으므로 예상 표시 영역(bbox)으로 클릭 대상을 찾습니다.
+        합성 비트맵의 해당 위치가 투명하면 아무것도 없는 것으로 봅니다. 찾으면 레이어의 (숨겨진) 기준 항목 id 를 반환합니다.
+        """
+        if not self._flattened or self._flattened['image'] is None:
+            return None
+        composite = self._flattened['image']
+        if not (0 <= x < composite.width and 0 <= y < composite.height) or composite.getpixel((int(x), int(y)))[3] < 10:
+            return None
+        for layer in self.controller.get_layers(): # 목록 앞쪽이 위
+            obj_info = self.canvas_objects.get(layer.path)
+            if obj_info and obj_info.get('flattened'):
+                x0, y0, x1, y1 = obj_info['flat_bbox']
+                if x0 <= x < x1 and y0 <= y < y1:
+                    return obj_info['id']
+        return None
+
+    def _on_levels_loaded(self, path: str):
+        layer = self.controller.get_layer_by_path(path)
+        if layer is None or path not in self.canvas_objects:
+            return
+        self.controller.view.layer_list.refresh_thumbnail(layer)
+        if layer.is_visible.get():
+            self.update_object_display(layer, self.controller.get_zoom())
+
+    def preload_levels(self, layers: list[Layer]):
+        """준비되지 않은 이미지 레이어의 표시용 이미지를 작업 스레드에서 읽어 둡니다. (프로젝트 불러오기 후 썸네일용)"""
+        for layer in layers:
+            if isinstance(layer, ImageLayer) and not layer.levels_ready():
+                self.render_pool.submit((layer.path, 'levels'), layer.load_levels,
+                                        lambda _result, layer=layer: self.controller.view.layer_list.refresh_thumbnail(layer))
+
+    def _on_display_ready(self, path: str, pil_img: Image.Image | None):
+        obj_info = self.canvas_objects.get(path)
+        if obj_info:
+            self._apply_display(path, obj_info, pil_img)
+
+    def _apply_display(self, path: str, obj_info: dict, pil_img: Image.Image | None):
+        """완성된 표시용 비트맵을 캔버스 항목에 적용합니다. (메인 스레드 전용)"""
+        self._clear_placeholder(obj_info)
+        self._clear_tiles(obj_info)
+        item_id = obj_info['id']
         if pil_img is None:
              self.canvas.itemconfig(item_id, state='hidden')
              return
-        else:
-             self.canvas.itemconfig(item_id, state='normal')
 
-        obj_info['tk_img'] = ImageTk.PhotoImage(pil_img)
+        # 크기가 같으면 기존 PhotoImage 에 픽셀만 덮어씀
+        with frame_profiler.measure('photo_upload'):
+            obj_info['tk_img'] = self.photo_pool.acquire(pil_img, obj_info['tk_img'])
         obj_info['pil_for_display'] = pil_img
-        self.canvas.itemconfig(item_id, image=obj_info['tk_img'])
+        self.canvas.itemconfig(item_id, image=obj_info['tk_img'], state='normal')
 
-        x = obj_info['rel_x'] * canvas_w
-        y = obj_info['rel_y'] * canvas_h
-        self.canvas.coords(item_id, x, y)
+        if self.active_selection_path == path:
+             self.activate_resize_handles(path)
+
+    def _apply_tiled_display(self, path: str, obj_info: dict, tiled: TiledDisplay):
+        """
+        큰 표시용 비트맵 대신 타일을 사용합니다. 기준 항목(obj_info['id'])은 이미지 없이 중심 위치만 유지하고,
+        보이는 타일만 ('item', path, 'tile') 태그의 별도 이미지 항목으로 만듭니다.
+        """
+        self._clear_placeholder(obj_info)
+        if obj_info.get('tiled') is not tiled:
+            self._clear_tiles(obj_info)
+            obj_info['tiled'] = tiled
+        obj_info['pil_for_display'] = tiled
+        self.canvas.itemconfig(obj_info['id'], image='', state='normal')
+        self.photo_pool.release(obj_info['tk_img'])
+        obj_info['tk_img'] = None
+        self._update_tiles(obj_info)
 
         if self.active_selection_path == path:
              self.activate_resize_handles(path)
 
-    def _get_display_pil_for_layer(self, layer: Layer, actual_zoom: float) -> Image.Image | None:
-        img = None
-        target_w, target_h = 0, 0
-        original_pil = None
+    def _update_tiles(self, obj_info: dict):
+        """보이는 영역(+여백)과 겹치는 타일 항목만 남기고, 새로 필요한 타일은 캐시 또는 작업 스레드에서 가져옵니다."""
+        tiled = obj_info['tiled']
+        cx, cy = self.canvas.coords(obj_info['id'])
+        left, top = cx - tiled.width / 2, cy - tiled.height / 2
+        region = self.controller.view.get_visible_canvas_region() or (0, 0, *self.get_canvas_size())
+        margin = VIEWPORT_CULL_MARGIN
+        needed = tiled.tiles_in_region((region[0] - margin - left, region[1] - margin - top,
+                                        region[2] + margin - left, region[3] + margin - top))
+
+        for key in [key for key in tiled.items if key not in needed]:
+            item = tiled.items.pop(key)
+            self.canvas.delete(item['id'])
+            self.photo_pool.release(item['tk_img'])
+        for column, row in needed:
+            x0, y0, _x1, _y1 = tiled.tile_rect(column, row)
+            item = tiled.items.get((column, row))
+            if item:
+                self.canvas.coords(item['id'], left + x0, top + y0)
+                continue
+            item_id = self.canvas.create_image(left + x0, top + y0, anchor='nw', tags=('item', obj_info['path'], 'tile'))
+            self.canvas.lift(item_id, obj_info['id'])
+            tiled.items[(column, row)] = {'id': item_id, 'tk_img': None}
+            cached = tiled.get_cached_tile(column, row)
+            if cached is not None:
+                self._apply_tile(obj_info, tiled, (column, row), cached)
+            else:
+                self.render_pool.submit((obj_info['path'], column, row),
+                                        lambda c=column, r=row: tiled.render_tile(c, r),
+                                        lambda tile, key=(column, row): self._apply_tile(obj_info, tiled, key, tile))
+
+    def _apply_tile(self, obj_info: dict, tiled: TiledDisplay, key: tuple[int, int], tile: Image.Image | None):
+        # 그 사이 배율이 바뀌었거나 타일이 화면 밖으로 나갔으면 버림
+        if tile is None or obj_info.get('tiled') is not tiled or key not in tiled.items:
+            return
+        item = tiled.items[key]
+        with frame_profiler.measure('photo_upload'):
+            item['tk_img'] = self.photo_pool.acquire(tile, item['tk_img'])
+        self.canvas.itemconfig(item['id'], image=item['tk_img'])
+
+    def _clear_tiles(self, obj_info: dict):
+        tiled = obj_info.pop('tiled', None)
+        if tiled:
+            for item in tiled.items.values():
+                self.canvas.delete(item['id'])
+                self.photo_pool.release(item['tk_img'])
+            tiled.items.clear()
+
+    def _show_placeholder(self, obj_info: dict, center: tuple[float, float], size: tuple[int, int] | None):
+        """
+        비트맵이 준비될 때까지 표시할 자리 표시자. 이전 비트맵이 있으면 그대로 두고,
+        처음 그리는 객체는 예상 크기의 점선 사각형을 표시합니다.
+        """
+        if obj_info.get('tk_img') is not None or obj_info.get('tiled') or not size:
+            return
+        x, y = center
+        w, h = size
+        coords = (x - w / 2, y - h / 2, x + w / 2, y + h / 2)
+        if obj_info.get('placeholder_id'):
+            self.canvas.coords(obj_info['placeholder_id'], *coords)
+        else:
+            obj_info['placeholder_id'] = self.canvas.create_rectangle(
+                *coords, outline='gray60', dash=(4, 4), tags=('placeholder',))
+
+    def _clear_placeholder(self, obj_info: dict):
+        if obj_info.get('placeholder_id'):
+            self.canvas.delete(obj_info.pop('placeholder_id'))
+
+    @profiled('prepare_display')
+    def _prepare_layer_display(self, layer: Layer, actual_zoom: float) -> dict:
+        """
+        메인 스레드에서 Tk 변수와 원본 레벨을 읽어 표시용 비트맵 작업을 준비합니다.
+        바로 만들 수 있으면(캐시 적중, 제스처 미리보기) {'image'} 를, 아니면 작업 스레드에서 실행할
+        {'render'} 와 자리 표시자용 예상 크기 {'size'} 를 반환합니다.
+        이미지 레이어의 레벨 디코딩이 필요하면 메인 스레드에서 디코딩하지 않고 {'load'} (레벨을 읽는 함수) 도 함께 반환합니다.
+        """
+        angle = layer.angle
+        interactive = self._get_interactive(layer)
 
         if isinstance(layer, ImageLayer):
-            original_pil = layer.get_pil_image_to_process()
-            content_w, content_h = layer.get_content_dimensions()
-            
             canvas_h_logical = self.controller.settings['output_height'].get()
             logo_zone_h_logical = canvas_h_logical * (self.controller.settings['logo_zone_height'].get() / 1500.0)
-            
             target_h_logical = (canvas_h_logical - logo_zone_h_logical) * (layer.scale_var.get() / 100.0)
 
-            if content_h > 0:
-                ratio = target_h_logical / content_h
-                target_w = int(original_pil.width * ratio * actual_zoom)
-                target_h = int(original_pil.height * ratio * actual_zoom)
-            else:
-                 return None
+            if layer.levels_ready():
+                size = self._image_target_size(layer, target_h_logical, actual_zoom)
+                if size is None: return self._ready(None)
+                # 확대 표시 시 800px 표시용 이미지를 늘리지 않도록 필요한 크기 이상의 레벨 선택 (메모리에 있을 때만)
+                selected = layer.select_source(*size, loaded_only=True)
+                if selected is not None:
+                    return self._prepare_resample(layer, selected[0], selected[1], size, angle, interactive)
 
-        elif isinstance(layer, TextLayer):
-            try:
-                font_size = int(layer.scale_var.get() * actual_zoom)
-                if font_size < 1: return None
-                font = ImageFont.truetype(FontService.get_font_path(layer.font_family), font_size)
-                
-                bbox = font.getbbox(layer.text)
-                text_w = bbox[2] - bbox[0]
-                text_h = bbox[3] - bbox[1]
-                if text_w <= 0 or text_h <= 0: return None
+            def load():
+                size = self._image_target_size(layer, target_h_logical, actual_zoom)
+                return (layer.select_source(*size), size) if size else None
+
+            def render():
+                loaded = load()
+                if loaded is None: return None
+                (source, source_box), size = loaded
+                return ImageService.scale_rotate(source, size, angle, box=source_box)
 
-                img = Image.new('RGBA', (text_w, text_h), (0, 0, 0, 0))
-                draw = ImageDraw.Draw(img)
-                draw.text((-bbox[0], -bbox[1]), layer.text, font=font, fill=layer.color)
-                original_pil = img
+            estimate = self._image_target_size(layer, target_h_logical, actual_zoom, estimate=True)
+            return {'image': None, 'render': render, 'load': load,
+                    'size': ImageService.get_rotated_size(estimate, angle) if estimate else None}
 
-            except Exception:
-                return None
+        elif isinstance(layer, TextLayer):
+            if interactive and interactive['base'] is not None:
+                # 제스처 중에는 폰트로 다시 그리지 않고 기준 비트맵을 배율만큼 늘리고 회전
+                base, ratio = interactive['base'], layer.scale_var.get() / interactive['scale']
+                target_w, target_h = int(base.width * ratio), int(base.height * ratio)
+                if target_w < 1 or target_h < 1: return self._ready(None)
+                return self._ready(ImageService.scale_rotate(base, (target_w, target_h), angle, resample=INTERACTIVE_RESAMPLE))
+
+            font_size = int(layer.scale_var.get() * actual_zoom)
+            if font_size < 1: return self._ready(None)
+            text, font_family, color = layer.text, layer.font_family, layer.color
+            if interactive:
+                # 제스처 첫 프레임은 기준 비트맵이 바로 필요하므로 메인 스레드에서 렌더링
+                try:
+                    base = ImageService.render_text(text, font_family, font_size, color)
+                except Exception:
+                    return self._ready(None)
+                interactive.update(base=base, scale=layer.scale_var.get())
+                return self._ready(self._rotate_text(base, angle))
+
+            def render():
+                return self._rotate_text(ImageService.render_text(text, font_family, font_size, color), angle)
+            return {'image': None, 'render': render, 'size': None}
 
         elif isinstance(layer, ShapeLayer):
             if layer.shape_type == '자유곡선':
-                original_pil = layer.pil_image
-                if original_pil:
-                     scale_factor = layer.scale_var.get() / 100.0
-                     target_w = int(original_pil.width * scale_factor * actual_zoom)
-                     target_h = int(original_pil.height * scale_factor * actual_zoom)
-                else: return None
-            else:
-                 size = layer.scale_var.get() * actual_zoom
-                 if size < 1: return None
-                 points = layer._get_shape_points((0, 0), size)
-                 if not points: return None
-
-                 if layer.angle != 0:
-                    points = ImageService._rotate_points(points, (0, 0), -layer.angle)
-
-                 xs, ys = zip(*[(points[i], points[i+1]) for i in range(0, len(points), 2)])
-                 min_x, max_x = min(xs), max(xs)
-                 min_y, max_y = min(ys), max(ys)
-                 width, height = int(max_x - min_x) + 1, int(max_y - min_y) + 1
-                 if width <= 0 or height <= 0: return None
-
-                 img = Image.new('RGBA', (width, height), (0,0,0,0))
-                 shape_draw = ImageDraw.Draw(img)
-                 shifted_points = [(x - min_x, y - min_y) for x, y in zip(xs, ys)]
-                 shape_draw.polygon(shifted_points, fill=layer.color)
-                 return img
-
-        if original_pil is None: return None
-        
-        if isinstance(layer, TextLayer):
-            if layer.angle != 0:
-                return original_pil.rotate(layer.angle, expand=True, resample=Image.Resampling.BICUBIC)
-            else:
-                return original_pil
-        
-        if target_w < 1 or target_h < 1: return None
-
-        try:
-            resized_img = original_pil.resize((target_w, target_h), Image.Resampling.LANCZOS)
-            if layer.angle != 0:
-                return resized_img.rotate(layer.angle, expand=True, resample=Image.Resampling.BICUBIC)
-            else:
-                return resized_img
-        except Exception:
+                source = layer.pil_image
+                if not source: return self._ready(None)
+                scale_factor = layer.scale_var.get() / 100.0
+                target_w = int(source.width * scale_factor * actual_zoom)
+                target_h = int(source.height * scale_factor * actual_zoom)
+                if target_w < 1 or target_h < 1: return self._ready(None)
+                return self._prepare_resample(layer, source, None, (target_w, target_h), angle, interactive)
+
+            size = layer.scale_var.get() * actual_zoom
+            shape_type, color = layer.shape_type, layer.color
+            if interactive:
+                return self._ready(ShapeRasterizer.rasterize(shape_type, size, angle, color, 1))
+            return {'image': None, 'render': lambda: ShapeRasterizer.rasterize(shape_type, size, angle, color, DISPLAY_SUPERSAMPLE),
+                    'size': (int(size), int(size))}
+
+        return self._ready(None)
+
+    @staticmethod
+    def _image_target_size(layer: ImageLayer, target_h_logical: float, actual_zoom: float,
+                           estimate: bool = False) -> tuple[int, int] | None:
+        """내용물 높이가 target_h_logical 이 되는 표시 크기. Tk 변수는 읽지 않으므로 작업 스레드에서도 호출됩니다."""
+        content_w, content_h = layer.get_content_dimensions(estimate)
+        if content_h <= 0:
+            return None
+        ratio = target_h_logical / content_h
+        region_w, region_h = layer.get_region_dimensions(estimate)
+        target_w, target_h = int(region_w * ratio * actual_zoom), int(region_h * ratio * actual_zoom)
+        if target_w < 1 or target_h < 1:
             return None
+        return target_w, target_h
+
+    def _prepare_resample(self, layer: Layer, source: Image.Image, source_box, size: tuple[int, int], angle: float, interactive) -> dict:
+        if interactive:
+            return self._ready(self._render_interactive(interactive, source, source_box, size, angle))
+
+        key = display_fingerprint(layer, *size)
+        out_size = ImageService.get_rotated_size(size, angle)
+        if TiledDisplay.needs_tiling(out_size):
+            current = self.canvas_objects.get(layer.path, {}).get('tiled')
+            tiled = current if current and current.fingerprint == key else TiledDisplay(key, source, size, angle, source_box)
+            return {'image': None, 'render': None, 'size': out_size, 'tiled': tiled}
+
+        cached = display_render_cache.get(key)
+        if cached is not None:
+            return self._ready(cached)
+
+        def render():
+            img = ImageService.scale_rotate(source, size, angle, box=source_box)
+            display_render_cache.put(key, img)
+            return img
+        return {'image': None, 'render': render, 'size': out_size}
+
+    @staticmethod
+    def _ready(image: Image.Image | None) -> dict:
+        return {'image': image, 'render': None, 'size': None}
+
+    @staticmethod
+    def _rotate_text(image: Image.Image | None, angle: float) -> Image.Image | None:
+        if image is None or angle == 0:
+            return image
+        return image.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
+
+    def begin_interactive_transform(self, path: str):
+        """회전/리사이즈 제스처 시작. 끝날 때까지 해당 레이어는 빠른 필터로 미리보기합니다."""
+        self._interactive = {'path': path, 'base': None, 'scale': None}
+
+    def end_interactive_transform(self):
+        self._interactive = None
+
+    def _get_interactive(self, layer: Layer) -> dict | None:
+        if self._interactive and self._interactive['path'] == layer.path:
+            return self._interactive
+        return None
+
+    def _render_interactive(self, interactive: dict, source: Image.Image, source_box, size: tuple[int, int], angle: float) -> Image.Image:
+        # 첫 프레임에 회전 전 고품질 비트맵을 한 번 만들어 두고, 이후에는 그것만 빠르게 변형
+        if interactive['base'] is None:
+            interactive['base'] = ImageService.scale_rotate(source, size, 0, box=source_box)
+        return ImageService.scale_rotate(interactive['base'], size, angle, resample=INTERACTIVE_RESAMPLE)
 
     def update_all_objects_display(self, zoom: float):
         for layer in self.controller.get_layers():
@@ -184,14 +574,21 @@ class CanvasController:
                 self.update_object_display(layer, zoom)
         if self.controller.logo_object:
             self.update_object_display(self.controller.logo_object, zoom)
+        self.schedule_flatten_refresh()
 
+    @profiled('reorder_canvas_layers')
     def reorder_canvas_layers(self):
         if self.controller.logo_object:
              self.canvas.lift(self.controller.logo_object['id'])
 
         for layer in reversed(self.controller.get_layers()):
             if layer.path in self.canvas_objects:
-                self.canvas.lift(self.canvas_objects[layer.path]['id'])
+                obj_info = self.canvas_objects[layer.path]
+                self.canvas.lift(obj_info['id'])
+                if obj_info.get('tiled'):
+                    for item in obj_info['tiled'].items.values():
+                        self.canvas.lift(item['id'])
+        self.schedule_flatten_refresh() # 합성 순서 반영
 
     def get_canvas_size(self, zoom: float = None) -> tuple[int, int]:
         if zoom is None: zoom = self.controller.get_zoom()
@@ -235,7 +632,37 @@ class CanvasController:
 
         obj_info['rel_x'] = final_x / current_canvas_w if current_canvas_w > 0 else 0.5
         obj_info['rel_y'] = final_y / current_canvas_h if current_canvas_h > 0 else 0.5
-
+        if obj_info.get('tiled'):
+            self._update_tiles(obj_info)
+
+    def move_object_item(self, item_id: int, dx: float, dy: float):
+        """드래그 이동. 타일로 표시 중인 객체는 기준 항목과 모든 타일을 함께 옮깁니다."""
+        obj_info = self.get_object_info_by_id(item_id)
+        if obj_info and obj_info.get('tiled'):
+            self.canvas.move(obj_info['id'], dx, dy)
+            for item in obj_info['tiled'].items.values():
+                self.canvas.move(item['id'], dx, dy)
+        else:
+            self.canvas.move(item_id, dx, dy)
+
+    def place_object(self, obj_info: dict, x: float, y: float):
+        """자동 배치 등에서 객체 중심을 (x, y) 로 옮깁니다. 타일로 표시 중이면 타일도 다시 배치합니다."""
+        self.canvas.coords(obj_info['id'], x, y)
+        if obj_info.get('tiled'):
+            self._update_tiles(obj_info)
+        if obj_info.get('flattened'):
+            self.schedule_flatten_refresh()
+
+    def get_object_bbox(self, item_id: int) -> tuple | None:
+        """canvas.bbox 와 같지만, 타일로 표시 중인 객체는 전체 표시 크기로 계산합니다. (기준 항목에는 이미지가 없음)"""
+        obj_info = self.get_object_info_by_id(item_id)
+        if obj_info and obj_info.get('tiled'):
+            cx, cy = self.canvas.coords(obj_info['id'])
+            w, h = obj_info['tiled'].size
+            return int(cx - w / 2), int(cy - h / 2), int(cx + w / 2), int(cy + h / 2)
+        return self.canvas.bbox(item_id)
+
+    @profiled('activate_resize_handles')
     def activate_resize_handles(self, path: str):
         self.clear_resize_handles()
         self.active_selection_path = path
@@ -250,6 +677,11 @@ class CanvasController:
              self.active_selection_path = None
              return
 
+        if obj_info.get('flattened'):
+             # 배경 합성에서 빼서 개별 항목으로 그림. 핸들은 비트맵이 적용될 때 _apply_display 에서 다시 만듦
+             self.refresh_flattened()
+             return
+
         item_id = obj_info['id']
         pil_img = obj_info.get('pil_for_display')
         if not pil_img:
@@ -311,6 +743,7 @@ class CanvasController:
         self.canvas.delete("rotate_handle")
         self.canvas.delete("border")
         self.active_selection_path = None
+        self.schedule_flatten_refresh() # 선택이 바뀌면 배경 합성 대상도 바뀜
 
     def process_resizing(self, current_x, current_y, resize_data):
         if not resize_data: return
@@ -402,17 +835,23 @@ class CanvasController:
                 layer.angle = new_angle
                 if path in self.canvas_objects:
                      self.canvas_objects[path]['angle'] = new_angle
-                self.update_object_display(layer, self.controller.get_zoom())
+                self.controller.update_layer_properties(layer)
 
     def finalize_resize_or_rotate(self, path: str):
+        self.end_interactive_transform()
         if not path or path == 'logo': return
         layer = self.controller.get_layer_by_path(path)
         if layer:
+            # 대기 중인 미리보기 요청은 버리고 고품질로 한 번 다시 그림
+            self.controller.view.render_scheduler.discard_object(path)
             self.update_object_display(layer, self.controller.get_zoom())
             self.controller.update_status(f"'{layer.get_display_name()}' 변형 완료.")
         self.activate_resize_handles(path)
 
     def get_object_info_by_id(self, item_id: int) -> dict | None:
+        tags = self.canvas.gettags(item_id)
+        if 'tile' in tags:
+            return next((self.canvas_objects[tag] for tag in tags if tag in self.canvas_objects), None)
         if self.controller.logo_object and self.controller.logo_object.get('id') == item_id:
             return self.controller.logo_object
         for info in self.canvas_objects.values():
@@ -4,6 +4,7 @@ import tkinter as tk
 import tkinter.ttk as ttk # 표준 ttk 사용 (Scrollbar)
 # ttkbootstrap import 제거
 from ..models.layer import Layer, ImageLayer, TextLayer, ShapeLayer
+from ..services.layer_buffers import layer_buffers
 
 # [ ★★★★★ NEW: 테마 임포트 ★★★★★ ]
 from ui.theme import Colors
@@ -51,6 +52,33 @@ class LayerList(tk.Frame): # tk.Frame 상속
         for i, layer in enumerate(layers): self._create_list_item(i, layer) # 새 위젯 생성
         self.list_frame.update_idletasks(); self.canvas.config(scrollregion=self.canvas.bbox("all")); self.update_selection_visuals(layers)
 
+    def append_layer(self, layer: Layer):
+        """목록 전체를 다시 만들지 않고 마지막 레이어 항목만 추가합니다. (이미지 가져오기 중 사용)"""
+        index = len(self.controller.get_layers()) - 1
+        if index > 0: # 기존 마지막 항목 아래 구분선
+            separator = tk.Frame(self.list_frame, height=1, bg=Colors.GREY); separator.grid(row=index * 2 - 1, column=0, sticky='ew', padx=10, pady=2)
+        self._create_list_item(index, layer)
+        self.list_frame.update_idletasks(); self.canvas.config(scrollregion=self.canvas.bbox("all")); self.update_selection_visuals([layer])
+
+    @staticmethod
+    def _format_memory(layer: ImageLayer) -> str:
+        text = f"{layer.get_buffer_bytes() / 1048576:.1f}MB"
+        return text + " 고정" if layer_buffers.is_pinned(layer) else text
+
+    def refresh_memory_labels(self, layers: list[Layer]):
+        for layer in layers:
+            label = getattr(layer.widget_ref, '_memory_label', None)
+            if label is not None and label.winfo_exists():
+                label.config(text=self._format_memory(layer))
+
+    def refresh_thumbnail(self, layer: Layer):
+        """표시용 이미지가 준비된 뒤 (프로젝트 불러오기 직후의 빈 썸네일을) 다시 만듭니다."""
+        label = getattr(layer.widget_ref, '_name_label', None)
+        if label is None or not label.winfo_exists():
+            return
+        layer.thumbnail = layer.create_thumbnail(); layer._thumbnail_ref = layer.thumbnail
+        label.config(image=layer._thumbnail_ref)
+
     def _create_list_item(self, index: int, layer: Layer):
         row_index = index * 2
         widget = tk.Frame(self.list_frame, bg=Colors.WHITE, padx=5, pady=5); widget.is_draggable_item = True; widget._layer_path = layer.path # Use Colors.WHITE
@@ -69,13 +97,15 @@ class LayerList(tk.Frame): # tk.Frame 상속
              try: layer.thumbnail = layer.create_thumbnail(); layer._thumbnail_ref = layer.thumbnail
              except Exception as e: print(f"썸네일 생성 실패 ({layer.path}): {e}")
         name_label = tk.Label(widget, image=getattr(layer, '_thumbnail_ref', None), text=display_name, compound="left", bg=Colors.WHITE, fg=Colors.DARK_TEAL, anchor=tk.W) # Use Colors
-        name_label.grid(row=0, column=1, rowspan=2, sticky='w')
+        name_label.grid(row=0, column=1, rowspan=2, sticky='w'); widget._name_label = name_label
         ctrl_frame = tk.Frame(widget, bg=Colors.WHITE); ctrl_frame.grid(row=0, column=2, rowspan=2, sticky='e', padx=5) # Use Colors.WHITE
         s_from = 8 if isinstance(layer, (TextLayer, ShapeLayer)) else 10; s_inc = 1.0 if isinstance(layer, (TextLayer, ShapeLayer)) else 5.0
         if hasattr(layer, 'scale_var'):
             scale_spinbox = tk.Spinbox(ctrl_frame, from_=s_from, to=500, textvariable=layer.scale_var, width=5, increment=s_inc); scale_spinbox.pack(pady=2)
             layer.scale_var_trace_id = layer.scale_var.trace_add("write", lambda n, i, m, l=layer: self.controller.update_layer_properties(l))
         btn_frame = tk.Frame(ctrl_frame, bg=Colors.WHITE); btn_frame.pack() # Use Colors.WHITE
+        if isinstance(layer, ImageLayer): # 레이어가 보관 중인 픽셀 버퍼 크기
+            widget._memory_label = tk.Label(ctrl_frame, text=self._format_memory(layer), bg=Colors.WHITE, fg=Colors.GREY, font=("Consolas", 7)); widget._memory_label.pack(anchor='e')
         bg_state = tk.NORMAL if isinstance(layer, ImageLayer) else tk.DISABLED
         tk.Button(btn_frame, text="배경", width=5, command=lambda l=layer: self.controller.remove_layer_background(l), state=bg_state, bg=Colors.GREY, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARK_GREY).pack(side='left', padx=(0, 2)) # Use Colors
         tk.Button(btn_frame, text="삭제", width=5, command=lambda l=layer: self.controller.delete_layers([l]), bg=Colors.MAIN_RED, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARKER_RED).pack(side='left') # Use Colors
@@ -4,13 +4,16 @@ import os
 import re
 import math
 import traceback
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk
 
 from ui.theme import Colors
 from .models.layer import Layer, ImageLayer, TextLayer, ShapeLayer, DISPLAY_IMG_MAX_SIZE
 from ui.dialogs import TextPropertiesDialog, ShapePropertiesDialog
 from .services.project_service import ProjectService
-from .services.image_service import ImageService
+from .services.image_service import ImageService, EXPORT_PRESETS
+from .services.export_job import ExportJob, snapshot_layers, snapshot_canvas_objects, snapshot_logo_info
+from .services.import_job import ImportJob
+from .services.layer_buffers import layer_buffers
 from .services.font_service import FontService
 
 class EaselController:
@@ -30,13 +33,18 @@ class EaselController:
             'grid_overlap': tk.IntVar(value=70),
             'output_width': tk.IntVar(value=1500), 'output_height': tk.IntVar(value=1500),
             'output_format': tk.StringVar(value="PNG"), 'background_color': tk.StringVar(value="#FFFFFF"),
+            'extra_formats': tk.StringVar(value=""), 'max_file_kb': tk.IntVar(value=0),
             'save_directory': tk.StringVar(value=os.path.expanduser("~")),
             'zoom': tk.DoubleVar(value=100.0), 'palette_color': tk.StringVar(value="#FFFFFF"),
+            'flatten_preview': tk.BooleanVar(value=False),
+            'export_preset': tk.StringVar(value=next(iter(EXPORT_PRESETS))),
         }
 
         self.is_line_placement_mode = False
         self.line_start_point = None
         self.line_end_point = None
+        self.export_job: ExportJob | None = None
+        self.import_job: ImportJob | None = None
 
     def set_ui_references(self, logo_preview_label, status_label):
         self.logo_preview_label, self.status_label = logo_preview_label, status_label
@@ -58,19 +66,59 @@ class EaselController:
             self.status_label.config(text=text)
 
     def add_new_image_layers(self, files: list[str]):
-        new_files_added = False
+        # 경로 중복 검사는 집합으로 (가져오는 중인 파일 포함)
+        known_paths = {l.path for l in self.layers if isinstance(l, ImageLayer)}
+        # 취소된 작업은 남은 대기열만 비우는 중이므로 그 파일은 다시 가져올 수 있어야 함
+        active = self.import_job if self.import_job and self.import_job.is_running() and not self.import_job.is_cancelled() else None
+        if active:
+            known_paths.update(active.paths)
+        new_paths = []
         for f in [f.strip('{}') for f in files]:
             normalized_path = os.path.normpath(f)
-            if os.path.isfile(normalized_path) and normalized_path not in [l.path for l in self.layers if isinstance(l, ImageLayer)]:
-                try:
-                    self.layers.append(ImageLayer(file_path=normalized_path))
-                    new_files_added = True
-                except Exception as e:
-                    messagebox.showerror("Image Load Error", f"Failed to load image:\n{normalized_path}\n\nError: {e}")
-        if new_files_added:
-            self.view.layer_list.populate_list(self.layers)
-            if not self.settings['style_code'].get():
-                self._set_default_style_code()
+            if os.path.isfile(normalized_path) and normalized_path not in known_paths:
+                known_paths.add(normalized_path)
+                new_paths.append(normalized_path)
+        if not new_paths:
+            return
+
+        # 디코딩은 작업 스레드에서, 준비된 레이어는 끝나는 순서대로 목록에 추가
+        if active:
+            active.add(new_paths)
+            return
+        job = ImportJob(self.view, new_paths, on_layer=self._on_import_layer)
+        # 취소된 이전 작업이 늦게 끝나도 새 작업의 진행 표시를 덮어쓰지 않도록 작업별로 연결
+        job.on_progress = lambda done, total, job=job: self._on_import_progress(job, done, total)
+        job.on_done = lambda result, job=job: self._on_import_done(job, result)
+        self.import_job = job
+        self.view.set_import_running(True)
+        job.start()
+
+    def cancel_import(self):
+        if self.import_job and self.import_job.is_running() and not self.import_job.is_cancelled():
+            self.import_job.cancel()
+            self.update_status("이미지 불러오기 취소 중...")
+
+    def _on_import_layer(self, layer: ImageLayer):
+        self.layers.append(layer)
+        self.view.layer_list.append_layer(layer)
+
+    def _on_import_progress(self, job: ImportJob, done: int, total: int):
+        if job is self.import_job and not job.is_cancelled():
+            self.update_status(f"이미지 불러오는 중... ({done}/{total})")
+
+    def _on_import_done(self, job: ImportJob, result: dict):
+        if job is not self.import_job:
+            return # 새 작업으로 대체된 취소 작업
+        self.import_job = None
+        self.view.set_import_running(False)
+        if result['added'] and not self.settings['style_code'].get():
+            self._set_default_style_code()
+        if result['errors']:
+            details = "\n".join(f"{path}: {error}" for path, error in result['errors'][:10])
+            more = f"\n... 외 {len(result['errors']) - 10}개" if len(result['errors']) > 10 else ""
+            messagebox.showerror("Image Load Error", f"Failed to load {len(result['errors'])} image(s):\n\n{details}{more}")
+        status = "불러오기 취소" if result['cancelled'] else "불러오기 완료"
+        self.update_status(f"{status}: {result['added']}개 추가.")
 
     def add_new_text_layer(self):
         dialog = TextPropertiesDialog(self.view.winfo_toplevel())
@@ -105,6 +153,7 @@ class EaselController:
                     layer.is_visible.set(False)
                     self.toggle_layer_visibility(layer)
                     self.layers.remove(layer)
+                    layer_buffers.forget(layer)
             self.view.layer_list.populate_list(self.layers)
             self.update_status(f"{len(layers_to_delete)}개 삭제 완료.")
 
@@ -120,15 +169,18 @@ class EaselController:
                 self.view.canvas_controller.clear_resize_handles()
 
     def update_layer_properties(self, layer: Layer):
+        # 다시 그리기는 유휴 시점에 모아서 한 번만 (Spinbox 연속 입력, 드래그 리사이즈 등)
         if layer.is_visible.get():
-            self.view.canvas_controller.update_object_display(layer, self.get_zoom())
+            self.view.render_scheduler.invalidate_object(layer)
 
     def clear_all(self):
         if not messagebox.askyesno("확인", "모든 작업 내용을 초기화하시겠습니까?"):
             return
+        self.cancel_import() # 가져오는 중이던 레이어가 초기화 뒤에 추가되지 않도록
         for layer in self.layers:
             layer.is_visible.set(False)
             self.toggle_layer_visibility(layer)
+            layer_buffers.forget(layer)
         self.layers.clear()
         self.view.canvas_controller.canvas_objects.clear()
         self.view.canvas_controller.clear_resize_handles()
@@ -252,6 +304,7 @@ class EaselController:
                     pass
         self.layers = project_data.get('layers', [])
         self.view.layer_list.populate_list(self.layers)
+        self.view.canvas_controller.preload_levels(self.layers)
         canvas_positions = project_data.get('canvas_positions', {})
         initial_positions = {}
         for layer in self.layers:
@@ -260,6 +313,7 @@ class EaselController:
         initial_logo_pos = canvas_positions.get('logo') if self.settings['logo_path'].get() else None
         self.view.update_idletasks()
         self.view._update_canvas_view()
+        self.view.render_scheduler.flush() # 레이어 배치 전에 fit_scale 확정
         if initial_logo_pos:
             self._add_logo_to_canvas()
             if self.logo_object:
@@ -274,11 +328,62 @@ class EaselController:
         self.update_status(f"프로젝트 로드: {os.path.basename(project_data.get('path', ''))}")
 
     def save_image(self):
+        settings = self._get_export_settings()
+        targets = ImageService.ask_save_targets(settings, self.layers)
+        if targets:
+            self._start_export_job(settings, targets)
+
+    def save_image_preset(self):
+        settings = self._get_export_settings()
+        targets = ImageService.ask_preset_targets(settings, self.layers, settings['export_preset'])
+        if targets:
+            self._start_export_job(settings, targets)
+
+    def _get_export_settings(self) -> dict:
         settings = self.get_settings_values()
-        settings['logo_info'] = self.logo_object if self.logo_object else None
-        status = ImageService.save_canvas_as_image(settings, self.layers, self.view.canvas_controller.canvas_objects)
-        if status:
-            self.update_status(status)
+        settings['logo_info'] = snapshot_logo_info(self.logo_object)
+        return settings
+
+    def _start_export_job(self, settings: dict, targets: list):
+        if self.export_job and self.export_job.is_running():
+            messagebox.showinfo("알림", "이미 이미지를 저장하는 중입니다.")
+            return
+
+        # 작업 스레드는 Tk 변수를 읽지 않도록 메인 스레드에서 문서 상태를 고정
+        self.export_job = ExportJob(
+            self.view, settings,
+            snapshot_layers(self.layers),
+            snapshot_canvas_objects(self.view.canvas_controller.canvas_objects),
+            targets, on_progress=self._on_export_progress, on_done=self._on_export_done
+        )
+        self.view.set_export_running(True)
+        self.update_status("이미지 저장 준비 중...")
+        self.export_job.start()
+
+    def cancel_export(self):
+        if self.export_job and self.export_job.is_running():
+            self.export_job.cancel()
+            self.update_status("이미지 저장 취소 중...")
+
+    def _on_export_progress(self, done: int, total: int, message: str):
+        self.update_status(f"{message}... ({done * 100 // max(total, 1)}%)")
+
+    def _on_export_done(self, result: dict):
+        self.export_job = None
+        self.view.set_export_running(False)
+        if result['cancelled']:
+            if result['paths']: # 취소 전에 끝난 크기의 파일은 남아 있음
+                messagebox.showinfo("저장 취소", "저장을 취소했습니다. 취소 전에 저장된 파일:\n" + "\n".join(result['paths']))
+            self.update_status(f"저장 취소. ({len(result['paths'])}개 저장됨)" if result['paths'] else "저장 취소.")
+        elif result['error'] is not None:
+            messagebox.showerror("저장 오류", f"파일 저장 중 오류 발생:\n{result['error']}")
+            self.update_status("저장 실패.")
+        else:
+            paths = result['paths']
+            messagebox.showinfo("성공", "이미지를 저장했습니다.\n" + "\n".join(paths))
+            if result['oversize']:
+                messagebox.showwarning("용량 초과", f"최저 품질로도 {result['max_file_kb']}KB 를 넘는 파일이 있습니다.\n" + "\n".join(result['oversize']))
+            self.update_status(f"저장 완료! ({len(paths)}개, {result['seconds']:.1f}초)")
 
     def remove_layer_background(self, layer: Layer):
         if not isinstance(layer, ImageLayer):
@@ -324,8 +429,7 @@ class EaselController:
         if confirm and not messagebox.askyesno("확인", "로고 삭제?"):
             return
         if self.logo_object:
-            self.view.canvas.delete(self.logo_object['id'])
-            self.logo_object = None
+            self._remove_logo_item()
             if self.view.canvas_controller.active_selection_path == 'logo':
                 self.view.canvas_controller.clear_resize_handles()
         self.settings['logo_path'].set("")
@@ -333,6 +437,12 @@ class EaselController:
         if confirm:
             self.update_status("로고 삭제.")
 
+    def _remove_logo_item(self):
+        """로고 캔버스 항목을 지우고 PhotoImage 를 풀에 반납합니다. (remove_layer_from_canvas 와 같은 정리)"""
+        self.view.canvas.delete(self.logo_object['id'])
+        self.view.canvas_controller.photo_pool.release(self.logo_object['tk_img'])
+        self.logo_object = None
+
     def on_logo_panel_drop(self, event):
         files = [f.strip('{}') for f in self.view.winfo_toplevel().tk.splitlist(event.data)]
         first = next((f for f in files if os.path.isfile(f) and f.lower().endswith('.png')), None)
@@ -349,8 +459,7 @@ class EaselController:
             return
 
         if self.logo_object:
-            self.view.canvas.delete(self.logo_object['id'])
-            self.logo_object = None
+            self._remove_logo_item()
 
         try:
             pil_img_original = Image.open(path).convert("RGBA")
@@ -388,7 +497,7 @@ class EaselController:
         pil_img = self._get_display_pil_for_logo(actual_zoom)
         if pil_img:
             x, y = obj_info['rel_x'] * cw, obj_info['rel_y'] * ch
-            obj_info['tk_img'] = ImageTk.PhotoImage(pil_img)
+            obj_info['tk_img'] = self.view.canvas_controller.photo_pool.acquire(pil_img, obj_info['tk_img'])
             obj_info['pil_for_display'] = pil_img
             self.view.canvas.itemconfig(obj_info['id'], image=obj_info['tk_img'], state='normal')
             self.view.canvas.coords(obj_info['id'], x, y)
@@ -419,7 +528,8 @@ class EaselController:
             return None
 
         try:
-            return pil_img_to_process.resize((dw, dh), Image.Resampling.LANCZOS)
+            angle = self.logo_object.get('angle', 0.0) if self.logo_object else 0.0
+            return ImageService.scale_rotate(pil_img_to_process, (dw, dh), angle)
         except Exception:
             return None
 
@@ -539,14 +649,14 @@ class EaselController:
         for l in self.layers:
             l.selected = (l.path in original_selection)
         self.view.layer_list.update_selection_visuals(self.layers)
-        self.view.update_idletasks()
 
+        # 표시 비트맵은 렌더링 풀에서 나중에 도착하고 화면 밖/병합된 레이어는 비트맵이 없으므로 크기는 모델에서 계산
         scaled_data = []
         for d in image_data:
             obj_info = self.view.canvas_controller.canvas_objects.get(d['layer'].path)
-            if obj_info and obj_info.get('pil_for_display'):
-                 pil_img = obj_info['pil_for_display']
-                 scaled_data.append({'obj': obj_info, 'w': pil_img.width, 'h': pil_img.height, 'grid_r': d['grid_r'], 'grid_c': d['grid_c']})
+            size = self._get_temp_display_size(d['layer'], d['layer'].scale_var.get(), actual_zoom) if obj_info else None
+            if size:
+                 scaled_data.append({'obj': obj_info, 'w': size[0], 'h': size[1], 'grid_r': d['grid_r'], 'grid_c': d['grid_c']})
 
         if not scaled_data:
             messagebox.showwarning("배치 오류", "스케일 적용 후 이미지 크기 정보를 얻지 못했습니다.")
@@ -568,9 +678,10 @@ class EaselController:
             final_y = p['y'] + offset_y
             final_x = max(p['w']/2, min(final_x, work_w - p['w']/2))
             final_y = max(work_y_start + p['h']/2, min(final_y, canvas_h - p['h']/2))
-            self.view.canvas.coords(p['obj']['id'], final_x, final_y)
+            self.view.canvas_controller.place_object(p['obj'], final_x, final_y)
             p['obj']['rel_x'] = final_x / canvas_w if canvas_w > 0 else 0.5
             p['obj']['rel_y'] = final_y / canvas_h if canvas_h > 0 else 0.5
+        self.view.canvas_controller.update_newly_visible_objects() # 화면 밖에서 들어온 레이어를 그림
         self.update_status(f"그리드 자동 배치 완료 (크기: {optimal_scale:.1f}%)")
 
     def apply_linear_layout(self, start_point, end_point):
@@ -583,6 +694,7 @@ class EaselController:
         if num_images == 0: return
 
         canvas_w, canvas_h = self.view.canvas_controller.get_canvas_size()
+        actual_zoom = self.view.canvas_controller.fit_scale * self.get_zoom()
         logo_zone_h = canvas_h * (self.settings['logo_zone_height'].get() / 1500.0)
         work_w = canvas_w
         work_h = canvas_h - logo_zone_h
@@ -604,22 +716,24 @@ class EaselController:
             current_x = start_x + dx * t
             current_y = start_y + dy * t
 
-            pil_img = obj_info.get('pil_for_display')
-            img_w, img_h = (pil_img.width, pil_img.height) if pil_img else (10, 10)
+            size = self._get_temp_display_size(layer, layer.scale_var.get(), actual_zoom)
+            img_w, img_h = size if size else (10, 10)
 
             final_x = max(img_w / 2, min(current_x, work_w - img_w / 2))
             final_y = max(work_y_start + img_h / 2, min(current_y, canvas_h - img_h / 2))
 
-            self.view.canvas.coords(obj_info['id'], final_x, final_y)
+            self.view.canvas_controller.place_object(obj_info, final_x, final_y)
             obj_info['rel_x'] = final_x / canvas_w if canvas_w > 0 else 0.5
             obj_info['rel_y'] = final_y / canvas_h if canvas_h > 0 else 0.5
 
+        self.view.canvas_controller.update_newly_visible_objects()
         self.update_status(f"직선 배치 완료 (이미지 {num_images}개)")
 
     def _get_temp_display_size(self, layer: Layer, scale: float, actual_zoom: float) -> tuple[int, int] | None:
         if isinstance(layer, ImageLayer):
-            content_w, content_h = layer.get_content_dimensions()
-            pil_w, pil_h = layer.pil_img_display.size
+            # 메인 스레드에서 디코딩하지 않도록 준비 전에는 헤더 크기로 추정
+            content_w, content_h = layer.get_content_dimensions(estimate=True)
+            pil_w, pil_h = layer.get_region_dimensions(estimate=True)
             if content_h <= 0: return None
             lh = self.settings['output_height'].get()
             zone_h_log = lh * (self.settings['logo_zone_height'].get() / 1500.0)
@@ -635,11 +749,7 @@ class EaselController:
             else:
                 return dw, dh
         elif isinstance(layer, TextLayer):
-             try:
-                 font = ImageFont.truetype(FontService.get_font_path(layer.font_family), int(scale * actual_zoom))
-             except IOError:
-                 font = ImageFont.truetype(FontService.get_font_path('malgun.ttf'), int(scale*actual_zoom))
-             bbox = font.getbbox(layer.text)
+             bbox = FontService.get_text_bbox(layer.text, layer.font_family, int(scale * actual_zoom))
              w, h = bbox[2]-bbox[0], bbox[3]-bbox[1]
              if layer.angle != 0:
                  rad = math.radians(layer.angle)
@@ -730,7 +840,7 @@ class EaselController:
             elif obj_info.get('pil_for_display'):
                 pil = obj_info['pil_for_display']
                 try:
-                    cx, cy = self.view.canvas.coords(top_id)
+                    cx, cy = self.view.canvas.coords(obj_info['id'])
                     w, h = pil.width, pil.height
                     rx, ry = x-cx, y-cy
                     angle = obj_info.get('angle',0)
@@ -11,7 +11,12 @@ import tkinter.scrolledtext as tkst
 from .easel_controller import EaselController
 from .canvas_controller import CanvasController
 from .event_handler import EventHandler
+from .render_scheduler import RenderScheduler
 from .components.layer_list import LayerList
+from .services.image_service import EXPORT_PRESETS
+from .services.encoder_service import ENCODER_FORMATS
+from .services.frame_profiler import frame_profiler
+from .services.layer_buffers import layer_buffers
 from ui.theme import Colors
 
 try: from tkinterdnd2 import DND_FILES; DND_AVAILABLE = True
@@ -28,6 +33,8 @@ class EaselTabView(tk.Frame):
         self.grid_vars = [[tk.BooleanVar(value=False) for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
         self._build_ui()
         self.canvas_controller = CanvasController(self.canvas, self.controller)
+        self.render_scheduler = RenderScheduler(self, self._redraw_canvas_view, self._redraw_object,
+                                               self.canvas_controller.update_newly_visible_objects)
         self.event_handler = EventHandler(self.controller, self.canvas, self.canvas_controller, self) # view 전달
         self.controller.set_ui_references(self.logo_preview_label, self.status_label)
         self.controller.settings['background_color'].trace_add("write", self._on_background_color_change)
@@ -35,13 +42,15 @@ class EaselTabView(tk.Frame):
         self.controller.settings['zoom'].trace_add("write", self._on_zoom_change)
         self.controller.settings['logo_path'].trace_add("write", lambda *args: self.controller.update_logo_preview())
         self.controller.settings['logo_zone_height'].trace_add("write", self._on_logo_zone_change)
-        self.controller.settings['logo_size'].trace_add("write", lambda *args: self.controller.update_logo_object_display())
+        self.controller.settings['logo_size'].trace_add("write", self._on_logo_size_change)
+        self.controller.settings['extra_formats'].trace_add("write", self._on_extra_formats_change)
 
         # --- 각도 관련 trace 제거됨 ---
 
         self._on_palette_color_change()
         self.viewport_frame.bind("<Configure>", self._update_canvas_view)
         self.logo_preview_label.bind("<Configure>", lambda e: self.controller.update_logo_preview())
+        self._update_memory_usage()
 
     def _build_ui(self) -> None:
         self.grid_columnconfigure(0, weight=1); self.grid_columnconfigure(1, weight=0)
@@ -62,7 +71,8 @@ class EaselTabView(tk.Frame):
         self.viewport = tk.Canvas(self.viewport_frame, bd=0, highlightthickness=0, bg=Colors.WHITE)
         v_scroll = ttk.Scrollbar(self.viewport_frame, orient=tk.VERTICAL, command=self.viewport.yview)
         h_scroll = ttk.Scrollbar(self.viewport_frame, orient=tk.HORIZONTAL, command=self.viewport.xview)
-        self.viewport.config(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
+        self.viewport.config(yscrollcommand=lambda *args: self._on_viewport_scroll(v_scroll, *args),
+                             xscrollcommand=lambda *args: self._on_viewport_scroll(h_scroll, *args))
         self.viewport.grid(row=0, column=0, sticky="nsew"); v_scroll.grid(row=0, column=1, sticky="ns"); h_scroll.grid(row=1, column=0, sticky="ew")
         self.canvas = tk.Canvas(self.viewport, bg=self.controller.settings['background_color'].get(), highlightthickness=0)
         self.canvas_window_id = self.viewport.create_window((0, 0), window=self.canvas, anchor="nw")
@@ -78,6 +88,8 @@ class EaselTabView(tk.Frame):
         zoom_label = tk.Label(frame, text="100%", width=5, bg=Colors.WHITE, fg=Colors.DARK_TEAL); zoom_label.pack(side=tk.LEFT, padx=(2, 0))
         def update_zoom_label(value): zoom_label.config(text=f"{int(float(value))}%")
         self.controller.settings['zoom'].trace_add("write", lambda *args: update_zoom_label(self.controller.settings['zoom'].get()))
+        # 선택하지 않은 레이어를 한 장으로 합성해 표시 (레이어가 많을 때 캔버스 항목 수를 줄임)
+        tk.Checkbutton(frame, text="배경 합성", variable=self.controller.settings['flatten_preview'], command=lambda: self.canvas_controller.schedule_flatten_refresh(), bg=Colors.WHITE, fg=Colors.DARK_TEAL, activebackground=Colors.WHITE, relief=tk.FLAT, bd=0).pack(side=tk.LEFT, padx=(5, 0))
         return frame
 
     def _create_control_panel(self, parent: tk.Frame) -> tk.Frame:
@@ -179,7 +191,7 @@ class EaselTabView(tk.Frame):
         tk.Spinbox(right_controls, from_=10, to=500, textvariable=self.controller.settings['global_scale'], width=5, increment=5.0).pack(side=tk.LEFT, padx=3)
         tk.Button(right_controls, text="적용", command=self.controller.apply_global_scale, width=5, bg=Colors.MAIN_RED, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARKER_RED).pack(side=tk.LEFT)
         action_buttons = tk.Frame(frame, bg=Colors.WHITE, pady=3); action_buttons.pack(fill=tk.X); action_buttons.columnconfigure((0, 1), weight=1)
-        tk.Button(action_buttons, text="이미지 추가", command=self._add_files, bg=Colors.GREY, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARK_GREY).grid(row=0, column=0, sticky="ew", padx=(0,1))
+        self.add_image_button = tk.Button(action_buttons, text="이미지 추가", command=self._add_files, bg=Colors.GREY, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARK_GREY); self.add_image_button.grid(row=0, column=0, sticky="ew", padx=(0,1))
         tk.Button(action_buttons, text="선택 삭제", command=self.controller.delete_selected_layers, bg=Colors.MAIN_RED, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARKER_RED).grid(row=0, column=1, sticky="ew", padx=(1,0))
         self.layer_list = LayerList(frame, self.controller); self.layer_list.pack(fill=tk.BOTH, expand=True, pady=(0,3))
         return frame
@@ -198,10 +210,21 @@ class EaselTabView(tk.Frame):
         tk.Label(inner, text="파일명:", bg=Colors.WHITE, fg=Colors.DARK_TEAL).pack(anchor=tk.W)
         tk.Entry(inner, textvariable=self.controller.settings['style_code'], justify=tk.CENTER).pack(fill=tk.X, pady=(0,3))
         tk.Label(inner, text="파일 형식:", bg=Colors.WHITE, fg=Colors.DARK_TEAL).pack(anchor=tk.W)
-        ttk.Combobox(inner, textvariable=self.controller.settings['output_format'], values=["PNG", "JPG"], state="readonly").pack(fill=tk.X, pady=(0,3))
+        ttk.Combobox(inner, textvariable=self.controller.settings['output_format'], values=list(ENCODER_FORMATS), state="readonly").pack(fill=tk.X, pady=(0,3))
+        tk.Label(inner, text="추가 형식 (동시 저장):", bg=Colors.WHITE, fg=Colors.DARK_TEAL).pack(anchor=tk.W)
+        extra_frame = tk.Frame(inner, bg=Colors.WHITE); extra_frame.pack(fill=tk.X, pady=(0,3))
+        self.extra_format_vars = {fmt: tk.BooleanVar(value=False) for fmt in ENCODER_FORMATS}
+        for fmt, var in self.extra_format_vars.items():
+            tk.Checkbutton(extra_frame, text=fmt, variable=var, command=self._on_extra_format_toggle, bg=Colors.WHITE, activebackground=Colors.WHITE, relief=tk.FLAT, bd=0).pack(side=tk.LEFT)
+        size_frame = tk.Frame(inner, bg=Colors.WHITE); size_frame.pack(fill=tk.X, pady=(0,3))
+        tk.Label(size_frame, text="최대 용량(KB, 0=제한 없음):", bg=Colors.WHITE, fg=Colors.DARK_TEAL).pack(side=tk.LEFT)
+        tk.Spinbox(size_frame, from_=0, to=100000, increment=50, textvariable=self.controller.settings['max_file_kb'], width=7).pack(side=tk.LEFT, expand=tk.YES, fill=tk.X, padx=(3,0))
         tk.Label(inner, text="저장 위치:", bg=Colors.WHITE, fg=Colors.DARK_TEAL).pack(anchor=tk.W)
         tk.Button(inner, text="폴더 선택", command=self._select_save_directory, bg=Colors.GREY, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARK_GREY).pack(fill=tk.X)
-        tk.Button(inner, text="이미지 저장", command=self.controller.save_image, bg=Colors.MAIN_RED, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARKER_RED).pack(fill=tk.X, pady=(8,0))
+        self.save_image_button = tk.Button(inner, text="이미지 저장", command=self.controller.save_image, bg=Colors.MAIN_RED, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARKER_RED); self.save_image_button.pack(fill=tk.X, pady=(8,0))
+        tk.Label(inner, text="크기 프리셋:", bg=Colors.WHITE, fg=Colors.DARK_TEAL).pack(anchor=tk.W, pady=(5,0))
+        ttk.Combobox(inner, textvariable=self.controller.settings['export_preset'], values=list(EXPORT_PRESETS), state="readonly").pack(fill=tk.X, pady=(0,3))
+        self.save_preset_button = tk.Button(inner, text="프리셋 일괄 저장", command=self.controller.save_image_preset, bg=Colors.DARK_TEAL, fg=Colors.WHITE, relief=tk.FLAT, activebackground=Colors.DARK_TEAL_ACTIVE); self.save_preset_button.pack(fill=tk.X)
         return frame
 
     def _create_decoration_panel(self, parent: tk.Frame) -> tk.LabelFrame:
@@ -223,22 +246,76 @@ class EaselTabView(tk.Frame):
     def _create_bottom_bar(self) -> tk.Frame:
         frame = tk.Frame(self, bg=Colors.WHITE); frame.columnconfigure(0, weight=1)
         self.status_label = tk.Label(frame, text="", bg=Colors.WHITE, fg=Colors.GREY); self.status_label.grid(row=0, column=0, sticky="w")
+        # 이미지 레이어 픽셀 버퍼 사용량 / 예산 (예산을 넘으면 오래 쓰지 않은 버퍼를 내려놓음)
+        self.memory_label = tk.Label(frame, text="", bg=Colors.WHITE, fg=Colors.GREY, font=("Consolas", 8)); self.memory_label.grid(row=0, column=4, sticky="e", padx=(10, 0))
+        # 캔버스 다시 그리기 단계별 소요 시간 (켜져 있을 때만 측정)
+        self.profiler_var = tk.BooleanVar(value=False)
+        self.profiler_label = tk.Label(frame, text="", bg=Colors.WHITE, fg=Colors.GREY, font=("Consolas", 8)); self.profiler_label.grid(row=0, column=1, sticky="e", padx=5)
+        tk.Checkbutton(frame, text="성능 표시", variable=self.profiler_var, command=self._on_profiler_toggle, bg=Colors.WHITE, fg=Colors.GREY, activebackground=Colors.WHITE, relief=tk.FLAT, bd=0).grid(row=0, column=2, sticky="e")
+        tk.Button(frame, text="JSON", command=self._export_profiler_samples, bg=Colors.WHITE, fg=Colors.GREY, relief=tk.FLAT, bd=0).grid(row=0, column=3, sticky="e")
         return frame
 
     # --- UI Event Handlers & Callbacks (다이얼 관련 함수 삭제됨) ---
+    def _on_profiler_toggle(self):
+        frame_profiler.enabled = self.profiler_var.get()
+        if frame_profiler.enabled:
+            frame_profiler.reset()
+            self._update_profiler_label()
+        else:
+            self.profiler_label.config(text="")
+    def _update_profiler_label(self):
+        if not frame_profiler.enabled: return
+        self.profiler_label.config(text=frame_profiler.summary_text())
+        self.after(500, self._update_profiler_label)
+    def _update_memory_usage(self):
+        self.memory_label.config(text=f"메모리 {layer_buffers.total_bytes / 1048576:.0f}/{layer_buffers.budget_bytes / 1048576:.0f}MB")
+        self.layer_list.refresh_memory_labels(self.controller.get_layers())
+        self.after(1000, self._update_memory_usage)
+    def _export_profiler_samples(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")], initialfile="easel_profile.json")
+        if not path: return
+        try:
+            frame_profiler.export_json(path); self.update_status(f"성능 기록 저장: {os.path.basename(path)}")
+        except OSError as e:
+            messagebox.showerror("저장 오류", f"성능 기록을 저장하지 못했습니다.\n{e}")
     def update_status(self, text: str): self.status_label.config(text=text)
     def _on_background_color_change(self, *args): color = self.controller.settings['background_color'].get(); self.canvas.configure(bg=color)
+    def _on_extra_format_toggle(self): self.controller.settings['extra_formats'].set(",".join(fmt for fmt, var in self.extra_format_vars.items() if var.get()))
+    def _on_extra_formats_change(self, *args):
+        selected = {f.strip().upper() for f in self.controller.settings['extra_formats'].get().split(",")}
+        for fmt, var in self.extra_format_vars.items(): var.set(fmt in selected)
     def _on_palette_color_change(self, *args): color = self.controller.settings['palette_color'].get(); self.palette_color_preview.config(bg=color)
-    def _on_zoom_change(self, *args): self._update_canvas_size_and_redraw()
-    def _on_logo_zone_change(self, *args): self.controller.update_logo_object_display(); self._update_canvas_size_and_redraw()
+    def _on_zoom_change(self, *args): self.render_scheduler.invalidate_view()
+    def _on_logo_zone_change(self, *args): self.render_scheduler.invalidate_view() # 전체 다시 그리기에 로고 포함
+    def _on_logo_size_change(self, *args):
+        if self.controller.logo_object: self.render_scheduler.invalidate_object(self.controller.logo_object)
+
+    def _on_viewport_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        self.render_scheduler.invalidate_viewport() # 스크롤로 새로 보이게 된 레이어 그리기
 
     def _update_canvas_view(self, event=None):
+        # <Configure> 가 연달아 와도 유휴 시점에 fit_scale 계산과 다시 그리기를 한 번만 수행
+        self.render_scheduler.invalidate_view(refit=True)
+
+    def _redraw_canvas_view(self, refit: bool):
+        if refit:
+            self._update_fit_scale()
+        self._update_canvas_size_and_redraw()
+
+    def _redraw_object(self, obj):
+        if isinstance(obj, dict):
+            self.controller.update_logo_object_display()
+        elif obj.is_visible.get():
+            self.canvas_controller.update_object_display(obj, self.controller.get_zoom())
+
+    def _update_fit_scale(self):
         w, h = self.viewport_frame.winfo_width(), self.viewport_frame.winfo_height()
         if w <= 1 or h <= 1: return
         lw, lh = self.controller.settings['output_width'].get(), self.controller.settings['output_height'].get()
         if lw <= 0 or lh <= 0: return
         sx, sy = (w * 0.9) / lw, (h * 0.9) / lh
-        self.canvas_controller.fit_scale = min(sx, sy); self._update_canvas_size_and_redraw()
+        self.canvas_controller.fit_scale = min(sx, sy)
 
     def _update_canvas_size_and_redraw(self):
         zoom = self.controller.get_zoom()
@@ -248,8 +325,17 @@ class EaselTabView(tk.Frame):
         if w > 1 and h > 1:
             border_id = self.canvas.create_rectangle(1, 1, w-2, h-2, dash=(5, 3), outline=Colors.GREY, tags='border')
             self.canvas.tag_lower(border_id)
-        self.canvas_controller.update_all_objects_display(zoom)
+        # 보이는 영역을 새 크기 기준으로 계산하도록 배치를 먼저 갱신
         self._center_canvas_in_viewport()
+        self.canvas_controller.update_all_objects_display(zoom)
+
+    def get_visible_canvas_region(self) -> tuple[float, float, float, float] | None:
+        """viewport 에 보이는 영역을 캔버스 좌표 (x0, y0, x1, y1) 로 반환합니다. 아직 배치 전이면 None"""
+        vp_w, vp_h = self.viewport.winfo_width(), self.viewport.winfo_height()
+        if vp_w <= 1 or vp_h <= 1: return None
+        window_x, window_y = self.viewport.coords(self.canvas_window_id)
+        left, top = self.viewport.canvasx(0) - window_x, self.viewport.canvasy(0) - window_y
+        return left, top, left + vp_w, top + vp_h
 
     def _center_canvas_in_viewport(self):
         self.viewport.update_idletasks()
@@ -264,4 +350,16 @@ class EaselTabView(tk.Frame):
     def _choose_palette_color(self, event=None): color = colorchooser.askcolor(title="색상 선택", initialcolor=self.controller.settings['palette_color'].get()); self.controller.settings['palette_color'].set(color[1].upper())
     def _apply_color_to_background(self): color = self.controller.settings['palette_color'].get(); self.controller.settings['background_color'].set(color); self.update_status(f"배경색 변경: {color}")
     def _enter_color_pick_mode(self): self.controller.is_color_picking_mode = True; self.canvas.config(cursor="crosshair"); self.update_status("🎨 색상 추출 모드: 캔버스 클릭")
+    def set_export_running(self, running: bool):
+        if running:
+            self.save_image_button.config(text="저장 취소", command=self.controller.cancel_export, bg=Colors.GREY)
+            self.save_preset_button.config(state=tk.DISABLED)
+        else:
+            self.save_image_button.config(text="이미지 저장", command=self.controller.save_image, bg=Colors.MAIN_RED)
+            self.save_preset_button.config(state=tk.NORMAL)
+    def set_import_running(self, running: bool):
+        if running:
+            self.add_image_button.config(text="불러오기 취소", command=self.controller.cancel_import, bg=Colors.MAIN_RED)
+        else:
+            self.add_image_button.config(text="이미지 추가", command=self._add_files, bg=Colors.GREY)
     def update_select_all_button_state(self): layers = self.controller.get_layers(); all_selected = layers and all(l.selected for l in layers); self.select_all_button.config(text="선택해제" if all_selected else "전체선택", bg=Colors.DARK_GREY if all_selected else Colors.GREY)
\ No newline at end of file
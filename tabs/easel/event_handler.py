@@ -46,6 +46,9 @@ class EventHandler:
             return
 
         topmost_item_id = self._find_topmost_item(event, overlapping)
+        if not topmost_item_id:
+            # 배경 합성 미리보기에 포함된 레이어 (개별 캔버스 항목이 없음)
+            topmost_item_id = self.canvas_controller.find_flattened_item_at(x, y)
 
         path = None
         if topmost_item_id:
@@ -87,7 +90,7 @@ class EventHandler:
             item_id = self._drag_data["item"]
             dx = x - self._drag_data["x"]
             dy = y - self._drag_data["y"]
-            self.canvas.move(item_id, dx, dy)
+            self.canvas_controller.move_object_item(item_id, dx, dy)
             self._drag_data.update(x=x, y=y)
 
 
@@ -162,7 +165,7 @@ class EventHandler:
 
         if "rotate_handle" in tags:
             self.canvas.config(cursor="exchange") # 회전 커서
-            bbox = self.canvas.bbox(item_id)
+            bbox = self.canvas_controller.get_object_bbox(item_id)
             if not bbox: return
             center_x, center_y = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
             start_angle = math.degrees(math.atan2(y - center_y, x - center_x))
@@ -174,7 +177,7 @@ class EventHandler:
             self.canvas.config(cursor="sizing") # 리사이즈 커서
             handle_type = next((t for t in tags if t not in ["handle", "item"]), None)
             if handle_type:
-                bbox = self.canvas.bbox(item_id)
+                bbox = self.canvas_controller.get_object_bbox(item_id)
                 if not bbox: return
                 self._resize_data = {
                     "item_id": item_id, "handle_type": handle_type,
@@ -182,6 +185,9 @@ class EventHandler:
                     "is_cropping": (event.state & 0x0004) != 0 # Ctrl 키 누름 여부
                 }
 
+        if self._rotation_data or self._resize_data:
+            self.canvas_controller.begin_interactive_transform(path)
+
     def _is_pixel_transparent(self, event: tk.Event, item_id: int) -> bool:
         obj_info = self.canvas_controller.get_object_info_by_id(item_id)
         is_checkable = obj_info and (obj_info.get('type') in ['image', 'text', 'logo'] or
@@ -195,7 +201,7 @@ class EventHandler:
 
         try:
             canvas_x, canvas_y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
-            coords = self.canvas.coords(item_id)
+            coords = self.canvas.coords(obj_info['id']) # 타일 항목이면 객체 중심은 기준 항목 좌표
             center_x, center_y = coords[0], coords[1]
             img_w, img_h = pil_img.width, pil_img.height
 
@@ -2,7 +2,10 @@ import tkinter as tk
 import os
 import random
 import math
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+import time
+import itertools
+import threading
+from PIL import Image, ImageTk, ImageDraw
 
 from ui.theme import Colors
 
@@ -14,18 +17,102 @@ except ImportError:
         def get_font_path(font_family):
             return "arial.ttf"
 
+try:
+    from tabs.easel.services.derivative_cache import derivative_cache
+except ImportError:
+    derivative_cache = None
+
+try:
+    from tabs.easel.services.layer_buffers import layer_buffers, image_nbytes
+except ImportError:
+    layer_buffers = None
+
+try:
+    from tabs.easel.services.auto_trim import find_content_bbox, AUTO_TRIM_TOLERANCE
+except ImportError:
+    find_content_bbox, AUTO_TRIM_TOLERANCE = None, None
+
 THUMBNAIL_SIZE = (48, 48)
 DISPLAY_IMG_MAX_SIZE = (800, 800)
 SAVE_IMG_MAX_SIZE = (2000, 2000)
+MIP_MIN_SIZE = 32 # 이보다 작은 축소 단계는 만들지 않음
+
+class PlainVar:
+    """
+    Tk 루트 창이 없는 환경(헤드리스 일괄 렌더링 등)에서 tk.Variable 대신 사용하는 값 컨테이너.
+    get/set/trace_add/trace_remove 인터페이스만 흉내냅니다.
+    """
+    def __init__(self, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def trace_add(self, mode, callback):
+        return None
+
+    def trace_remove(self, mode, cbname):
+        pass
+
+def has_tk_root() -> bool:
+    return tk._default_root is not None
+
+def make_var(var_class, value):
+    """Tk 루트가 있으면 tk 변수를, 없으면 PlainVar 를 생성합니다."""
+    return var_class(value=value) if has_tk_root() else PlainVar(value)
+
+_source_versions = itertools.count(1)
+
+def _clock_milliseconds() -> int:
+    if has_tk_root():
+        return int(tk._default_root.tk.call('clock', 'milliseconds'))
+    return int(time.time() * 1000)
+
+def _thumbnail_size(size: tuple[int, int], max_size: tuple[int, int]) -> tuple[int, int]:
+    """Image.thumbnail(max_size) 가 만들 크기. 디코딩 전에 헤더 크기만으로 계산합니다."""
+    width, height = size
+    x, y = min(max_size[0], width), min(max_size[1], height)
+    if (x, y) == (width, height):
+        return size
+    aspect = width / height
+    def round_aspect(number, key):
+        return max(min(math.floor(number), math.ceil(number), key=key), 1)
+    if x / y >= aspect:
+        x = round_aspect(y * aspect, key=lambda n: abs(aspect - n / y))
+    else:
+        y = round_aspect(x / aspect, key=lambda n: 0 if n == 0 else abs(aspect - x / n))
+    return x, y
+
+def _content_bbox(image: Image.Image, trim_tolerance: int | None) -> tuple[int, int, int, int]:
+    """
+    내용물 영역 (투명 배경 또는 균일한 단색 배경 제외). 없거나 계산할 수 없으면 이미지 전체.
+    trim_tolerance 가 None 이면 단색 배경은 자르지 않고 투명 영역만 제외합니다. (자동 잘라내기 이전 프로젝트)
+    """
+    try:
+        if find_content_bbox is not None and trim_tolerance is not None:
+            bbox = find_content_bbox(image, trim_tolerance)
+        else:
+            bbox = image.getbbox()
+    except Exception:
+        bbox = None
+    return bbox or (0, 0, image.width, image.height)
 
 class Layer:
     def __init__(self, layer_type: str):
-        self.path = f"{layer_type}_{random.randint(1000, 9999)}_{hex(int(tk._default_root.tk.call('clock', 'milliseconds')))[-4:]}"
+        self.path = f"{layer_type}_{random.randint(1000, 9999)}_{hex(_clock_milliseconds())[-4:]}"
         self.type = layer_type
-        self.is_visible = tk.BooleanVar(value=False)
+        self.is_visible = make_var(tk.BooleanVar, False)
         self.angle = 0.0
         self.selected = False
         self.widget_ref = None
+        self.mark_source_changed()
+
+    def mark_source_changed(self):
+        """픽셀 원본이 바뀌었을 때(배경 제거 등) 호출. 렌더 캐시 키가 달라지도록 전역 고유 버전을 새로 받습니다."""
+        self.source_version = next(_source_versions)
 
     def get_display_name(self) -> str:
         raise NotImplementedError
@@ -34,67 +121,290 @@ class Layer:
         raise NotImplementedError
 
 class ImageLayer(Layer):
+    """
+    생성 시에는 파일 헤더만 읽어 원본 크기만 알아 둡니다.
+    표시용/저장용 이미지는 처음 필요할 때 (JPEG 은 draft 축소 디코딩으로) 만들고,
+    원본 해상도 디코딩은 내보내기 등에서 저장용보다 큰 해상도가 필요할 때만 합니다.
+    표시 렌더링 작업 스레드에서도 접근하므로 디코딩은 레이어별 잠금 안에서 한 번만 수행됩니다.
+    """
     def __init__(self, file_path: str):
+        self._init_source(file_path)
+        self._init_layer()
+
+    @classmethod
+    def prepare(cls, file_path: str) -> "ImageLayer":
+        """
+        가져오기 작업 스레드용: Tk 에 접근하지 않고 헤더 확인, 표시용 디코딩, 내용물 잘라내기를 미리 수행합니다.
+        반환된 객체는 메인 스레드에서 finish_prepare() 를 호출한 뒤 레이어로 사용합니다.
+        """
+        layer = cls.__new__(cls)
+        layer._init_source(file_path)
+        try:
+            layer._ensure_levels()
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize ImageLayer: {e}")
+        return layer
+
+    def finish_prepare(self) -> "ImageLayer":
+        self._init_layer()
+        return self
+
+    def _init_layer(self):
+        """Tk 변수 등 메인 스레드에서 만들어야 하는 레이어 상태"""
+        file_path = self.path
         super().__init__('image')
         self.path = file_path
-        self.scale_var = tk.DoubleVar(value=30.0)
+        self.scale_var = make_var(tk.DoubleVar, 30.0)
+        if layer_buffers is not None:
+            layer_buffers.register(self)
+            # prepare 단계(작업 스레드)에서 이미 만든 버퍼도 계산에 넣음
+            for level, image in (('original', self._pil_img_original), ('save', self._pil_img_save), ('display', self._pil_img_display)):
+                if image is not None:
+                    self._touch(level, image)
+
+    def _init_source(self, file_path: str):
+        self.path = file_path
         self.content_bbox = None
         self.crop_box = None
+        self.source_bbox = None # 내용물 영역의 pil_img_original 좌표 (None 이면 원본 전체)
+        # 단색 배경 자동 잘라내기 허용 오차 (None 이면 끔). 표시용 좌표계가 달라지므로 프로젝트에 함께 저장되며 디코딩 전에만 변경
+        self.trim_tolerance = AUTO_TRIM_TOLERANCE
+        self._mip_levels = None
+        self._decode_lock = threading.Lock()
+        self._pil_img_original = None
+        self._pil_img_save = None
+        self._pil_img_display = None
+        self._levels_loaded = False
+        self._save_size = None
+        self._save_is_set = False
+        self._display_crop = None # (표시용 내용물 영역, 잘라내기 전 표시용 가로, 세로)
+        self._display_size = None # 잘라낸 표시용 이미지 크기 (버퍼를 내려놓아도 유지)
+        self._thumbnail_image = None
+        self._cache_key = None
 
         try:
-            self.pil_img_original = Image.open(file_path).convert("RGBA")
-
-            self.pil_img_save = self.pil_img_original.copy()
-            self.pil_img_save.thumbnail(SAVE_IMG_MAX_SIZE, Image.Resampling.LANCZOS)
-
-            self.pil_img_display = self.pil_img_save.copy()
-            self.pil_img_display.thumbnail(DISPLAY_IMG_MAX_SIZE, Image.Resampling.LANCZOS)
-
-            self._update_content_bbox()
-
-            if self.content_bbox and self.content_bbox != (0, 0, self.pil_img_display.width, self.pil_img_display.height):
-                save_w, save_h = self.pil_img_save.size
-                display_w, display_h = self.pil_img_display.size
-                
-                try:
-                    ratio_w = save_w / display_w if display_w > 0 else 1.0
-                    ratio_h = save_h / display_h if display_h > 0 else 1.0
-                    save_bbox = (
-                        int(self.content_bbox[0] * ratio_w),
-                        int(self.content_bbox[1] * ratio_h),
-                        int(self.content_bbox[2] * ratio_w),
-                        int(self.content_bbox[3] * ratio_h)
-                    )
-                    save_bbox = (
-                        max(0, save_bbox[0]),
-                        max(0, save_bbox[1]),
-                        min(save_w, save_bbox[2]),
-                        min(save_h, save_bbox[3])
-                    )
-                    
-                    self.pil_img_save = self.pil_img_save.crop(save_bbox)
-
-                except Exception:
-                     pass
-
-                self.pil_img_display = self.pil_img_display.crop(self.content_bbox)
-                self._update_content_bbox()
-
-            self.thumbnail = self.create_thumbnail()
-            self._thumbnail_ref = self.thumbnail
-
+            with Image.open(file_path) as probe:
+                self.original_size = probe.size
         except Exception as e:
             raise RuntimeError(f"Failed to initialize ImageLayer: {e}")
 
-    def _update_content_bbox(self):
-        try:
-            self.content_bbox = self.pil_img_display.getbbox()
-            if not self.content_bbox:
-                self.content_bbox = (0, 0, self.pil_img_display.width, self.pil_img_display.height)
-        except Exception:
-            self.content_bbox = (0, 0, self.pil_img_display.width, self.pil_img_display.height)
+    # 버퍼는 LayerBufferManager 가 다른 스레드에서 내려놓을 수 있으므로 (release_buffer) 지역 변수로 받아 반환
+    @property
+    def pil_img_original(self) -> Image.Image:
+        image = self._pil_img_original
+        if image is None:
+            with self._decode_lock:
+                if self._pil_img_original is None:
+                    with Image.open(self.path) as im:
+                        self._pil_img_original = im.convert("RGBA")
+                image = self._pil_img_original
+        self._touch('original', image)
+        return image
+
+    @pil_img_original.setter
+    def pil_img_original(self, image: Image.Image):
+        self._pil_img_original = image
+        self.original_size = image.size
+        self._pin_buffers()
+        self._touch('original', image)
+
+    @property
+    def pil_img_save(self) -> Image.Image:
+        image = self._pil_img_save
+        if image is None:
+            self._ensure_levels()
+            with self._decode_lock:
+                if self._pil_img_save is None:
+                    self._load_save()
+                image = self._pil_img_save
+        self._touch('save', image)
+        return image
+
+    @pil_img_save.setter
+    def pil_img_save(self, image: Image.Image):
+        self._pil_img_save = image
+        self._save_is_set = True
+        self._pin_buffers()
+        self._touch('save', image)
+
+    @property
+    def pil_img_display(self) -> Image.Image:
+        image = self._pil_img_display
+        if image is None:
+            with self._decode_lock:
+                if self._pil_img_display is None:
+                    self._load_display()
+                    self._levels_loaded = True
+                image, original = self._pil_img_display, self._pil_img_original
+            if original is not None:
+                self._touch('original', original) # 축소 없이 디코딩된 경우 원본도 함께 보관됨
+        self._touch('display', image)
+        return image
+
+    @pil_img_display.setter
+    def pil_img_display(self, image: Image.Image):
+        self._levels_loaded = True # 배경 제거 등으로 직접 설정된 경우 파일에서 다시 만들지 않음
+        self._pil_img_display = image
+        self._thumbnail_image = None
+        self._pin_buffers()
+        self._touch('display', image)
+
+    def _ensure_levels(self):
+        """내용물 영역 등 표시용 이미지에서 얻는 정보가 준비되도록 합니다."""
+        if not self._levels_loaded:
+            self.pil_img_display
+
+    def levels_ready(self) -> bool:
+        """내용물 영역과 표시용 크기를 디코딩 없이 알 수 있는지. (False 이면 load_levels 가 디코딩을 일으킴)"""
+        return self._levels_loaded
+
+    def load_levels(self):
+        """표시용 이미지를 디코딩(또는 캐시에서 읽기)해 크기 정보를 준비합니다. 작업 스레드에서 미리 호출하는 용도"""
+        self._ensure_levels()
+
+    def _estimated_display_size(self) -> tuple[int, int]:
+        """디코딩 전 헤더 크기만으로 계산한 표시용 이미지 크기 (내용물 잘라내기 전)"""
+        return _thumbnail_size(_thumbnail_size(self.original_size, SAVE_IMG_MAX_SIZE), DISPLAY_IMG_MAX_SIZE)
+
+    def _touch(self, level: str, *images: Image.Image):
+        if layer_buffers is not None:
+            layer_buffers.touch(self, level, sum(image_nbytes(image) for image in images))
+
+    def _pin_buffers(self):
+        # 직접 설정된 버퍼는 파일에서 다시 만들 수 없으므로 내려놓지 않음
+        if layer_buffers is not None:
+            layer_buffers.pin(self)
+
+    def release_buffer(self, level: str):
+        """LayerBufferManager 가 예산을 넘었을 때 호출합니다. 다음에 필요하면 파일이나 디스크 캐시에서 다시 만듭니다."""
+        with self._decode_lock:
+            if level == 'original':
+                self._pil_img_original = None
+            elif level == 'save':
+                self._pil_img_save = None
+            elif level == 'display':
+                self._pil_img_display = None
+                self._mip_levels = None
+            elif level == 'mips':
+                self._mip_levels = None
+
+    def get_buffer_bytes(self) -> int:
+        return layer_buffers.layer_bytes(self) if layer_buffers is not None else 0
+
+    def _decode(self, size: tuple[int, int]) -> Image.Image:
+        """파일을 size 로 디코딩합니다. JPEG 은 draft 로 size 이상인 가장 작은 DCT 배율만 디코딩합니다. (잠금 안에서 호출)"""
+        with Image.open(self.path) as im:
+            im.draft(None, size) # JPEG 외 형식에서는 아무 일도 하지 않음
+            decoded = im.convert("RGBA")
+        if decoded.size == self.original_size and self._pil_img_original is None:
+            self._pil_img_original = decoded # 축소 없이 디코딩됐으면 원본으로도 사용
+        if decoded.size != size:
+            decoded = decoded.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        return decoded
+
+    def _load_display(self):
+        """
+        표시용 이미지를 만들고 내용물 영역으로 잘라냅니다. 저장용 이미지는 처음 필요할 때 _load_save 에서 만듭니다.
+        같은 파일을 전에 불러온 적이 있으면 디스크 파생 캐시에서 읽어 디코딩을 건너뜁니다.
+        """
+        self._save_size = _thumbnail_size(self.original_size, SAVE_IMG_MAX_SIZE)
+        if derivative_cache is not None:
+            self._cache_key = derivative_cache.make_key(self.path, (SAVE_IMG_MAX_SIZE, DISPLAY_IMG_MAX_SIZE, THUMBNAIL_SIZE, self.trim_tolerance))
+            if self._load_cached_display():
+                return
+        # 다시 불러오는 경우(버퍼를 내려놓은 뒤) 다른 스레드가 중간 값을 보지 않도록 지역 변수로 계산한 뒤 한 번에 반영
+        display = self._decode(_thumbnail_size(self._save_size, DISPLAY_IMG_MAX_SIZE))
+        content_bbox = _content_bbox(display, self.trim_tolerance)
+        display_crop, source_bbox = None, self.source_bbox
+
+        if content_bbox != (0, 0, display.width, display.height):
+            display_w, display_h = display.size
+            display_crop = (content_bbox, display_w, display_h)
+
+            # 원본 좌표는 반올림하지 않고 실수 그대로 보관 (resize(box=) 에 사용). 원본은 디코딩하지 않고 헤더 크기 사용
+            orig_ratio_w = self.original_size[0] / display_w
+            orig_ratio_h = self.original_size[1] / display_h
+            source_bbox = (content_bbox[0] * orig_ratio_w, content_bbox[1] * orig_ratio_h,
+                           content_bbox[2] * orig_ratio_w, content_bbox[3] * orig_ratio_h)
+
+            display = display.crop(content_bbox)
+            content_bbox = (0, 0, display.width, display.height)
+
+        thumbnail = self._make_thumbnail_image(display)
+        self._pil_img_display, self._thumbnail_image = display, thumbnail
+        self.content_bbox, self.source_bbox, self._display_crop = content_bbox, source_bbox, display_crop
+        self._display_size = display.size
+        if derivative_cache is not None:
+            meta = {'content_bbox': content_bbox, 'source_bbox': source_bbox, 'display_crop': display_crop}
+            derivative_cache.store(self._cache_key, 'display', meta, {'display': display, 'thumbnail': thumbnail})
+
+    def _load_cached_display(self) -> bool:
+        cached = derivative_cache.load(self._cache_key, 'display')
+        if cached is None:
+            return False
+        meta, images = cached
+        crop = meta['display_crop']
+        self._pil_img_display, self._thumbnail_image = images['display'], images['thumbnail']
+        self.content_bbox, self.source_bbox, self._display_crop = (
+            tuple(meta['content_bbox']),
+            tuple(meta['source_bbox']) if meta['source_bbox'] else None,
+            (tuple(crop[0]), crop[1], crop[2]) if crop else None)
+        self._display_size = self._pil_img_display.size
+        return True
+
+    def _load_save(self):
+        """저장용 이미지를 디스크 캐시에서 읽거나 새로 만듭니다. (잠금 안에서 호출)"""
+        if derivative_cache is not None:
+            cached = derivative_cache.load(self._cache_key, 'save')
+            if cached is not None:
+                self._pil_img_save = cached[1]['save']
+                return
+        self._build_save()
+        if derivative_cache is not None:
+            derivative_cache.store(self._cache_key, 'save', {}, {'save': self._pil_img_save})
+
+    def _build_save(self):
+        """저장용 크기로 디코딩하고 표시용 내용물 영역을 덮는 정수 영역으로 잘라냅니다."""
+        self._pil_img_save = self._decode(self._save_size)
+        save_crop = self._save_crop_box()
+        if save_crop:
+            self._pil_img_save = self._pil_img_save.crop(save_crop[0])
+
+    def _save_crop_box(self) -> tuple[tuple, tuple] | None:
+        """
+        (_save_size 이미지에서 잘라낼 정수 영역, 잘라낸 이미지 안에서 표시용 이미지 전체에 정확히 대응하는 실수 박스).
+        표시용 내용물 영역을 비례 변환하며, 정수 영역은 내용물이 잘리지 않도록 바깥쪽으로 맞춥니다. 디코딩 없이 계산됩니다.
+        """
+        if not self._display_crop:
+            return None
+        content_bbox, display_w, display_h = self._display_crop
+        save_w, save_h = self._save_size
+        ratio_w = save_w / display_w if display_w > 0 else 1.0
+        ratio_h = save_h / display_h if display_h > 0 else 1.0
+        # 부동소수 오차로 한 픽셀 더 넓어지지 않도록 반올림 후 내림/올림
+        exact = tuple(round(value, 6) for value in (content_bbox[0] * ratio_w, content_bbox[1] * ratio_h,
+                                                     content_bbox[2] * ratio_w, content_bbox[3] * ratio_h))
+        crop = (max(0, math.floor(exact[0])), max(0, math.floor(exact[1])),
+                min(save_w, math.ceil(exact[2])), min(save_h, math.ceil(exact[3])))
+        return crop, (exact[0] - crop[0], exact[1] - crop[1], exact[2] - crop[0], exact[3] - crop[1])
+
+    def _save_box(self) -> tuple:
+        """pil_img_save 안에서 표시용 이미지 전체에 대응하는 영역 (디코딩 없이 계산)"""
+        if self._save_is_set: # 직접 설정된 저장용 이미지(배경 제거 결과)는 전체가 내용물
+            return (0, 0, self._pil_img_save.width, self._pil_img_save.height)
+        self._ensure_levels()
+        save_crop = self._save_crop_box()
+        return save_crop[1] if save_crop else (0, 0, self._save_size[0], self._save_size[1])
 
-    def get_content_dimensions(self) -> tuple[int, int]:
+    def _update_content_bbox(self):
+        display = self.pil_img_display
+        self.content_bbox, self._display_size = _content_bbox(display, self.trim_tolerance), display.size
+
+    def get_content_dimensions(self, estimate: bool = False) -> tuple[int, int]:
+        """내용물 크기 (pil_img_display 좌표). estimate=True 이면 준비 전에는 디코딩하지 않고 헤더 크기로 추정합니다."""
+        if estimate and not self._levels_loaded:
+            return self._estimated_display_size()
+        self._ensure_levels()
         if self.content_bbox:
             width = self.content_bbox[2] - self.content_bbox[0]
             height = self.content_bbox[3] - self.content_bbox[1]
@@ -105,17 +415,26 @@ class ImageLayer(Layer):
     def get_display_name(self) -> str:
         return os.path.basename(self.path)
 
-    def create_thumbnail(self) -> ImageTk.PhotoImage:
-        try:
-            thumb_img = self.pil_img_display.copy()
-            thumb_img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    @staticmethod
+    def _make_thumbnail_image(display: Image.Image) -> Image.Image:
+        thumb_img = display.copy()
+        thumb_img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
 
-            final_thumb = Image.new('RGBA', THUMBNAIL_SIZE, (0,0,0,0))
-            paste_x = (THUMBNAIL_SIZE[0] - thumb_img.width) // 2
-            paste_y = (THUMBNAIL_SIZE[1] - thumb_img.height) // 2
-            final_thumb.paste(thumb_img, (paste_x, paste_y))
+        final_thumb = Image.new('RGBA', THUMBNAIL_SIZE, (0,0,0,0))
+        paste_x = (THUMBNAIL_SIZE[0] - thumb_img.width) // 2
+        paste_y = (THUMBNAIL_SIZE[1] - thumb_img.height) // 2
+        final_thumb.paste(thumb_img, (paste_x, paste_y))
+        return final_thumb
 
-            return ImageTk.PhotoImage(final_thumb)
+    def create_thumbnail(self) -> ImageTk.PhotoImage:
+        """준비 전(프로젝트 불러오기 직후 등)에는 디코딩하지 않고 빈 썸네일을 반환합니다. 준비된 뒤 다시 호출해 갱신"""
+        try:
+            thumbnail = self._thumbnail_image
+            if thumbnail is None:
+                if not self._levels_loaded:
+                    raise LookupError("표시용 이미지 준비 전")
+                thumbnail = self._thumbnail_image = self._make_thumbnail_image(self.pil_img_display)
+            return ImageTk.PhotoImage(thumbnail)
         except Exception:
             empty = Image.new('RGBA', THUMBNAIL_SIZE, Colors.GREY)
             return ImageTk.PhotoImage(empty)
@@ -123,15 +442,103 @@ class ImageLayer(Layer):
     def get_pil_image_to_process(self):
         return self.pil_img_display.crop(self.crop_box) if self.crop_box else self.pil_img_display
 
+    def mark_source_changed(self):
+        super().mark_source_changed()
+        self._mip_levels = None # 표시용 이미지가 바뀌었으므로 축소 단계를 다시 만듦
+
+    def _get_mip_levels(self) -> list[tuple[Image.Image, int]]:
+        """pil_img_display 의 1/2, 1/4, ... 축소본을 처음 필요할 때 만들어 작은 것부터 (이미지, 축소 배수) 로 반환합니다."""
+        mip_levels = self._mip_levels
+        if mip_levels is None:
+            levels = []
+            level, factor = self.pil_img_display, 1
+            while level.width // 2 >= MIP_MIN_SIZE and level.height // 2 >= MIP_MIN_SIZE:
+                level, factor = level.reduce(2), factor * 2
+                levels.append((level, factor))
+            mip_levels = self._mip_levels = levels[::-1]
+        self._touch('mips', *(mip for mip, _factor in mip_levels))
+        return mip_levels
+
+    def get_region_dimensions(self, estimate: bool = False) -> tuple[int, int]:
+        """
+        crop_box 를 적용한 처리 영역의 크기 (pil_img_display 좌표 기준, 화면/저장 크기 계산의 기준 단위).
+        준비된 뒤에는 버퍼를 내려놓았어도 다시 디코딩하지 않으며, estimate=True 이면 준비 전에는 헤더 크기로 추정합니다.
+        """
+        if self.crop_box:
+            return max(1, self.crop_box[2] - self.crop_box[0]), max(1, self.crop_box[3] - self.crop_box[1])
+        if estimate and not self._levels_loaded:
+            width, height = self._estimated_display_size()
+        else:
+            self._ensure_levels()
+            display = self._pil_img_display
+            width, height = display.size if display is not None else self._display_size
+        return max(1, width), max(1, height)
+
+    def _source_candidates(self, include_original: bool = True) -> list[tuple]:
+        """
+        해상도 레벨(축소 단계, 표시용, 저장용, 원본)을 작은 것부터 (이미지를 돌려주는 함수, 내용물 영역 박스) 로 반환합니다.
+        박스는 디코딩 없이 계산되므로 저장용/원본은 함수를 호출할 때만 읽거나 디코딩됩니다.
+        """
+        display = self.pil_img_display
+        display_w, display_h = display.size
+        candidates = []
+        for mip, factor in self._get_mip_levels():
+            # reduce(2) 는 홀수 크기를 올림하므로 내용 영역은 실수 박스로 표현
+            candidates.append((lambda mip=mip: mip, (0, 0, display_w / factor, display_h / factor), 'mips'))
+        candidates.append((lambda: display, (0, 0, display_w, display_h), 'display'))
+        candidates.append((lambda: self.pil_img_save, self._save_box(), 'save'))
+        if include_original:
+            candidates.append((lambda: self.pil_img_original, self._original_box(), 'original'))
+        return candidates
+
+    def get_source_levels(self, include_original: bool = True) -> list[tuple[Image.Image, tuple]]:
+        """
+        해상도 레벨(축소 단계, 표시용, 저장용, 원본)을 작은 것부터 (이미지, 내용물 영역 박스) 로 반환합니다.
+        박스는 각 레벨 자신의 좌표이며, 모두 pil_img_display 전체와 같은 영역을 가리킵니다.
+        include_original=False 이면 원본 레벨을 빼서 원본 디코딩을 일으키지 않습니다.
+        """
+        return [(load(), box) for load, box, _level in self._source_candidates(include_original)]
+
+    def _original_box(self) -> tuple:
+        return self.source_bbox or (0, 0, self.original_size[0], self.original_size[1])
+
+    def select_source(self, needed_w: int, needed_h: int, loaded_only: bool = False) -> tuple[Image.Image, tuple] | None:
+        """
+        needed_w x needed_h 로 리샘플링할 때 쓸 (이미지, 원본 영역 박스) 를 고릅니다.
+        crop_box 를 적용한 영역이 필요한 크기 이상인 레벨 중 가장 작은 것을 쓰고, 없으면 가장 큰 레벨(원본)을 씁니다.
+        저장용/원본은 실제로 선택됐을 때만 읽거나 디코딩합니다.
+        loaded_only=True 이면 디코딩이 필요할 때 None 을 반환합니다. (메인 스레드에서 작업 스레드로 넘길지 판단)
+        """
+        if loaded_only and (not self._levels_loaded or self._pil_img_display is None):
+            return None
+        display_w, display_h = self.pil_img_display.size
+        chosen = None
+        for load, (bx0, by0, bx1, by1), level in self._source_candidates():
+            sx, sy = (bx1 - bx0) / max(1, display_w), (by1 - by0) / max(1, display_h)
+            if self.crop_box:
+                cx0, cy0, cx1, cy1 = self.crop_box
+                box = (bx0 + cx0 * sx, by0 + cy0 * sy, bx0 + cx1 * sx, by0 + cy1 * sy)
+            else:
+                box = (bx0, by0, bx1, by1)
+            chosen = (load, box, level)
+            if box[2] - box[0] >= needed_w and box[3] - box[1] >= needed_h:
+                break
+        if loaded_only:
+            resident = {'save': self._pil_img_save, 'original': self._pil_img_original}
+            if resident.get(chosen[2], True) is None:
+                return None
+        return chosen[0](), chosen[1]
+
 class TextLayer(Layer):
     def __init__(self, text, font_family, font_size, color):
         super().__init__('text')
         self.text = text
         self.font_family = font_family
-        self.scale_var = tk.DoubleVar(value=font_size)
+        self.scale_var = make_var(tk.DoubleVar, font_size)
         self.color = color
-        self.thumbnail = self.create_thumbnail()
-        self._thumbnail_ref = self.thumbnail
+        if has_tk_root():
+            self.thumbnail = self.create_thumbnail()
+            self._thumbnail_ref = self.thumbnail
 
     def get_display_name(self) -> str:
         return self.text
@@ -140,8 +547,7 @@ class TextLayer(Layer):
         thumb = Image.new('RGBA', THUMBNAIL_SIZE, (255, 255, 255, 0))
         draw = ImageDraw.Draw(thumb)
         try:
-            font_path = FontService.get_font_path('malgun.ttf')
-            font = ImageFont.truetype(font_path, 32)
+            font = FontService.get_font('malgun.ttf', 32)
             draw.text((8, 4), "T", font=font, fill=Colors.DARK_TEAL)
         except Exception:
             draw.text((8, 4), "T", fill=Colors.DARK_TEAL)
@@ -152,10 +558,11 @@ class ShapeLayer(Layer):
         super().__init__('shape')
         self.shape_type = shape_type
         self.color = color
-        self.scale_var = tk.DoubleVar(value=100.0)
+        self.scale_var = make_var(tk.DoubleVar, 100.0)
         self.pil_image = pil_image
-        self.thumbnail = self.create_thumbnail()
-        self._thumbnail_ref = self.thumbnail
+        if has_tk_root():
+            self.thumbnail = self.create_thumbnail()
+            self._thumbnail_ref = self.thumbnail
 
     def get_display_name(self) -> str:
         return self.shape_type
@@ -183,15 +590,19 @@ class ShapeLayer(Layer):
         return ImageTk.PhotoImage(thumb)
 
     def _get_shape_points(self, center, size):
+        return ShapeLayer.get_shape_points(self.shape_type, center, size)
+
+    @staticmethod
+    def get_shape_points(shape_type, center, size):
         x, y = center; r = size / 2
         n_map = {'삼각형': 3, '오각형': 5, '육각형': 6}
         offset_map = {'삼각형': -90, '오각형': -90, '육각형': -30}
 
-        if self.shape_type == "사각형":
+        if shape_type == "사각형":
             return [x-r, y-r, x+r, y-r, x+r, y+r, x-r, y+r]
 
-        n = n_map.get(self.shape_type)
-        offset = math.radians(offset_map.get(self.shape_type, 0))
+        n = n_map.get(shape_type)
+        offset = math.radians(offset_map.get(shape_type, 0))
 
         if n:
             return [p for i in range(n) for p in (x + r * math.cos(2*math.pi*i/n + offset), y + r * math.sin(2*math.pi*i/n + offset))]
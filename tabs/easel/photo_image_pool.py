@@ -0,0 +1,77 @@
+import weakref
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+# 재사용을 위해 보관하는 PhotoImage 의 총 픽셀 바이트 상한
+PHOTO_POOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+class PhotoImagePool:
+    """
+    캔버스 항목용 ImageTk.PhotoImage 를 재사용합니다. (Tk 메인 스레드 전용)
+    같은 크기로 다시 그리면 기존 PhotoImage 에 paste 로 픽셀만 갱신하고, 크기가 바뀌면 반납된
+    같은 (모드, 크기) 의 PhotoImage 를 꺼내 씁니다. 드래그/회전/확대 중 Tcl 이미지 생성/삭제를 줄입니다.
+    """
+    def __init__(self, max_bytes: int = PHOTO_POOL_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._free: OrderedDict = OrderedDict() # (모드, 가로, 세로) -> [PhotoImage, ...] (오래 반납된 크기부터)
+        self._free_bytes = 0
+        self._keys = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _key(image: Image.Image) -> tuple:
+        return image.mode, image.width, image.height
+
+    @staticmethod
+    def _nbytes(key: tuple) -> int:
+        mode, w, h = key
+        return w * h * len(mode)
+
+    def acquire(self, image: Image.Image, current: ImageTk.PhotoImage | None = None) -> ImageTk.PhotoImage:
+        """
+        image 를 표시할 PhotoImage 를 반환합니다. current 와 (모드, 크기) 가 같으면 current 에 덮어쓰고,
+        아니면 풀에서 꺼내거나 새로 만들고 current 는 반납합니다. 호출자는 반환값을 항목에 바로 설정해야 합니다.
+        """
+        key = self._key(image)
+        if current is not None and self._keys.get(current) == key:
+            current.paste(image)
+            return current
+
+        photo = self._take(key)
+        if photo is not None:
+            photo.paste(image)
+        else:
+            photo = ImageTk.PhotoImage(image)
+            self._keys[photo] = key
+        if current is not None:
+            self.release(current)
+        return photo
+
+    def release(self, photo: ImageTk.PhotoImage | None):
+        """더 이상 어떤 캔버스 항목에도 설정되지 않은 PhotoImage 를 반납합니다."""
+        key = self._keys.get(photo) if photo is not None else None
+        if key is None:
+            return
+        self._free.setdefault(key, []).append(photo)
+        self._free.move_to_end(key)
+        self._free_bytes += self._nbytes(key)
+        while self._free_bytes > self.max_bytes and self._free:
+            old_key, photos = next(iter(self._free.items()))
+            photos.pop(0)
+            self._free_bytes -= self._nbytes(old_key)
+            if not photos:
+                del self._free[old_key]
+
+    def _take(self, key: tuple) -> ImageTk.PhotoImage | None:
+        photos = self._free.get(key)
+        if not photos:
+            return None
+        photo = photos.pop()
+        self._free_bytes -= self._nbytes(key)
+        if not photos:
+            del self._free[key]
+        return photo
+
+    def clear(self):
+        self._free.clear()
+        self._free_bytes = 0
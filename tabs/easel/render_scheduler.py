@@ -0,0 +1,82 @@
+from .services.frame_profiler import frame_profiler
+
+class RenderScheduler:
+    """
+    캔버스 다시 그리기 요청을 모았다가 Tk 유휴 시점(after_idle)에 한 번만 처리합니다.
+    Spinbox 화살표를 누르고 있거나 창 크기를 바꿀 때 발생하는 연속 이벤트가
+    각각 전체 렌더링을 하지 않도록, 한 프레임 동안 객체마다 최대 한 번만 다시 그립니다.
+
+    flush_view(refit): 캔버스 크기/테두리를 갱신하고 모든 객체를 다시 그림 (refit 이면 fit_scale 재계산 포함)
+    flush_object(obj): 레이어 또는 로고 dict 하나를 다시 그림
+    flush_viewport(): 스크롤로 보이는 영역이 바뀌었을 때 새로 보이게 된 객체를 그림 (선택)
+    update_idletasks() 도 대기 중인 요청을 처리하므로, 표시 결과가 바로 필요하면 flush() 또는 update_idletasks() 를 호출합니다.
+    """
+    def __init__(self, widget, flush_view, flush_object, flush_viewport=None):
+        self.widget = widget
+        self.flush_view = flush_view
+        self.flush_object = flush_object
+        self.flush_viewport = flush_viewport
+        self._dirty_objects: dict[str, object] = {}
+        self._view_dirty = False
+        self._viewport_dirty = False
+        self._refit = False
+        self._after_id = None
+
+    def invalidate_object(self, layer_or_logo):
+        path = layer_or_logo.get('path') if isinstance(layer_or_logo, dict) else layer_or_logo.path
+        self._dirty_objects[path] = layer_or_logo
+        self._schedule()
+
+    def invalidate_view(self, refit: bool = False):
+        self._view_dirty = True
+        self._refit = self._refit or refit
+        self._schedule()
+
+    def invalidate_viewport(self):
+        if self.flush_viewport:
+            self._viewport_dirty = True
+            self._schedule()
+
+    def discard_object(self, path: str):
+        """캔버스에서 제거된 객체의 대기 중인 요청을 버립니다."""
+        self._dirty_objects.pop(path, None)
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.widget.after_idle(self.flush)
+
+    def flush(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+        view_dirty, refit, viewport_dirty = self._view_dirty, self._refit, self._viewport_dirty
+        dirty_objects = list(self._dirty_objects.values())
+        self._view_dirty = self._refit = self._viewport_dirty = False
+        self._dirty_objects.clear()
+
+        # 한 번의 flush 가 프레임 하나 (작업 스레드의 렌더링 시간은 'render' 단계로 따로 기록됨)
+        frame_profiler.begin_frame()
+        try:
+            if view_dirty:
+                self.flush_view(refit) # 전체 다시 그리기에 개별 객체/보이는 영역 요청도 포함됨
+                return
+            for obj in dirty_objects:
+                self.flush_object(obj)
+            if viewport_dirty:
+                self.flush_viewport()
+        finally:
+            frame_profiler.end_frame()
+
+    def cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._dirty_objects.clear()
+        self._view_dirty = self._refit = self._viewport_dirty = False
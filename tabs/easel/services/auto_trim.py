@@ -0,0 +1,76 @@
+import os
+from PIL import Image, ImageChops
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 배경색과의 채널별 차이가 이 값 이하이면 배경으로 봄 (JPEG 압축 잡음 흡수, 환경 변수로 변경 가능)
+AUTO_TRIM_TOLERANCE = int(os.environ.get("CITRUS_TRIM_TOLERANCE", "16"))
+# 배경색 추정에 쓰는 변마다의 표본 수와, 배경으로 인정하기 위해 배경색에 가까워야 하는 표본 비율
+EDGE_SAMPLES_PER_SIDE = 64
+EDGE_BACKGROUND_RATIO = 0.9
+
+
+def _edge_samples(image: Image.Image) -> list[tuple]:
+    """네 변에서 고르게 뽑은 RGBA 표본"""
+    w, h = image.size
+    samples = []
+    for box, length in (((0, 0, w, 1), w), ((0, h - 1, w, h), w), ((0, 0, 1, h), h), ((w - 1, 0, w, h), h)):
+        pixels = list(image.crop(box).getdata())
+        step = max(1, length // EDGE_SAMPLES_PER_SIDE)
+        samples.extend(pixels[::step])
+    return samples
+
+
+def estimate_background(image: Image.Image, tolerance: int = AUTO_TRIM_TOLERANCE) -> tuple | None:
+    """
+    가장자리 표본의 채널별 중앙값을 배경색 (R, G, B) 으로 추정합니다.
+    불투명 표본이 EDGE_BACKGROUND_RATIO 이상 그 색에 가깝지 않으면 균일한 배경이 없는 것으로 보고 None.
+    """
+    edge = _edge_samples(image)
+    samples = [p for p in edge if p[3] == 255]
+    if not samples:
+        return None
+    background = tuple(sorted(p[c] for p in samples)[len(samples) // 2] for c in range(3))
+    close = sum(1 for p in samples if max(abs(p[c] - background[c]) for c in range(3)) <= tolerance)
+    return background if close >= EDGE_BACKGROUND_RATIO * len(edge) else None
+
+
+def find_content_bbox(image: Image.Image, tolerance: int = AUTO_TRIM_TOLERANCE) -> tuple[int, int, int, int]:
+    """
+    내용물 영역 (x0, y0, x1, y1). 가장자리가 투명하면 기존처럼 투명 영역만 잘라내고(getbbox),
+    가장자리가 균일한 불투명 배경(흰 스튜디오 배경 등)이면 배경색과 tolerance 넘게 다른 픽셀의 영역을 찾습니다.
+    numpy 가 있으면 배열 연산으로, 없으면 Pillow 채널 연산으로 같은 결과를 계산합니다. 내용물이 없으면 이미지 전체.
+    """
+    full = (0, 0, image.width, image.height)
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    background = estimate_background(image, tolerance)
+    if background is None:
+        return image.getbbox() or full
+
+    if NUMPY_AVAILABLE:
+        pixels = np.asarray(image)
+        mask = pixels[..., 3] > 0
+        # 채널별 범위 비교가 (H, W, 3) 차이 배열을 만드는 것보다 빠름
+        outside = None
+        for channel, value in enumerate(background):
+            plane = pixels[..., channel]
+            differs = (plane < value - tolerance) | (plane > value + tolerance)
+            outside = differs if outside is None else outside | differs
+        mask &= outside
+        rows, columns = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(mask.any(axis=0))
+        if rows.size == 0:
+            return full
+        return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+    red, green, blue, alpha = image.split()
+    diff_r, diff_g, diff_b = ImageChops.difference(Image.merge('RGB', (red, green, blue)),
+                                                   Image.new('RGB', image.size, background)).split()
+    difference = ImageChops.lighter(ImageChops.lighter(diff_r, diff_g), diff_b)
+    mask = ImageChops.multiply(difference.point(lambda v: 255 if v > tolerance else 0),
+                               alpha.point(lambda v: 255 if v > 0 else 0))
+    return mask.getbbox() or full
@@ -0,0 +1,124 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+
+from .project_service import ProjectService
+from .image_service import ImageService
+
+PROJECT_EXTENSION = ".wsb"
+LOGO_MARGIN = 15
+
+def render_project_file(project_path: str, output_dir: str | None = None, output_format: str | None = None,
+                        max_file_kb: int | None = None) -> dict:
+    """
+    .wsb 프로젝트 하나를 디스플레이 없이 불러와 이미지 파일로 렌더링합니다.
+    프로세스 풀의 작업 단위이므로 모듈 최상위 함수로 두며, 예외 대신 결과 dict 를 반환합니다.
+    """
+    started = time.perf_counter()
+    result = {'project': project_path, 'output': None, 'ok': False, 'seconds': 0.0, 'error': None, 'missing_files': [], 'oversize': []}
+    try:
+        project_data = ProjectService.read_project_file(project_path, on_missing_file=result['missing_files'].append)
+        settings = dict(project_data.get('settings', {}))
+        layers = project_data.get('layers', [])
+        positions = project_data.get('canvas_positions', {})
+
+        canvas_objects = BatchRenderService.build_canvas_objects(layers, positions)
+        settings['logo_info'] = BatchRenderService.build_logo_info(settings, positions)
+
+        fmt = output_format or settings.get('output_format') or "PNG"
+        target_dir = output_dir or os.path.dirname(os.path.abspath(project_path))
+        stem = os.path.splitext(os.path.basename(project_path))[0]
+        output_path = os.path.join(target_dir, stem + ImageService.get_extension(fmt))
+
+        if max_file_kb is not None:
+            settings['max_file_kb'] = max_file_kb
+        written = ImageService.write_canvas(settings, layers, canvas_objects, output_path, fmt)
+
+        result.update(output=", ".join(r['path'] for r in written), ok=True,
+                      oversize=[r['path'] for r in written if not r['fits']])
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+class BatchRenderService:
+    """저장된 .wsb 프로젝트들을 UI 없이 일괄 렌더링하는 서비스"""
+
+    @staticmethod
+    def collect_project_paths(inputs: list[str]) -> list[str]:
+        """파일/폴더 경로 목록에서 .wsb 파일을 찾아 정렬된 목록으로 반환합니다."""
+        found = []
+        for item in inputs:
+            if os.path.isdir(item):
+                for root, _dirs, files in os.walk(item):
+                    found.extend(os.path.join(root, f) for f in files if f.lower().endswith(PROJECT_EXTENSION))
+            elif os.path.isfile(item):
+                found.append(item)
+            else:
+                print(f"경고: '{item}' 경로를 찾을 수 없어 건너뜁니다.")
+        return sorted(dict.fromkeys(os.path.normpath(p) for p in found))
+
+    @staticmethod
+    def build_canvas_objects(layers, positions: dict) -> dict:
+        """
+        저장된 상대 좌표로 render_canvas 가 사용하는 canvas_objects 형태를 구성합니다.
+        위치 정보가 없는 레이어는 캔버스에 새로 추가될 때처럼 중앙에 놓입니다.
+        """
+        canvas_objects = {}
+        for layer in layers:
+            if not layer.is_visible.get():
+                continue
+            pos = positions.get(layer.path, {})
+            canvas_objects[layer.path] = {'rel_x': pos.get('rel_x', 0.5), 'rel_y': pos.get('rel_y', 0.5), 'angle': layer.angle}
+        return canvas_objects
+
+    @staticmethod
+    def build_logo_info(settings: dict, positions: dict) -> dict | None:
+        logo_path = settings.get('logo_path')
+        if not logo_path or not os.path.exists(logo_path):
+            return None
+
+        logo_img = Image.open(logo_path).convert("RGBA")
+        pos = positions.get('logo')
+        if not pos:
+            # EaselController._add_logo_to_canvas 와 같은 기본 위치 (좌측 여백 + 로고 구역 세로 중앙)
+            lw, lh = settings['output_width'], settings['output_height']
+            zone_h = lh * (settings['logo_zone_height'] / 1500.0)
+            logo_h = zone_h * (settings['logo_size'] / 100.0)
+            logo_w = logo_img.width * logo_h / logo_img.height if logo_img.height > 0 else 20
+            pos = {'rel_x': (LOGO_MARGIN + logo_w / 2) / lw, 'rel_y': (zone_h / 2) / lh}
+
+        return {'type': 'logo', 'path': 'logo', 'pil_img_original': logo_img,
+                'rel_x': pos['rel_x'], 'rel_y': pos['rel_y'], 'angle': 0.0}
+
+    @staticmethod
+    def render_projects(project_paths: list[str], output_dir: str | None = None, output_format: str | None = None,
+                        workers: int | None = None, on_result=None, max_file_kb: int | None = None) -> list[dict]:
+        """
+        프로젝트 단위로 프로세스 풀에 분배해 렌더링합니다.
+        on_result(result) 는 각 프로젝트가 끝날 때마다(완료 순서대로) 호출됩니다.
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        results = []
+        if workers == 1 or len(project_paths) <= 1:
+            for path in project_paths:
+                result = render_project_file(path, output_dir, output_format, max_file_kb)
+                results.append(result)
+                if on_result: on_result(result)
+            return results
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(render_project_file, path, output_dir, output_format, max_file_kb): path for path in project_paths}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e: # 워커 프로세스 자체가 죽은 경우
+                    result = {'project': futures[future], 'output': None, 'ok': False, 'seconds': 0.0,
+                              'error': f"{type(e).__name__}: {e}", 'missing_files': [], 'oversize': []}
+                results.append(result)
+                if on_result: on_result(result)
+        return results
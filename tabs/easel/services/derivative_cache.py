@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+from PIL import Image
+
+# 형식이나 파생 이미지 생성 방식이 바뀌면 올려서 이전 항목을 무시
+DERIVATIVE_CACHE_VERSION = 2
+DERIVATIVE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# 한도를 넘으면 이 비율까지 줄여, 가득 찬 뒤에도 저장할 때마다 디렉터리를 훑지 않도록 함
+EVICT_TARGET_RATIO = 0.9
+# 내용 해시는 파일 전체 대신 앞/가운데/끝 조각만 읽어 계산
+HASH_SAMPLE_BYTES = 64 * 1024
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+def default_cache_dir() -> str:
+    if os.name == 'nt':
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "CiTRUS", "cache", "derivatives")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "citrus", "derivatives")
+
+
+class DerivativeCache:
+    """
+    가져온 이미지 파일의 파생 데이터(표시용/저장용 이미지, 썸네일, 내용물 영역)를 디스크에 보관하는 캐시.
+    키는 파일 경로, 크기, 수정 시각, 표본 내용 해시로 만들며, 파일이 바뀌면 키가 달라져 자동으로 무효가 됩니다.
+    항목은 JSON 헤더 + 무압축 픽셀 버퍼 형식이라 디코딩 없이 바로 읽히고,
+    전체 크기는 저장할 때마다 누적해 두고(처음 한 번만 디렉터리를 훑음), max_bytes 를 넘을 때만
+    디렉터리를 훑어 가장 오래 사용하지 않은(수정 시각 기준) 파일부터 지웁니다.
+    캐시 읽기/쓰기 실패는 조용히 무시되어 원본 디코딩으로 대체됩니다. (가져오기 작업 스레드에서도 사용)
+    """
+    def __init__(self, directory: str | None = None, max_bytes: int = DERIVATIVE_CACHE_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.enabled = os.environ.get("CITRUS_DERIVATIVE_CACHE", "1") != "0"
+        self._lock = threading.Lock()
+        self._total_bytes = None # 아직 디렉터리를 훑지 않았으면 None
+
+    def make_key(self, file_path: str, extra=()) -> str | None:
+        """파일 상태와 표본 내용 해시로 만든 항목 키. 파일을 읽을 수 없으면 None"""
+        if not self.enabled:
+            return None
+        try:
+            stat = os.stat(file_path)
+            digest = hashlib.blake2b(digest_size=20)
+            digest.update(repr((DERIVATIVE_CACHE_VERSION, os.path.abspath(file_path), stat.st_size,
+                                stat.st_mtime_ns, tuple(extra))).encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                for offset in sorted({0, max(0, stat.st_size // 2 - HASH_SAMPLE_BYTES // 2),
+                                      max(0, stat.st_size - HASH_SAMPLE_BYTES)}):
+                    f.seek(offset)
+                    digest.update(f.read(HASH_SAMPLE_BYTES))
+            return digest.hexdigest()
+        except OSError:
+            return None
+
+    def _entry_path(self, key: str, part: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.{part}")
+
+    def load(self, key: str | None, part: str) -> tuple[dict, dict[str, Image.Image]] | None:
+        """(메타데이터, {이름: 이미지}) 를 반환합니다. 없거나 읽을 수 없으면 None"""
+        if key is None:
+            return None
+        path = self._entry_path(key, part)
+        try:
+            with open(path, 'rb') as f:
+                (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+                header = json.loads(f.read(header_length).decode('utf-8'))
+                images = {}
+                for name, mode, width, height in header['images']:
+                    images[name] = Image.frombytes(mode, (width, height), f.read(width * height * len(mode)))
+            os.utime(path) # 최근 사용 표시 (LRU)
+            return header['meta'], images
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    def store(self, key: str | None, part: str, meta: dict, images: dict[str, Image.Image]):
+        if key is None:
+            return
+        path = self._entry_path(key, part)
+        header = json.dumps({'meta': meta, 'images': [(name, image.mode, image.width, image.height)
+                                                      for name, image in images.items()]}).encode('utf-8')
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(_HEADER_LENGTH.pack(len(header)))
+                f.write(header)
+                for image in images.values():
+                    f.write(image.tobytes())
+                written = f.tell()
+            try: replaced = os.path.getsize(path)
+            except OSError: replaced = 0
+            os.replace(temp_path, path)
+        except OSError:
+            try: os.remove(temp_path)
+            except OSError: pass
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total() # 새 파일 포함
+            else:
+                self._total_bytes += written - replaced
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """(수정 시각, 크기, 경로) 목록. 작성 중인 임시 파일은 제외"""
+        entries = []
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _mtime, size, _path in self._scan())
+
+    def evict(self):
+        """전체 크기가 max_bytes * EVICT_TARGET_RATIO 이하가 될 때까지 가장 오래 사용하지 않은 항목부터 지우고, 누적 크기를 실제 값으로 맞춥니다."""
+        with self._lock:
+            entries = self._scan()
+            total = sum(size for _mtime, size, _path in entries)
+            for _mtime, size, path in sorted(entries):
+                if total <= self.max_bytes * EVICT_TARGET_RATIO:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._total_bytes = total
+
+    def clear(self):
+        with self._lock:
+            for root, _dirs, files in os.walk(self.directory):
+                for name in files:
+                    try: os.remove(os.path.join(root, name))
+                    except OSError: pass
+            self._total_bytes = 0
+
+
+derivative_cache = DerivativeCache()
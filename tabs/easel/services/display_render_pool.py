@@ -0,0 +1,75 @@
+import os
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from .frame_profiler import frame_profiler
+
+POLL_INTERVAL_MS = 15
+DISPLAY_RENDER_WORKERS = max(2, min(4, os.cpu_count() or 2))
+
+
+class DisplayRenderPool:
+    """
+    캔버스 표시용 비트맵을 작업 스레드 풀에서 렌더링합니다. (Pillow 리샘플링은 GIL 을 놓으므로 여러 코어 사용)
+    객체(key)마다 요청할 때마다 세대 번호가 올라가며, 결과가 도착했을 때 최신 세대가 아니면 버립니다.
+    render 는 메인 스레드에서 필요한 값을 모두 읽어 둔 뒤 만든 함수여야 하며 Tk 객체에 접근하면 안 됩니다.
+    on_ready(image) 는 widget.after 폴링을 통해 항상 Tk 메인 스레드에서 호출됩니다. (렌더링 실패 시 image=None)
+    """
+    def __init__(self, widget, max_workers: int = DISPLAY_RENDER_WORKERS):
+        self.widget = widget
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DisplayRender")
+        self._results = queue.Queue()
+        self._generations: dict = {} # key: 객체 경로 또는 (경로, 타일 열, 타일 행)
+        self._pending = 0
+        self._after_id = None
+
+    def submit(self, key, render, on_ready) -> int:
+        generation = self.invalidate(key)
+        self._pending += 1
+        self._executor.submit(self._run, key, generation, render, on_ready)
+        self._schedule_poll()
+        return generation
+
+    def invalidate(self, key) -> int:
+        """key 의 대기/진행 중인 결과를 버리도록 세대를 올립니다. (객체 제거, 동기 렌더링으로 대체된 경우)"""
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        return generation
+
+    def is_pending(self, key, generation: int) -> bool:
+        return self._generations.get(key) == generation
+
+    def _run(self, key, generation, render, on_ready):
+        image = None
+        # 이미 더 새 요청이 들어왔으면 렌더링하지 않음 (dict 조회는 원자적)
+        if self._generations.get(key) == generation:
+            try:
+                with frame_profiler.measure('render'):
+                    image = render()
+            except Exception:
+                traceback.print_exc()
+        self._results.put((key, generation, image, on_ready))
+
+    def _schedule_poll(self):
+        if self._after_id is None:
+            self._after_id = self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        try:
+            while True:
+                key, generation, image, on_ready = self._results.get_nowait()
+                self._pending -= 1
+                if self._generations.get(key) == generation:
+                    try:
+                        on_ready(image)
+                    except Exception:
+                        traceback.print_exc()
+        except queue.Empty:
+            pass
+        if self._pending > 0:
+            try:
+                self._schedule_poll()
+            except Exception: # 창이 닫힌 경우
+                pass
@@ -0,0 +1,127 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# 형식 이름 -> 확장자
+ENCODER_FORMATS = {
+    "PNG": ".png",
+    "PNG8": ".png",
+    "JPG": ".jpg",
+    "WEBP": ".webp",
+}
+# 용량 제한을 맞추기 위해 탐색하는 품질(JPG/WEBP) / 팔레트 색상 수(PNG8) 범위
+QUALITY_RANGE = (30, 95)
+PALETTE_COLORS_RANGE = (16, 256)
+DEFAULT_QUALITY = 95
+
+
+class EncoderService:
+    """
+    최종 비트맵을 파일 형식별 바이트로 인코딩합니다.
+    용량 제한(max_bytes)이 있으면 제한 안에 들어가는 가장 높은 품질을 이진 탐색으로 찾습니다.
+    Pillow 인코더는 인코딩 중 GIL 을 놓으므로 여러 형식을 스레드로 동시에 인코딩합니다.
+    """
+
+    @staticmethod
+    def get_extension(output_format: str) -> str:
+        return ENCODER_FORMATS.get(output_format, ".png")
+
+    @staticmethod
+    def parse_formats(primary: str, extra: str = "") -> list[str]:
+        """주 형식과 쉼표로 구분된 추가 형식 문자열을 중복 없는 형식 목록으로 만듭니다. (주 형식이 먼저)"""
+        names = [primary] + [f.strip().upper() for f in (extra or "").split(",")]
+        return [f for f in dict.fromkeys(names) if f in ENCODER_FORMATS]
+
+    @staticmethod
+    def encode(image: Image.Image, output_format: str, quality: int | None = None) -> bytes:
+        """
+        quality 는 JPG/WEBP 에서는 품질(1~95), PNG8 에서는 팔레트 색상 수로 사용되며 PNG 에서는 무시됩니다.
+        """
+        buffer = io.BytesIO()
+        if output_format == "JPG":
+            # progressive + optimize: 같은 품질에서 파일이 작아지고 웹에서 점진적으로 표시됨
+            image.convert("RGB").save(buffer, "JPEG", quality=quality or DEFAULT_QUALITY,
+                                      optimize=True, progressive=True)
+        elif output_format == "WEBP":
+            image.save(buffer, "WEBP", quality=quality or DEFAULT_QUALITY, method=4)
+        elif output_format == "PNG8":
+            colors = quality or PALETTE_COLORS_RANGE[1]
+            paletted = image.quantize(colors=colors, method=Image.Quantize.FASTOCTREE) if image.mode == "RGBA" \
+                else image.convert("RGB").quantize(colors=colors)
+            paletted.save(buffer, "PNG", optimize=True)
+        else:
+            image.save(buffer, "PNG", optimize=True)
+        return buffer.getvalue()
+
+    @staticmethod
+    def encode_to_budget(image: Image.Image, output_format: str, max_bytes: int | None = None) -> dict:
+        """
+        max_bytes 이하가 되는 가장 높은 품질로 인코딩합니다.
+        반환값: {'format', 'data', 'quality', 'fits'} (최저 품질로도 넘으면 fits=False 와 최저 품질 결과)
+        무손실 PNG 는 품질로 크기를 줄일 수 없으므로 한 번만 인코딩합니다.
+        """
+        if output_format == "PNG" or not max_bytes:
+            quality = None if output_format == "PNG" else \
+                (PALETTE_COLORS_RANGE[1] if output_format == "PNG8" else DEFAULT_QUALITY)
+            data = EncoderService.encode(image, output_format, quality)
+            return {'format': output_format, 'data': data, 'quality': quality,
+                    'fits': not max_bytes or len(data) <= max_bytes}
+
+        low, high = PALETTE_COLORS_RANGE if output_format == "PNG8" else QUALITY_RANGE
+        # 최고 품질이 이미 제한 안이면 탐색하지 않음
+        data = EncoderService.encode(image, output_format, high)
+        if len(data) <= max_bytes:
+            return {'format': output_format, 'data': data, 'quality': high, 'fits': True}
+
+        best = None
+        high -= 1
+        while low <= high:
+            mid = (low + high) // 2
+            candidate = EncoderService.encode(image, output_format, mid)
+            if len(candidate) <= max_bytes:
+                best = (mid, candidate)
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        if best:
+            return {'format': output_format, 'data': best[1], 'quality': best[0], 'fits': True}
+        # 마지막으로 시도한 값이 최저 품질 (모두 초과했으므로 탐색이 아래쪽 끝까지 내려감)
+        return {'format': output_format, 'data': candidate, 'quality': mid, 'fits': False}
+
+    @staticmethod
+    def encode_formats(image: Image.Image, formats: list[str], max_bytes: int | None = None) -> list[dict]:
+        """같은 비트맵을 여러 형식으로 동시에 인코딩하고 formats 순서대로 결과를 반환합니다."""
+        if len(formats) <= 1:
+            return [EncoderService.encode_to_budget(image, fmt, max_bytes) for fmt in formats]
+        image.load()
+        with ThreadPoolExecutor(max_workers=len(formats)) as pool:
+            return list(pool.map(lambda fmt: EncoderService.encode_to_budget(image, fmt, max_bytes), formats))
+
+    @staticmethod
+    def format_paths(save_path: str, formats: list[str]) -> list[str]:
+        """형식별 저장 경로. 같은 확장자(PNG/PNG8)가 겹치면 뒤 형식에 접미사를 붙입니다."""
+        stem = os.path.splitext(save_path)[0]
+        paths = []
+        for output_format in formats:
+            path = stem + EncoderService.get_extension(output_format)
+            if path in paths:
+                path = f"{stem}_{output_format.lower()}{EncoderService.get_extension(output_format)}"
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def write_formats(image: Image.Image, save_path: str, formats: list[str], max_bytes: int | None = None,
+                      paths: list[str] | None = None) -> list[dict]:
+        """
+        save_path 의 확장자를 형식별 확장자로 바꿔 기록합니다. (format_paths, paths 를 주면 그 경로에 기록)
+        각 결과 dict 는 'data' 대신 기록한 'path' 를 가집니다.
+        """
+        paths = paths or EncoderService.format_paths(save_path, formats)
+        results = EncoderService.encode_formats(image, formats, max_bytes)
+        for result, path in zip(results, paths):
+            with open(path, "wb") as f:
+                f.write(result.pop('data'))
+            result['path'] = path
+        return results
@@ -0,0 +1,133 @@
+import copy
+import queue
+import threading
+import time
+
+from ..models.layer import PlainVar
+from .image_service import ImageService
+from .level_cache import LevelCache
+from .render_cache import export_render_cache
+
+POLL_INTERVAL_MS = 50
+
+class ExportCancelled(Exception):
+    """사용자가 내보내기 작업을 취소했을 때 작업 스레드 안에서 사용되는 예외"""
+
+
+def snapshot_layers(layers) -> list:
+    """
+    Tk 변수 값을 읽어 스레드에서 안전하게 쓸 수 있는 레이어 사본을 만듭니다. (메인 스레드에서 호출)
+    픽셀 버퍼는 복사하지 않고 공유합니다. 원본 레이어는 속성을 교체할 뿐 이미지를 제자리 수정하지 않기 때문입니다.
+    """
+    snapshots = []
+    for layer in layers:
+        if not layer.is_visible.get():
+            continue
+        snap = copy.copy(layer)
+        snap.is_visible = PlainVar(True)
+        snap.scale_var = PlainVar(float(layer.scale_var.get()))
+        snap.widget_ref = None
+        snapshots.append(snap)
+    return snapshots
+
+def snapshot_canvas_objects(canvas_objects: dict) -> dict:
+    return {path: {'rel_x': info['rel_x'], 'rel_y': info['rel_y'], 'angle': info.get('angle', 0.0)}
+            for path, info in canvas_objects.items() if 'rel_x' in info and 'rel_y' in info}
+
+def snapshot_logo_info(logo_object: dict | None) -> dict | None:
+    if not logo_object:
+        return None
+    return {key: logo_object[key] for key in ('type', 'path', 'pil_img_original', 'rel_x', 'rel_y', 'angle') if key in logo_object}
+
+
+class ExportJob:
+    """
+    문서 상태 스냅샷을 받아 렌더링과 인코딩을 작업 스레드에서 수행합니다.
+    진행률/완료 콜백은 widget.after 폴링을 통해 항상 Tk 메인 스레드에서 호출됩니다.
+
+    targets: [(저장 경로, (가로, 세로)), ...]
+    on_progress(done, total, message), on_done(result)
+    """
+    def __init__(self, widget, settings: dict, layers: list, canvas_objects: dict, targets: list,
+                 on_progress=None, on_done=None):
+        self.widget = widget
+        self.settings = settings
+        self.layers = layers
+        self.canvas_objects = canvas_objects
+        self.targets = targets
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self._cancel_event = threading.Event()
+        self._messages = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ExportJob", daemon=True)
+        self._thread.start()
+        self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        started = time.perf_counter()
+        # 용량 제한은 작업이 실제로 사용한 스냅샷 값 (실행 중 설정이 바뀌어도 결과 안내가 어긋나지 않도록)
+        result = {'ok': False, 'cancelled': False, 'error': None, 'paths': [], 'oversize': [], 'seconds': 0.0,
+                  'max_file_kb': self.settings.get('max_file_kb')}
+        level_cache = LevelCache() if len(self.targets) > 1 else None
+        # 출력 크기에 따라 단계(레이어/띠) 수가 달라지므로 진행률은 픽셀 수 비중으로 환산한 백분율로 보고
+        total_pixels = sum(w * h for _path, (w, h) in self.targets) or 1
+        try:
+            # 큰 크기부터 렌더링해야 LevelCache 의 축소본이 작은 출력에 재사용됨
+            ordered = sorted(self.targets, key=lambda t: t[1][0] * t[1][1], reverse=True)
+            done_pixels = 0
+            for save_path, (w, h) in ordered:
+                size_settings = dict(self.settings, output_width=w, output_height=h)
+                label = f"{w}x{h} " + ("띠 렌더링" if ImageService.use_strip_export(size_settings) else "렌더링")
+
+                def progress(done, steps, base=done_pixels, share=w * h, label=label):
+                    self._check_cancel()
+                    percent = int(100 * (base + share * done / max(steps, 1)) / total_pixels)
+                    self._messages.put(('progress', percent, 100, label))
+
+                written = ImageService.write_canvas(size_settings, self.layers, self.canvas_objects, save_path,
+                                                    level_cache=level_cache, progress=progress,
+                                                    render_cache=export_render_cache)
+                done_pixels += w * h
+                result['paths'].extend(r['path'] for r in written)
+                result['oversize'].extend(r['path'] for r in written if not r['fits'])
+            result['ok'] = True
+        except ExportCancelled:
+            result['cancelled'] = True
+        except Exception as e:
+            result['error'] = e
+        finally:
+            if level_cache:
+                level_cache.clear()
+        result['seconds'] = time.perf_counter() - started
+        self._messages.put(('done', result))
+
+    def _check_cancel(self):
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+
+    def _poll(self):
+        try:
+            while True:
+                message = self._messages.get_nowait()
+                if message[0] == 'progress':
+                    if self.on_progress:
+                        self.on_progress(*message[1:])
+                elif message[0] == 'done':
+                    if self.on_done:
+                        self.on_done(message[1])
+                    return
+        except queue.Empty:
+            pass
+        try:
+            self.widget.after(POLL_INTERVAL_MS, self._poll)
+        except Exception: # 창이 닫힌 경우
+            pass
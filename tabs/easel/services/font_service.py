@@ -1,11 +1,44 @@
 import sys
 import os
+import threading
 from functools import lru_cache
+from PIL import ImageFont
+
+FONT_CACHE_SIZE = 64
+TEXT_BBOX_CACHE_SIZE = 1024
+FALLBACK_FONT = 'malgun.ttf'
 
 class FontService:
     """
     운영체제에 맞는 폰트 경로를 관리하고 제공하는 클래스
     """
+    # FreeType 글꼴 객체는 스레드 안전하지 않으므로, 캐시된 글꼴을 쓰는 측정/그리기는 이 잠금 안에서 수행
+    font_lock = threading.RLock()
+
+    @staticmethod
+    def get_font(font_family: str, size: int) -> ImageFont.FreeTypeFont:
+        """
+        (폰트 경로, 크기) 별로 캐시된 글꼴 객체를 반환합니다. 폰트 파일을 열 수 없으면 기본 폰트로 대체합니다.
+        반환된 글꼴을 직접 사용할 때는 font_lock 을 잡아야 합니다.
+        """
+        try:
+            return FontService._load_font(FontService.get_font_path(font_family), int(size))
+        except IOError:
+            print(f"Warning: Font '{font_family}' not found.")
+            return FontService._load_font(FontService.get_font_path(FALLBACK_FONT), int(size))
+
+    @staticmethod
+    @lru_cache(maxsize=FONT_CACHE_SIZE)
+    def _load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+        return ImageFont.truetype(font_path, size)
+
+    @staticmethod
+    @lru_cache(maxsize=TEXT_BBOX_CACHE_SIZE)
+    def get_text_bbox(text: str, font_family: str, size: int) -> tuple[int, int, int, int]:
+        """글꼴로 그렸을 때 텍스트의 경계 상자 (크기 계산용, 결과 캐시)"""
+        font = FontService.get_font(font_family, size)
+        with FontService.font_lock:
+            return font.getbbox(text)
     @staticmethod
     @lru_cache(maxsize=None)
     def get_font_path(font_name: str) -> str:
@@ -0,0 +1,109 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 백분위 계산에 쓰는 단계별 최근 샘플 수
+PROFILER_WINDOW = 240
+# JSON 으로 내보낼 수 있도록 보관하는 전체 샘플 수 상한
+PROFILER_MAX_SAMPLES = 20000
+FRAME_STAGE = 'frame'
+
+
+class FrameProfiler:
+    """
+    캔버스 다시 그리기의 단계별 소요 시간(ms)을 모읍니다. 꺼져 있으면 측정하지 않습니다.
+    한 프레임은 begin_frame ~ end_frame (RenderScheduler.flush 한 번) 이며, 프레임 전체 시간은 'frame' 단계로 기록됩니다.
+    작업 스레드의 렌더링 단계도 기록되므로 잠금을 사용합니다.
+    """
+    def __init__(self, window: int = PROFILER_WINDOW, max_samples: int = PROFILER_MAX_SAMPLES):
+        self.enabled = False
+        self.window = window
+        self._lock = threading.Lock()
+        self._recent: dict[str, deque] = {}
+        self._samples = deque(maxlen=max_samples)
+        self._frame_start = None
+        self._frame_index = 0
+
+    @contextmanager
+    def measure(self, stage: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000.0)
+
+    def record(self, stage: str, ms: float):
+        with self._lock:
+            recent = self._recent.get(stage)
+            if recent is None:
+                recent = self._recent[stage] = deque(maxlen=self.window)
+            recent.append(ms)
+            self._samples.append({'frame': self._frame_index, 'stage': stage, 'ms': round(ms, 3),
+                                  'thread': threading.current_thread().name})
+
+    def begin_frame(self):
+        if self.enabled and self._frame_start is None:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        self.record(FRAME_STAGE, (time.perf_counter() - self._frame_start) * 1000.0)
+        self._frame_start = None
+        self._frame_index += 1
+
+    def percentiles(self, stage: str, points=(50, 95, 99)) -> dict[int, float] | None:
+        with self._lock:
+            values = sorted(self._recent.get(stage, ()))
+        if not values:
+            return None
+        return {p: values[min(len(values) - 1, int(len(values) * p / 100))] for p in points}
+
+    def stages(self) -> list[str]:
+        with self._lock:
+            return list(self._recent)
+
+    def summary_text(self) -> str:
+        """상태 표시줄용 한 줄 요약: 프레임과 단계별 p50/p95 (ms)"""
+        parts = []
+        for stage in [FRAME_STAGE] + sorted(s for s in self.stages() if s != FRAME_STAGE):
+            result = self.percentiles(stage, (50, 95))
+            if result:
+                parts.append(f"{stage} {result[50]:.1f}/{result[95]:.1f}")
+        return "p50/p95 ms  " + " | ".join(parts) if parts else "측정 중..."
+
+    def export_json(self, path: str):
+        summary = {stage: self.percentiles(stage) for stage in self.stages()}
+        with self._lock:
+            samples = list(self._samples)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'window': self.window, 'percentiles': summary, 'samples': samples}, f, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._samples.clear()
+        self._frame_start = None
+        self._frame_index = 0
+
+
+frame_profiler = FrameProfiler()
+
+
+def profiled(stage: str):
+    """함수 실행 시간을 frame_profiler 의 stage 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not frame_profiler.enabled:
+                return func(*args, **kwargs)
+            with frame_profiler.measure(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
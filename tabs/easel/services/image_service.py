@@ -1,12 +1,19 @@
 # 파일 경로: tabs/easel/services/image_service.py (Debug Prints Added)
 
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import os
 import math
 import traceback # For detailed error printing
 # --- import 경로 수정 ---
 from ..models.layer import Layer, ImageLayer, TextLayer, ShapeLayer, SAVE_IMG_MAX_SIZE, DISPLAY_IMG_MAX_SIZE
 from .font_service import FontService
+from .level_cache import LevelCache
+from .render_cache import RenderCache, layer_fingerprint, text_bitmap_cache
+from .strip_export import STRIP_EXPORT_MIN_PIXELS, write_png_in_strips, render_in_strips
+from .encoder_service import EncoderService
+from .shape_rasterizer import ShapeRasterizer, EXPORT_SUPERSAMPLE
+from .frame_profiler import profiled
 # --- 수정 끝 ---
 
 try:
@@ -18,24 +25,138 @@ except ImportError:
     print("DEBUG: rembg library not found.") # Debug print
 
 
+# 마켓별 내보내기 프리셋: 이름 -> [(가로, 세로), ...]
+EXPORT_PRESETS = {
+    "마켓 기본 (1500/1000/800/600)": [(1500, 1500), (1000, 1000), (800, 800), (600, 600)],
+    "대형 (2000/1500/1000)": [(2000, 2000), (1500, 1500), (1000, 1000)],
+    "소형 (800/600/400)": [(800, 800), (600, 600), (400, 400)],
+}
+
 class ImageService:
     """최종 이미지 생성, 저장 및 배경 제거 등 이미지 관련 서비스를 제공"""
 
     @staticmethod
-    def save_canvas_as_image(settings, layers, canvas_objects):
+    def has_content(settings, layers) -> bool:
         # canvas_objects 에는 로고 정보가 없음, settings 에서 logo_info 확인
-        if not any(l.is_visible.get() for l in layers) and 'logo_info' not in settings:
+        return any(l.is_visible.get() for l in layers) or bool(settings.get('logo_info'))
+
+    @staticmethod
+    def ask_save_targets(settings, layers) -> list | None:
+        """
+        현재 해상도로 저장할 경로를 묻고 [(경로, (가로, 세로))] 를 반환합니다.
+        저장할 항목이 없거나 사용자가 취소하면 None 을 반환합니다.
+        """
+        if not ImageService.has_content(settings, layers):
             messagebox.showwarning("알림", "캔버스에 저장할 항목이 없습니다.")
-            return "저장할 항목 없음."
+            return None
+
+        output_format = settings['output_format']
+        fname = (settings['style_code'] or "thumbnail") + ImageService.get_extension(output_format)
+        save_path = filedialog.asksaveasfilename(
+            initialdir=settings['save_directory'],
+            initialfile=fname,
+            defaultextension=fname.split('.')[-1]
+        )
+        if not save_path:
+            return None
+        return [(save_path, (settings['output_width'], settings['output_height']))]
 
+    @staticmethod
+    def ask_preset_targets(settings, layers, preset_name: str) -> list | None:
+        """프리셋에 정의된 모든 크기에 대해 저장 폴더를 묻고 [(경로, (가로, 세로)), ...] 를 반환합니다."""
+        sizes = EXPORT_PRESETS.get(preset_name)
+        if not sizes:
+            messagebox.showwarning("알림", f"알 수 없는 프리셋입니다: {preset_name}")
+            return None
+        if not ImageService.has_content(settings, layers):
+            messagebox.showwarning("알림", "캔버스에 저장할 항목이 없습니다.")
+            return None
+
+        save_dir = filedialog.askdirectory(initialdir=settings['save_directory'], title="프리셋 저장 폴더 선택")
+        if not save_dir:
+            return None
+
+        extension = ImageService.get_extension(settings['output_format'])
+        base_name = settings['style_code'] or "thumbnail"
+        return [(os.path.join(save_dir, f"{base_name}_{w}x{h}{extension}"), (w, h)) for w, h in dict.fromkeys(sizes)]
+
+    @staticmethod
+    def _resize(image: Image.Image, size: tuple[int, int], level_cache: LevelCache | None = None, box=None) -> Image.Image:
+        if level_cache is not None:
+            return level_cache.resize(image, size, box=box)
+        return image.resize(size, Image.Resampling.LANCZOS, box=box)
+
+    @staticmethod
+    def get_extension(output_format: str) -> str:
+        return EncoderService.get_extension(output_format)
+
+    @staticmethod
+    def get_encode_options(settings, output_format: str | None = None) -> tuple[list[str], int | None]:
+        """설정에서 (저장할 형식 목록, 최대 파일 크기(바이트) 또는 None) 을 읽습니다."""
+        formats = EncoderService.parse_formats(output_format or settings['output_format'], settings.get('extra_formats', ""))
+        max_kb = settings.get('max_file_kb') or 0
+        return formats, (int(max_kb) * 1024 if max_kb > 0 else None)
+
+    @staticmethod
+    def write_image(final_image: Image.Image, save_path: str, output_format: str, extra_formats: str = "",
+                    max_bytes: int | None = None) -> list[dict]:
+        """
+        렌더링된 최종 이미지를 지정한 형식(+추가 형식)으로 파일에 기록합니다. (대화상자 없음)
+        형식별 {'format', 'path', 'quality', 'fits'} 목록을 반환합니다.
+        """
+        formats = EncoderService.parse_formats(output_format, extra_formats)
+        return EncoderService.write_formats(final_image, save_path, formats, max_bytes)
+
+    @staticmethod
+    def use_strip_export(settings) -> bool:
+        return settings['output_width'] * settings['output_height'] >= STRIP_EXPORT_MIN_PIXELS
+
+    @staticmethod
+    def write_canvas(settings, layers, canvas_objects, save_path: str, output_format: str | None = None,
+                     level_cache: LevelCache | None = None, progress=None, render_cache: RenderCache | None = None) -> list[dict]:
+        """
+        렌더링과 파일 기록을 한 번에 수행하고 형식별 결과 목록(write_image 와 같음)을 반환합니다.
+        출력이 STRIP_EXPORT_MIN_PIXELS 이상이면 띠 단위로 렌더링하며(level_cache/render_cache 미사용),
+        PNG 는 용량 제한과 무관하게 전체 이미지 없이 띠마다 바로 인코딩합니다. (무손실이라 품질로 크기를 줄일 수 없음)
+        전체 이미지가 필요한 형식(JPG/WEBP/PNG8)만 한 장에 모아 인코딩합니다.
+        progress(완료 단계, 전체 단계) 의 단계는 일반 모드에서는 레이어, 띠 모드에서는 띠입니다.
+        """
+        formats, max_bytes = ImageService.get_encode_options(settings, output_format)
+        if ImageService.use_strip_export(settings):
+            paths = EncoderService.format_paths(save_path, formats)
+            results = [None] * len(formats)
+            for index, output_format in enumerate(formats):
+                if output_format == "PNG":
+                    write_png_in_strips(settings, layers, canvas_objects, paths[index], progress=progress)
+                    fits = not max_bytes or os.path.getsize(paths[index]) <= max_bytes
+                    results[index] = {'format': "PNG", 'path': paths[index], 'quality': None, 'fits': fits}
+            rest = [index for index, result in enumerate(results) if result is None]
+            if rest:
+                mode = "RGB" if all(formats[index] == "JPG" for index in rest) else "RGBA"
+                final_image = render_in_strips(settings, layers, canvas_objects, mode, progress=progress)
+                written = EncoderService.write_formats(final_image, save_path, [formats[index] for index in rest], max_bytes,
+                                                       paths=[paths[index] for index in rest])
+                for index, result in zip(rest, written):
+                    results[index] = result
+            return results
+        else:
+            final_image = ImageService.render_canvas(settings, layers, canvas_objects, level_cache,
+                                                     progress=progress, render_cache=render_cache)
+        return EncoderService.write_formats(final_image, save_path, formats, max_bytes)
+
+    @staticmethod
+    def render_canvas(settings, layers, canvas_objects, level_cache: LevelCache | None = None, progress=None,
+                      render_cache: RenderCache | None = None) -> Image.Image:
+        """
+        설정/레이어/캔버스 위치 정보로 최종 RGBA 이미지를 만듭니다.
+        Tk 위젯이나 대화상자를 사용하지 않으므로 헤드리스 환경(작업 스레드, 일괄 렌더링)에서도 호출할 수 있습니다.
+        level_cache 를 넘기면 여러 번의 렌더링이 원본 축소본을 공유합니다.
+        progress(완료 레이어 수, 전체 레이어 수) 는 레이어마다 호출되며, 예외를 던져 렌더링을 중단시킬 수 있습니다.
+        render_cache 를 넘기면 입력이 바뀌지 않은 레이어는 이전에 렌더링한 비트맵을 재사용합니다.
+        """
         save_w = settings['output_width']
         save_h = settings['output_height']
-        bg_color_hex = settings['background_color']
-
-        try:
-            bg_color = tuple(int(bg_color_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4)) + (255,)
-        except:
-            bg_color = (255, 255, 255, 255)
+        bg_color = ImageService.parse_background_color(settings['background_color'])
 
         final_image = Image.new("RGBA", (save_w, save_h), bg_color)
 
@@ -43,69 +164,112 @@ class ImageService:
         visible_layers = [l for l in layers if l.is_visible.get()] # is_visible 체크 유지
 
         # 1. 레이어 렌더링
-        for layer in visible_layers: # 리스트 순서대로 (아래부터)
+        for index, layer in enumerate(visible_layers): # 리스트 순서대로 (아래부터)
+            if progress:
+                progress(index, len(visible_layers))
             obj_info = canvas_objects.get(layer.path)
             if not obj_info: continue
 
             center_x, center_y = obj_info['rel_x'] * save_w, obj_info['rel_y'] * save_h
-            layer_img = ImageService._render_layer_to_pil(layer, save_w, save_h, settings)
+            layer_img = ImageService._render_layer_cached(layer, save_w, save_h, settings, level_cache, render_cache)
 
             if layer_img:
                 w, h = layer_img.size
                 paste_pos = (int(center_x - w / 2), int(center_y - h / 2))
-                # Paste 대신 alpha_composite 사용 (투명도 처리 개선)
-                temp_layer_image = Image.new("RGBA", final_image.size, (0, 0, 0, 0))
-                temp_layer_image.paste(layer_img, paste_pos, layer_img) # 마스크로 layer_img 사용
-                final_image = Image.alpha_composite(final_image, temp_layer_image)
-
-        # 2. 로고 렌더링 (레이어 위에)
-        logo_info = settings.get('logo_info')
-        if logo_info and 'pil_img_original' in logo_info:
-            try:
-                logo_pil_original = logo_info['pil_img_original']
-                logo_scale = settings['logo_size']
+                # 레이어가 차지하는 영역에만 알파 합성 (전체 크기 임시 이미지 생성 안 함)
+                ImageService._composite_clipped(final_image, layer_img, paste_pos)
 
-                logo_target_h = save_h * (settings['logo_zone_height'] / 1500.0) * (logo_scale / 100.0)
-                if logo_pil_original.height > 0:
-                    logo_ratio = logo_target_h / logo_pil_original.height
-                    logo_final_w, logo_final_h = int(logo_pil_original.width * logo_ratio), int(logo_target_h)
+        if progress:
+            progress(len(visible_layers), len(visible_layers))
 
-                    if logo_final_w > 0 and logo_final_h > 0:
-                        logo_to_paste = logo_pil_original.resize((logo_final_w, logo_final_h), Image.Resampling.LANCZOS)
-                        logo_center_x, logo_center_y = logo_info['rel_x'] * save_w, logo_info['rel_y'] * save_h
-                        logo_paste_pos = (int(logo_center_x - logo_final_w / 2), int(logo_center_y - logo_final_h / 2))
+        # 2. 로고 렌더링 (레이어 위에)
+        logo = ImageService._render_logo_to_pil(settings, save_w, save_h, level_cache)
+        if logo:
+            ImageService._composite_clipped(final_image, *logo)
 
-                        temp_logo_image = Image.new("RGBA", final_image.size, (0, 0, 0, 0))
-                        temp_logo_image.paste(logo_to_paste, logo_paste_pos, logo_to_paste) # 마스크로 logo_to_paste 사용
-                        final_image = Image.alpha_composite(final_image, temp_logo_image)
+        return final_image
 
-            except Exception as e:
-                print(f"로고 렌더링 중 오류 발생: {e}")
+    @staticmethod
+    def parse_background_color(bg_color_hex: str) -> tuple:
+        try:
+            return tuple(int(bg_color_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4)) + (255,)
+        except:
+            return (255, 255, 255, 255)
 
-        # 파일 저장
-        output_format = settings['output_format']
-        fname = (settings['style_code'] or "thumbnail") + ('.png' if output_format == "PNG" else ".jpg")
-        save_path = filedialog.asksaveasfilename(
-            initialdir=settings['save_directory'],
-            initialfile=fname,
-            defaultextension=fname.split('.')[-1]
-        )
-        if not save_path:
-            return "저장 취소."
+    @staticmethod
+    def _render_logo_to_pil(settings, canvas_w, canvas_h, level_cache: LevelCache | None = None) -> tuple | None:
+        """로고 비트맵과 붙일 위치 (이미지, (x, y)) 를 반환합니다. 로고가 없으면 None."""
+        logo_info = settings.get('logo_info')
+        if not logo_info or 'pil_img_original' not in logo_info:
+            return None
         try:
-            if output_format == "JPG":
-                final_image.convert("RGB").save(save_path, "JPEG", quality=95)
-            else:
-                final_image.save(save_path, "PNG")
-            messagebox.showinfo("성공", f"이미지를 저장했습니다.\n{save_path}")
-            return "저장 완료!"
+            final_size = ImageService._get_logo_size(settings, canvas_h)
+            if final_size is None:
+                return None
+            logo_to_paste = ImageService.scale_rotate(logo_info['pil_img_original'], final_size,
+                                                      logo_info.get('angle', 0.0), level_cache=level_cache)
+            logo_center_x, logo_center_y = logo_info['rel_x'] * canvas_w, logo_info['rel_y'] * canvas_h
+            return logo_to_paste, (int(logo_center_x - logo_to_paste.width / 2), int(logo_center_y - logo_to_paste.height / 2))
         except Exception as e:
-            messagebox.showerror("저장 오류", f"파일 저장 중 오류 발생:\n{e}")
-            return "저장 실패."
+            print(f"로고 렌더링 중 오류 발생: {e}")
+            return None
+
+    @staticmethod
+    def _get_logo_size(settings, canvas_h) -> tuple[int, int] | None:
+        """회전 전 로고 크기. 로고가 없거나 크기가 0 이면 None"""
+        logo_info = settings.get('logo_info')
+        if not logo_info or 'pil_img_original' not in logo_info:
+            return None
+        logo_pil_original = logo_info['pil_img_original']
+        logo_target_h = canvas_h * (settings['logo_zone_height'] / 1500.0) * (settings['logo_size'] / 100.0)
+        if logo_pil_original.height <= 0:
+            return None
+        logo_ratio = logo_target_h / logo_pil_original.height
+        logo_final_w, logo_final_h = int(logo_pil_original.width * logo_ratio), int(logo_target_h)
+        if logo_final_w <= 0 or logo_final_h <= 0:
+            return None
+        return logo_final_w, logo_final_h
+
+    @staticmethod
+    def _render_layer_cached(layer: Layer, canvas_w, canvas_h, settings, level_cache=None, render_cache=None) -> Image.Image | None:
+        if render_cache is None:
+            return ImageService._render_layer_to_pil(layer, canvas_w, canvas_h, settings, level_cache)
+
+        key = layer_fingerprint(layer, canvas_w, canvas_h, settings)
+        layer_img = render_cache.get(key) if key else None
+        if layer_img is None:
+            layer_img = ImageService._render_layer_to_pil(layer, canvas_w, canvas_h, settings, level_cache)
+            if key:
+                render_cache.put(key, layer_img)
+        return layer_img
 
     # [ ★★★★★ 여기가 수정된 함수입니다 ★★★★★ ]
     @staticmethod
-    def _render_layer_to_pil(layer: Layer, canvas_w, canvas_h, settings) -> Image.Image | None:
+    @profiled('text_raster')
+    def render_text(text: str, font_family: str, font_size: int, color: str) -> Image.Image | None:
+        """
+        회전 전 텍스트 비트맵을 (텍스트, 폰트, 크기, 색상) 별로 캐시해 반환합니다.
+        반환된 이미지는 공유되므로 수정하지 말고, 변형이 필요하면 새 이미지를 만들어 사용합니다.
+        """
+        key = ('text', text, font_family, int(font_size), color)
+        cached = text_bitmap_cache.get(key)
+        if cached is not None:
+            return cached
+
+        bbox = FontService.get_text_bbox(text, font_family, int(font_size))
+        text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        if text_w <= 0 or text_h <= 0:
+            return None
+
+        font = FontService.get_font(font_family, int(font_size))
+        txt_img = Image.new('RGBA', (text_w, text_h), (0, 0, 0, 0))
+        with FontService.font_lock:
+            ImageDraw.Draw(txt_img).text((-bbox[0], -bbox[1]), text, font=font, fill=color)
+        text_bitmap_cache.put(key, txt_img)
+        return txt_img
+
+    @staticmethod
+    def _render_layer_to_pil(layer: Layer, canvas_w, canvas_h, settings, level_cache: LevelCache | None = None) -> Image.Image | None:
         scale = layer.scale_var.get()
 
         if isinstance(layer, TextLayer):
@@ -114,21 +278,10 @@ class ImageService:
             if font_size < 1: 
                 return None
                 
-            try: 
-                font = ImageFont.truetype(FontService.get_font_path(layer.font_family), font_size)
-            except IOError: 
-                print(f"Warning: Font '{layer.font_family}' not found.")
-                font = ImageFont.truetype(FontService.get_font_path('malgun.ttf'), font_size)
-                
-            bbox = font.getbbox(layer.text)
-            text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-            if text_w <= 0 or text_h <= 0: 
+            txt_img = ImageService.render_text(layer.text, layer.font_family, font_size, layer.color)
+            if txt_img is None: 
                 return None
                 
-            txt_img = Image.new('RGBA', (text_w, text_h), (0, 0, 0, 0))
-            d = ImageDraw.Draw(txt_img)
-            d.text((-bbox[0], -bbox[1]), layer.text, font=font, fill=layer.color)
-            
             return txt_img.rotate(layer.angle, expand=True, resample=Image.Resampling.BICUBIC) if layer.angle != 0 else txt_img
 
         elif isinstance(layer, ShapeLayer):
@@ -138,75 +291,76 @@ class ImageService:
                 return None
                 
             if layer.shape_type != '자유곡선':
-                points = layer._get_shape_points((0, 0), shape_size)
-                if not points: 
-                    return None
-                if layer.angle != 0: 
-                    points = ImageService._rotate_points(points, (0, 0), -layer.angle)
-                    
-                xs, ys = zip(*[(points[i], points[i+1]) for i in range(0, len(points), 2)]) # 수정: zip 사용
-                min_x, max_x = min(xs), max(xs)
-                min_y, max_y = min(ys), max(ys)
-                width, height = int(max_x - min_x) + 1, int(max_y - min_y) + 1
-                if width <=0 or height <=0: 
-                    return None
-                    
-                shape_img = Image.new('RGBA', (width, height), (0,0,0,0))
-                shape_draw = ImageDraw.Draw(shape_img)
-                shifted_points = [(x - min_x, y - min_y) for x, y in zip(xs, ys)]
-                shape_draw.polygon(shifted_points, fill=layer.color)
-                return shape_img
+                return ShapeRasterizer.rasterize(layer.shape_type, shape_size, layer.angle, layer.color, EXPORT_SUPERSAMPLE)
             else: # 자유곡선
-                if not layer.pil_image: 
-                    return None
-                img = layer.pil_image
-                scale_factor = scale / 100.0
-                final_w, final_h = int(img.width * scale_factor), int(img.height * scale_factor)
-                if final_w < 1 or final_h < 1: 
+                plan = ImageService._get_resample_plan(layer, canvas_w, canvas_h, settings)
+                if not plan:
                     return None
-                    
-                img_to_paste = img.resize((final_w, final_h), Image.Resampling.LANCZOS)
-                return img_to_paste.rotate(layer.angle, expand=True, resample=Image.Resampling.BICUBIC) if layer.angle != 0 else img_to_paste
+                img, _box, final_size = plan
+                return ImageService.scale_rotate(img, final_size, layer.angle, level_cache=level_cache)
 
         elif isinstance(layer, ImageLayer):
+            plan = ImageService._get_resample_plan(layer, canvas_w, canvas_h, settings)
+            if not plan:
+                return None
+            source, source_box, final_size = plan
             try:
-                if not hasattr(layer, 'pil_img_save') or layer.pil_img_save is None:
-                    layer.pil_img_save = layer.pil_img_original.copy(); layer.pil_img_save.thumbnail(SAVE_IMG_MAX_SIZE, Image.Resampling.LANCZOS)
-                    print(f"Warning: Regenerated pil_img_save for {layer.path}")
-                pil_to_process = layer.pil_img_save.crop(layer.crop_box) if layer.crop_box else layer.pil_img_save
+                return ImageService.scale_rotate(source, final_size, layer.angle, box=source_box, level_cache=level_cache)
             except Exception as e: 
-                print(f"Error accessing/cropping pil_img_save for {layer.path}: {e}")
+                print(f"Error resizing/rotating image {layer.path}: {e}")
                 return None
-                
+        return None
+
+    @staticmethod
+    def _get_resample_plan(layer: Layer, canvas_w, canvas_h, settings) -> tuple | None:
+        """
+        이미지 레이어/자유곡선을 회전 전에 어떤 원본의 어느 영역(box)에서 몇 픽셀 크기로 리샘플링할지 계산합니다.
+        (원본 이미지, 원본 영역 또는 None, (최종 가로, 최종 세로)) 를 반환하며, 렌더링할 수 없으면 None.
+        """
+        final_size = ImageService._get_resample_size(layer, canvas_w, canvas_h, settings)
+        if final_size is None:
+            return None
+        if isinstance(layer, ShapeLayer):
+            return layer.pil_image, None, final_size
+        # 최종 크기 이상인 가장 작은 레벨(표시용/저장용/원본)에서 리샘플링
+        source, source_box = layer.select_source(*final_size)
+        return source, source_box, final_size
+
+    @staticmethod
+    def _get_resample_size(layer: Layer, canvas_w, canvas_h, settings) -> tuple[int, int] | None:
+        """_get_resample_plan 의 회전 전 최종 크기만 계산합니다. 저장용/원본 레벨은 읽지 않습니다."""
+        scale = layer.scale_var.get()
+
+        if isinstance(layer, ShapeLayer):
+            if layer.shape_type != '자유곡선' or not layer.pil_image:
+                return None
+            img = layer.pil_image
             scale_factor = scale / 100.0
-            logo_zone_h = canvas_h * (settings['logo_zone_height'] / 1500.0)
-            target_h = (canvas_h - logo_zone_h) * scale_factor
-            
-            # [ ★★★★★ MODIFIED: 내용물 크기 기준으로 비율 계산 ★★★★★ ]
-            content_w, content_h = layer.get_content_dimensions()
-            if content_h > 0:
-                # content_h 기준으로 target_h 비율(ratio) 계산
-                ratio = target_h / content_h
-                # pil_to_process(전체 이미지)의 너비/높이에 ratio 적용하여 최종 크기 계산
-                # (주의: content_w가 아닌 pil_to_process.width 사용)
-                final_w, final_h = int(pil_to_process.width * ratio), int(pil_to_process.height * ratio)
-                
-                if final_w > 0 and final_h > 0:
-                    try:
-                        img_to_paste = pil_to_process.resize((final_w, final_h), Image.Resampling.LANCZOS)
-                        if layer.angle != 0: 
-                            img_to_paste = img_to_paste.rotate(layer.angle, expand=True, resample=Image.Resampling.BICUBIC)
-                        return img_to_paste
-                    except Exception as e: 
-                        print(f"Error resizing/rotating image {layer.path}: {e}")
-                        return None
-                else: 
-                    print(f"Warning: Calculated final size is invalid for {layer.path}: {final_w}x{final_h}")
-                    return None
-            else: 
-                print(f"Warning: Image content height is zero for {layer.path}.")
+            final_w, final_h = int(img.width * scale_factor), int(img.height * scale_factor)
+            if final_w < 1 or final_h < 1:
                 return None
-        return None
+            return final_w, final_h
+
+        if not isinstance(layer, ImageLayer):
+            return None
+
+        scale_factor = scale / 100.0
+        logo_zone_h = canvas_h * (settings['logo_zone_height'] / 1500.0)
+        target_h = (canvas_h - logo_zone_h) * scale_factor
+
+        # 크기 기준은 화면 표시와 같은 pil_img_display 좌표 (내용물 높이 -> target_h)
+        content_w, content_h = layer.get_content_dimensions()
+        if content_h <= 0:
+            print(f"Warning: Image content height is zero for {layer.path}.")
+            return None
+
+        ratio = target_h / content_h
+        region_w, region_h = layer.get_region_dimensions()
+        final_w, final_h = int(region_w * ratio), int(region_h * ratio)
+        if final_w <= 0 or final_h <= 0:
+            print(f"Warning: Calculated final size is invalid for {layer.path}: {final_w}x{final_h}")
+            return None
+        return final_w, final_h
 
     # [ ★★★★★ 여기가 수정된 함수입니다 (Debug Prints Added) ★★★★★ ]
     @staticmethod
@@ -260,8 +414,12 @@ class ImageService:
             layer.pil_img_display.thumbnail(DISPLAY_IMG_MAX_SIZE, Image.Resampling.LANCZOS)
             print(f"DEBUG: Updated pil_img_display size: {layer.pil_img_display.size}") # Debug print
 
+            # 배경 제거 결과가 새 원본: 이후 레벨 선택이 제거 전 원본을 고르지 않도록 교체
+            layer.pil_img_original = final_pil
+            layer.source_bbox = None
             layer.crop_box = None
             layer.angle = 0.0
+            layer.mark_source_changed()
             
             # [ ★★★★★ NEW: 배경 제거 후 content_bbox 업데이트 호출 ★★★★★ ]
             layer._update_content_bbox() 
@@ -283,9 +441,110 @@ class ImageService:
     # [ ★★★★★ 수정된 함수 끝 ★★★★★ ]
 
     @staticmethod
-    def _rotate_points(points, center, angle_degrees):
-        angle_rad = math.radians(angle_degrees); cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad); cx, cy = center; new_points = []
-        for i in range(0, len(points), 2):
-            px, py = points[i], points[i+1]; px_rel, py_rel = px - cx, py - cy
-            new_px = px_rel * cos_a - py_rel * sin_a + cx; new_py = px_rel * sin_a + py_rel * cos_a + cy; new_points.extend([new_px, new_py])
-        return new_points
\ No newline at end of file
+    def _composite_clipped(dest: Image.Image, src: Image.Image, pos: tuple[int, int]) -> bool:
+        """
+        src 를 dest 의 pos 위치에 제자리(in-place) 알파 합성합니다.
+        dest 범위를 벗어나는 부분은 잘라내고, 겹치는 영역만 블렌딩합니다.
+        """
+        if src.mode != "RGBA":
+            src = src.convert("RGBA")
+
+        x, y = pos
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(dest.width, x + src.width), min(dest.height, y + src.height)
+        if right <= left or bottom <= top:
+            return False # 캔버스 밖에 완전히 벗어난 레이어
+
+        src_box = (left - x, top - y, right - x, bottom - y)
+        dest.alpha_composite(src, dest=(left, top), source=src_box)
+        return True
+
+    @staticmethod
+    def get_rotated_size(size: tuple[int, int], angle: float) -> tuple[int, int]:
+        """Image.rotate(angle, expand=True) 와 같은 규칙으로 회전 후 경계 크기를 계산합니다."""
+        return ImageService._rotation_matrix(size, angle)[1]
+
+    @staticmethod
+    def _rotation_matrix(size: tuple[int, int], angle: float) -> tuple[list[float], tuple[int, int]]:
+        """
+        expand=True 회전에서 출력 좌표 -> 입력(회전 전) 좌표로 가는 아핀 행렬과 출력 크기.
+        Pillow 의 Image.rotate 와 같은 계산이므로 결과 크기/위치가 기존 rotate 와 일치합니다.
+        """
+        w, h = size
+        rad = -math.radians(angle % 360.0)
+        a, b = round(math.cos(rad), 15), round(math.sin(rad), 15)
+        d, e = round(-math.sin(rad), 15), round(math.cos(rad), 15)
+        cx, cy = w / 2.0, h / 2.0
+        c, f = a * -cx + b * -cy + cx, d * -cx + e * -cy + cy
+
+        xs, ys = [], []
+        for x, y in ((0, 0), (w, 0), (w, h), (0, h)):
+            xs.append(a * x + b * y + c); ys.append(d * x + e * y + f)
+        nw = math.ceil(max(xs)) - math.floor(min(xs))
+        nh = math.ceil(max(ys)) - math.floor(min(ys))
+        ox, oy = -(nw - w) / 2.0, -(nh - h) / 2.0
+        return [a, b, a * ox + b * oy + c, d, e, d * ox + e * oy + f], (nw, nh)
+
+    @staticmethod
+    def get_affine_plan(source: Image.Image, final_size: tuple[int, int], angle: float, box=None) -> tuple:
+        """
+        source(의 box 영역)을 final_size 로 확대/축소한 뒤 angle 만큼 회전(expand)하는 변환을
+        하나의 아핀 행렬로 합칩니다. (변환에 쓸 이미지, 출력 -> 입력 행렬, 출력 크기) 를 반환합니다.
+        배율이 1/2 미만이면 먼저 reduce() 로 정수배 축소해 BICUBIC 샘플링의 앨리어싱을 막습니다.
+        """
+        bx0, by0, bx1, by1 = box or (0, 0, source.width, source.height)
+        final_w, final_h = final_size
+        sx, sy = (bx1 - bx0) / final_w, (by1 - by0) / final_h
+
+        factor = int(min(sx, sy))
+        if factor >= 2:
+            int_box = (int(bx0), int(by0), min(source.width, math.ceil(bx1)), min(source.height, math.ceil(by1)))
+            source = source.reduce(factor, box=int_box)
+            bx0, by0 = (bx0 - int_box[0]) / factor, (by0 - int_box[1]) / factor
+            sx, sy = sx / factor, sy / factor
+
+        (a, b, c, d, e, f), out_size = ImageService._rotation_matrix(final_size, angle)
+        # 회전 행렬이 주는 final_size 좌표를 원본 좌표로 (x * sx + bx0)
+        return source, [a * sx, b * sx, c * sx + bx0, d * sy, e * sy, f * sy + by0], out_size
+
+    @staticmethod
+    def resample_region(source: Image.Image, size: tuple[int, int], region: tuple[int, int, int, int],
+                        box=None, matrix=None) -> Image.Image:
+        """
+        source(의 box 영역)를 size 로 확대/축소한 결과 중 region (x0, y0, x1, y1) 부분만 계산합니다.
+        matrix 가 있으면 get_affine_plan 의 출력 -> 입력 행렬로 변환합니다. (회전, 이때 source 는 plan 의 이미지)
+        띠/타일 렌더링에서 레이어 전체 크기 비트맵을 만들지 않기 위해 사용합니다.
+        """
+        col0, row0, col1, row1 = region
+        if matrix:
+            a, b, c, d, e, f = matrix
+            part_matrix = (a, b, a * col0 + b * row0 + c, d, e, d * col0 + e * row0 + f)
+            return source.transform((col1 - col0, row1 - row0), Image.Transform.AFFINE, part_matrix,
+                                    resample=Image.Resampling.BICUBIC)
+        bx0, by0, bx1, by1 = box or (0, 0, source.width, source.height)
+        sx, sy = (bx1 - bx0) / size[0], (by1 - by0) / size[1]
+        part_box = (bx0 + col0 * sx, by0 + row0 * sy, bx0 + col1 * sx, by0 + row1 * sy)
+        return source.resize((col1 - col0, row1 - row0), Image.Resampling.LANCZOS, box=part_box)
+
+    @staticmethod
+    @profiled('scale_rotate')
+    def scale_rotate(source: Image.Image, final_size: tuple[int, int], angle: float, box=None,
+                     level_cache: LevelCache | None = None, resample: Image.Resampling | None = None) -> Image.Image:
+        """
+        확대/축소 + 회전을 한 번의 리샘플링으로 수행합니다. 회전이 없으면 LANCZOS resize 와 같습니다.
+        (기존 resize 후 rotate 의 두 번 리샘플링과 중간 이미지를 없앰)
+        resample 을 지정하면(드래그 중 미리보기 등) 확대/축소와 회전 모두 그 필터를 사용합니다.
+        """
+        angle = angle % 360.0
+        if angle == 0 or angle % 90.0 == 0:
+            if resample is not None:
+                resized = source.resize(final_size, resample, box=box)
+            else:
+                resized = ImageService._resize(source, final_size, level_cache, box=box)
+            if angle == 0:
+                return resized
+            # 90도 단위 회전은 무손실 transpose 가 더 빠름 (Image.rotate 와 같은 처리)
+            transpose = {90.0: Image.Transpose.ROTATE_90, 180.0: Image.Transpose.ROTATE_180, 270.0: Image.Transpose.ROTATE_270}[angle]
+            return resized.transpose(transpose)
+        image, matrix, out_size = ImageService.get_affine_plan(source, final_size, angle, box)
+        return image.transform(out_size, Image.Transform.AFFINE, matrix, resample=resample or Image.Resampling.BICUBIC)
@@ -0,0 +1,95 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..models.layer import ImageLayer
+
+POLL_INTERVAL_MS = 50
+IMPORT_WORKERS = max(2, min(4, os.cpu_count() or 2))
+# 한 번의 폴링에서 목록에 추가하는 레이어 수 상한 (많은 파일이 한꺼번에 끝나도 UI 가 멈추지 않도록)
+LAYERS_PER_POLL = 8
+
+
+class ImportJob:
+    """
+    이미지 파일들을 작업 스레드 풀에서 ImageLayer.prepare 로 미리 디코딩합니다. (Pillow 디코딩/리샘플링은 GIL 을 놓음)
+    준비가 끝난 순서대로 on_layer(layer) 가 호출되어 목록에 바로 추가될 수 있고, 실패한 파일은 결과의 errors 에 모입니다.
+    모든 콜백은 widget.after 폴링을 통해 Tk 메인 스레드에서 호출됩니다.
+
+    on_layer(layer), on_progress(done, total), on_done(result)
+    """
+    def __init__(self, widget, paths: list[str], on_layer, on_progress=None, on_done=None,
+                 max_workers: int = IMPORT_WORKERS):
+        self.widget = widget
+        self.on_layer = on_layer
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.paths: list[str] = []
+        self._cancel_event = threading.Event()
+        self._messages = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ImageImport")
+        self._done = 0
+        self._running = False
+        self._result = {'added': 0, 'cancelled': False, 'errors': []}
+        self.add(paths)
+
+    def start(self):
+        self._running = True
+        self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+    def add(self, paths: list[str]):
+        """실행 중인 작업에 파일을 더 추가합니다. (메인 스레드에서 호출)"""
+        for path in paths:
+            self.paths.append(path)
+            self._executor.submit(self._run, path)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def _run(self, path: str):
+        if self._cancel_event.is_set():
+            self._messages.put(('skipped', path, None))
+            return
+        try:
+            self._messages.put(('layer', path, ImageLayer.prepare(path)))
+        except Exception as e:
+            self._messages.put(('error', path, e))
+
+    def _poll(self):
+        handled = 0
+        try:
+            while handled < LAYERS_PER_POLL:
+                kind, path, payload = self._messages.get_nowait()
+                self._done += 1
+                if kind == 'layer' and not self._cancel_event.is_set():
+                    handled += 1
+                    try:
+                        self.on_layer(payload.finish_prepare())
+                        self._result['added'] += 1
+                    except Exception as e:
+                        self._result['errors'].append((path, e))
+                elif kind == 'error':
+                    self._result['errors'].append((path, payload))
+        except queue.Empty:
+            pass
+        if self.on_progress:
+            self.on_progress(self._done, len(self.paths))
+
+        if self._done >= len(self.paths):
+            self._running = False
+            self._executor.shutdown(wait=False)
+            self._result['cancelled'] = self._cancel_event.is_set()
+            if self.on_done:
+                self.on_done(self._result)
+            return
+        try:
+            self.widget.after(POLL_INTERVAL_MS, self._poll)
+        except Exception: # 창이 닫힌 경우
+            self._executor.shutdown(wait=False, cancel_futures=True)
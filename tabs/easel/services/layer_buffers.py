@@ -0,0 +1,102 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from PIL import Image
+
+# 이미지 레이어 픽셀 버퍼 전체에 허용하는 메모리 (MB, 환경 변수로 변경 가능)
+LAYER_BUFFER_BUDGET_MB = int(os.environ.get("CITRUS_LAYER_MEMORY_MB", "1024"))
+# 표시용 이미지를 내려놓으면 그 축소 단계도 함께 사라짐
+DEPENDENT_LEVELS = {'display': ('mips',)}
+
+
+def image_nbytes(image: Image.Image | None) -> int:
+    return image.width * image.height * len(image.getbands()) if image is not None else 0
+
+
+class LayerBufferManager:
+    """
+    이미지 레이어의 픽셀 버퍼(original/save/display/mips) 사용량을 모아, 합계가 budget_bytes 를 넘으면
+    가장 오래 사용하지 않은 버퍼부터 레이어의 release_buffer(level) 로 내려놓게 합니다.
+    내려놓은 버퍼는 다음에 필요할 때 레이어가 원본 파일(또는 디스크 파생 캐시)에서 다시 만듭니다.
+    파일에서 다시 만들 수 없는 버퍼(배경 제거 결과 등)를 가진 레이어는 pin 되어 내려놓지 않습니다.
+    register 된 레이어만 관리하므로 내보내기용 스냅샷 사본은 계산에 들어가지 않습니다. 작업 스레드에서도 호출됩니다.
+    """
+    def __init__(self, budget_bytes: int = LAYER_BUFFER_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.RLock()
+        self._usage = weakref.WeakKeyDictionary() # 레이어 -> {level: 바이트}
+        self._lru: OrderedDict = OrderedDict() # (id(레이어), level) -> weakref (오래 사용하지 않은 것부터)
+        self._pinned = weakref.WeakSet()
+        self.evictions = 0
+
+    def register(self, layer):
+        with self._lock:
+            self._usage.setdefault(layer, {})
+
+    def forget(self, layer):
+        """삭제된 레이어를 계산에서 뺍니다."""
+        with self._lock:
+            for level in self._usage.pop(layer, {}):
+                self._lru.pop((id(layer), level), None)
+            self._pinned.discard(layer)
+
+    def pin(self, layer):
+        self._pinned.add(layer)
+
+    def is_pinned(self, layer) -> bool:
+        return layer in self._pinned
+
+    def touch(self, layer, level: str, nbytes: int):
+        """layer 의 level 버퍼가 방금 사용됐음을 기록합니다. 크기가 늘어 예산을 넘으면 다른 버퍼를 내려놓습니다."""
+        with self._lock:
+            usage = self._usage.get(layer)
+            if usage is None:
+                return # 관리하지 않는 레이어 (스냅샷 사본, 준비 중인 레이어)
+            key = (id(layer), level)
+            if key in self._lru and usage.get(level) == nbytes:
+                self._lru.move_to_end(key)
+                return
+            usage[level] = nbytes
+            self._lru[key] = weakref.ref(layer)
+            self._lru.move_to_end(key)
+            victims = self._select_victims(key)
+        # 레이어는 release_buffer 에서 자신의 디코딩 잠금을 잡으므로 관리자 잠금 밖에서 호출
+        for victim, victim_level in victims:
+            victim.release_buffer(victim_level)
+
+    def _select_victims(self, keep_key) -> list[tuple]:
+        total = self.total_bytes
+        victims = []
+        for key in list(self._lru):
+            if total <= self.budget_bytes:
+                break
+            ref = self._lru.get(key) # 함께 내려놓은 의존 레벨은 이미 빠져 있을 수 있음
+            if ref is None or key == keep_key:
+                continue
+            layer = ref()
+            if layer is None or layer not in self._usage:
+                del self._lru[key]
+                continue
+            if layer in self._pinned:
+                continue
+            del self._lru[key]
+            usage = self._usage[layer]
+            for level in (key[1],) + DEPENDENT_LEVELS.get(key[1], ()):
+                total -= usage.pop(level, 0)
+                self._lru.pop((id(layer), level), None)
+            victims.append((layer, key[1]))
+            self.evictions += 1
+        return victims
+
+    def layer_bytes(self, layer) -> int:
+        with self._lock:
+            return sum(self._usage.get(layer, {}).values())
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(sum(usage.values()) for usage in self._usage.values())
+
+
+layer_buffers = LayerBufferManager()
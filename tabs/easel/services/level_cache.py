@@ -0,0 +1,36 @@
+from PIL import Image
+
+class LevelCache:
+    """
+    한 번의 내보내기 작업 동안 원본 이미지와 그 축소본(레벨)을 공유하는 캐시.
+    여러 출력 크기를 큰 것부터 렌더링하면, 작은 출력은 원본 대신 이미 만들어 둔
+    가장 작은 '충분히 큰' 축소본에서 리샘플링됩니다.
+    반환된 이미지는 캐시와 공유되므로 호출자는 수정하지 말아야 합니다.
+    """
+    def __init__(self):
+        self._levels: dict[tuple, list[Image.Image]] = {}
+        self._sources: dict[tuple, Image.Image] = {} # id() 재사용을 막기 위해 원본 참조 유지
+
+    def resize(self, image: Image.Image, size: tuple[int, int], box=None,
+               resample=Image.Resampling.LANCZOS) -> Image.Image:
+        key = (id(image), tuple(box) if box else None)
+        self._sources[key] = image
+        levels = self._levels.setdefault(key, [])
+
+        for level in levels:
+            if level.size == size:
+                return level
+
+        candidates = [l for l in levels if l.width >= size[0] and l.height >= size[1]]
+        if candidates:
+            source = min(candidates, key=lambda l: l.width * l.height)
+            result = source.resize(size, resample)
+        else:
+            result = image.resize(size, resample, box=box)
+
+        levels.append(result)
+        return result
+
+    def clear(self):
+        self._levels.clear()
+        self._sources.clear()
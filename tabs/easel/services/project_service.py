@@ -43,20 +43,7 @@ class ProjectService:
             return None
 
         try:
-            with open(path, 'rb') as f:
-                project_data = pickle.load(f)
-
-            if 'global_settings' in project_data and 'settings' not in project_data:
-                project_data['settings'] = project_data.pop('global_settings')
-
-            deserialized_layers = []
-            for layer_data in project_data.get('layers', []):
-                layer = ProjectService._deserialize_layer(layer_data)
-                if layer:
-                    deserialized_layers.append(layer)
-            project_data['layers'] = deserialized_layers
-            project_data['path'] = path
-
+            project_data = ProjectService.read_project_file(path)
             messagebox.showinfo("성공", "프로젝트를 성공적으로 불러왔습니다.")
             return project_data
 
@@ -64,6 +51,28 @@ class ProjectService:
             messagebox.showerror("불러오기 오류", f"프로젝트 파일을 불러오는 중 오류가 발생했습니다:\n{e}")
             return None
 
+    @staticmethod
+    def read_project_file(path: str, on_missing_file=None) -> dict:
+        """
+        대화상자 없이 .wsb 파일을 읽어 레이어까지 복원합니다. (헤드리스 환경에서도 사용)
+        이미지 파일이 없으면 on_missing_file(path) 를 호출하고, 지정하지 않으면 경고창을 띄웁니다.
+        오류는 호출자에게 예외로 전달됩니다.
+        """
+        with open(path, 'rb') as f:
+            project_data = pickle.load(f)
+
+        if 'global_settings' in project_data and 'settings' not in project_data:
+            project_data['settings'] = project_data.pop('global_settings')
+
+        deserialized_layers = []
+        for layer_data in project_data.get('layers', []):
+            layer = ProjectService._deserialize_layer(layer_data, on_missing_file)
+            if layer:
+                deserialized_layers.append(layer)
+        project_data['layers'] = deserialized_layers
+        project_data['path'] = path
+        return project_data
+
     @staticmethod
     def _serialize_layer(layer: Layer) -> dict:
         data = {
@@ -75,7 +84,7 @@ class ProjectService:
             'scale': layer.scale_var.get(),
         }
         if isinstance(layer, ImageLayer):
-            data.update({'crop_box': layer.crop_box})
+            data.update({'crop_box': layer.crop_box, 'trim_tolerance': layer.trim_tolerance})
         elif isinstance(layer, TextLayer):
             data.update({'text': layer.text, 'font_family': layer.font_family, 'color': layer.color})
         elif isinstance(layer, ShapeLayer):
@@ -83,7 +92,7 @@ class ProjectService:
         return data
 
     @staticmethod
-    def _deserialize_layer(data: dict) -> Layer | None:
+    def _deserialize_layer(data: dict, on_missing_file=None) -> Layer | None:
         class_name = None
         if '__class__' in data:
             class_name = data.pop('__class__')
@@ -102,9 +111,14 @@ class ProjectService:
                 if not img_path: print(f"ImageLayer에 'path' 키가 없습니다."); return None
                 normalized_path = os.path.normpath(img_path)
                 if not os.path.exists(normalized_path):
-                    messagebox.showwarning("파일 누락", f"이미지 파일을 찾을 수 없습니다:\n{normalized_path}")
+                    if on_missing_file:
+                        on_missing_file(normalized_path)
+                    else:
+                        messagebox.showwarning("파일 누락", f"이미지 파일을 찾을 수 없습니다:\n{normalized_path}")
                     return None
                 layer = ImageLayer(normalized_path)
+                # crop_box/크기는 저장 당시의 표시용 좌표 기준: 같은 잘라내기로 불러오고, 키가 없는 이전 프로젝트는 잘라내기 없이
+                layer.trim_tolerance = data.get('trim_tolerance')
                 layer.crop_box = data.get('crop_box')
 
             elif class_name == 'TextLayer':
@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+from ..models.layer import Layer, ImageLayer, TextLayer, ShapeLayer
+
+EXPORT_RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DISPLAY_RENDER_CACHE_MAX_BYTES = 128 * 1024 * 1024
+TEXT_BITMAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SHAPE_BITMAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def image_nbytes(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+class RenderCache:
+    """
+    렌더링된 비트맵을 키(지문)별로 보관하는 LRU 캐시. 전체 크기가 max_bytes 를 넘으면
+    가장 오래 사용하지 않은 항목부터 제거합니다. 내보내기 작업 스레드에서도 사용하므로 잠금을 사용합니다.
+    저장된 이미지는 여러 렌더링이 공유하므로 호출자는 수정하지 말아야 합니다.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, image: Image.Image | None):
+        if image is None:
+            return
+        size = image_nbytes(image)
+        if size > self.max_bytes:
+            return # 캐시 전체보다 큰 비트맵은 보관하지 않음
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (image, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _key, (_image, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def layer_fingerprint(layer: Layer, canvas_w: int, canvas_h: int, settings: dict) -> tuple | None:
+    """
+    레이어 렌더링 결과에 영향을 주는 입력만 모은 캐시 키.
+    위치(rel_x/rel_y)는 포함하지 않으므로 이동만 한 레이어는 다시 렌더링되지 않습니다.
+    """
+    scale = round(float(layer.scale_var.get()), 4)
+    base = (type(layer).__name__, layer.path, getattr(layer, 'source_version', None),
+            scale, round(float(layer.angle), 4), canvas_w, canvas_h)
+
+    if isinstance(layer, ImageLayer):
+        crop_box = tuple(layer.crop_box) if layer.crop_box else None
+        return base + (crop_box, settings['logo_zone_height'])
+    if isinstance(layer, TextLayer):
+        return base + (layer.text, layer.font_family, layer.color)
+    if isinstance(layer, ShapeLayer):
+        return base + (layer.shape_type, layer.color)
+    return None
+
+
+def display_fingerprint(layer: Layer, target_w: int, target_h: int) -> tuple:
+    """
+    캔버스 표시용 비트맵의 캐시 키. 표시 크기(줌 반영)와 각도가 같으면 같은 비트맵을 재사용합니다.
+    source_version 은 전역 고유값이므로 배경 제거 등으로 원본이 바뀌면 이전 항목과 겹치지 않습니다.
+    """
+    crop_box = tuple(layer.crop_box) if getattr(layer, 'crop_box', None) else None
+    return (layer.path, getattr(layer, 'source_version', None), target_w, target_h,
+            round(float(layer.angle), 4), crop_box)
+
+
+export_render_cache = RenderCache(EXPORT_RENDER_CACHE_MAX_BYTES)
+display_render_cache = RenderCache(DISPLAY_RENDER_CACHE_MAX_BYTES)
+text_bitmap_cache = RenderCache(TEXT_BITMAP_CACHE_MAX_BYTES)
+shape_bitmap_cache = RenderCache(SHAPE_BITMAP_CACHE_MAX_BYTES)
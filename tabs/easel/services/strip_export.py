@@ -0,0 +1,256 @@
+import os
+import struct
+import zlib
+from PIL import Image
+
+from ..models.layer import TextLayer, ShapeLayer
+from .font_service import FontService
+from .shape_rasterizer import ShapeRasterizer
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+STRIP_HEIGHT = 256
+# 띠 렌더링에서 예상 위치보다 이만큼 먼저 레이어 자원을 만듦 (예상/실제 크기의 반올림 차이)
+STRIP_ITEM_MARGIN = 4
+# 이 픽셀 수 이상이면 한 장짜리 RGBA 대신 가로 띠(strip) 단위로 렌더링/인코딩
+STRIP_EXPORT_MIN_PIXELS = 4000 * 4000
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class PngStripWriter:
+    """
+    위에서부터 차례로 받은 띠 이미지를 PNG 파일로 바로 압축해 기록합니다.
+    전체 이미지를 메모리에 올리지 않으며, NumPy 가 있으면 Sub 필터를 적용해 압축률을 높입니다.
+    """
+    def __init__(self, path: str, width: int, height: int, mode: str = "RGBA", compress_level: int = 6):
+        if mode not in ("RGBA", "RGB"):
+            raise ValueError(f"지원하지 않는 PNG 모드: {mode}")
+        self.width, self.height, self.mode = width, height, mode
+        self.bpp = len(mode)
+        self.rows_written = 0
+        self.path = path
+        self._compressor = zlib.compressobj(compress_level)
+        self._file = open(path, "wb")
+        self._file.write(PNG_SIGNATURE)
+        color_type = 6 if mode == "RGBA" else 2
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+    def _filter_rows(self, strip: Image.Image) -> bytes:
+        h = strip.height
+        if NUMPY_AVAILABLE:
+            arr = np.asarray(strip, dtype=np.uint8).reshape(h, -1)
+            filtered = arr.copy()
+            filtered[:, self.bpp:] -= arr[:, :-self.bpp] # Sub 필터 (uint8 오버플로 = mod 256)
+            filter_bytes = np.ones((h, 1), dtype=np.uint8)
+            return np.concatenate([filter_bytes, filtered], axis=1).tobytes()
+
+        raw = strip.tobytes()
+        stride = self.width * self.bpp
+        return b"".join(b"\x00" + raw[i * stride:(i + 1) * stride] for i in range(h))
+
+    def write(self, strip: Image.Image):
+        if strip.mode != self.mode:
+            strip = strip.convert(self.mode)
+        if strip.width != self.width:
+            raise ValueError("띠 이미지의 너비가 출력 너비와 다릅니다.")
+        data = self._compressor.compress(self._filter_rows(strip))
+        if data:
+            self._write_chunk(b"IDAT", data)
+        self.rows_written += strip.height
+
+    def close(self):
+        try:
+            data = self._compressor.flush()
+            if data:
+                self._write_chunk(b"IDAT", data)
+            self._write_chunk(b"IEND", b"")
+        finally:
+            self._file.close()
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG 행 수 불일치: {self.rows_written}/{self.height}")
+
+    def abort(self):
+        """중단(취소, 오류) 시 행 수 검사 없이 파일을 닫고 덜 쓰인 파일을 지웁니다."""
+        self._file.close()
+        try: os.remove(self.path)
+        except OSError: pass
+
+
+class StripRenderer:
+    """
+    최종 이미지를 가로 띠 단위로 합성합니다. 각 띠에는 그 띠와 겹치는 레이어만 합성됩니다.
+    레이어의 위치/크기는 렌더링 없이 먼저 계산하고, 레이어의 자원(리샘플링할 원본 레벨, 텍스트/도형/로고 비트맵)은
+    그 레이어와 겹치는 첫 띠에서 만들고 마지막 띠를 지나면 해제합니다.
+    이미지 레이어/자유곡선은 띠에 해당하는 원본 영역만 리샘플링(회전 시 아핀 변환)하므로 전체 크기 비트맵을 만들지 않습니다.
+    따라서 한 시점의 메모리는 띠 하나와 그 띠에 걸친 레이어들의 자원으로 제한됩니다.
+    """
+    def __init__(self, settings: dict, layers: list, canvas_objects: dict):
+        # 순환 import 방지
+        from .image_service import ImageService
+        self._service = ImageService
+        self.settings = settings
+        self.width, self.height = settings['output_width'], settings['output_height']
+        self.bg_color = ImageService.parse_background_color(settings['background_color'])
+        self.items = self._build_items(layers, canvas_objects)
+
+    def _build_items(self, layers, canvas_objects) -> list:
+        """그리는 순서대로 {'kind', 'center', 'pos', 'size'} 목록. 자원은 _materialize 에서 만듭니다."""
+        items = []
+        w, h = self.width, self.height
+        for layer in layers:
+            if not layer.is_visible.get():
+                continue
+            obj_info = canvas_objects.get(layer.path)
+            if not obj_info:
+                continue
+            center = (obj_info['rel_x'] * w, obj_info['rel_y'] * h)
+
+            final_size = self._service._get_resample_size(layer, w, h, self.settings)
+            if final_size:
+                items.append(self._make_item('resample', layer, center, self._service.get_rotated_size(final_size, layer.angle)))
+            else:
+                size = self._estimate_bitmap_size(layer)
+                if size:
+                    items.append(self._make_item('bitmap', layer, center, size))
+
+        logo_info = self.settings.get('logo_info')
+        logo_size = self._service._get_logo_size(self.settings, h)
+        if logo_size:
+            center = (logo_info['rel_x'] * w, logo_info['rel_y'] * h)
+            items.append(self._make_item('logo', None, center, self._service.get_rotated_size(logo_size, logo_info.get('angle', 0.0))))
+        return items
+
+    @staticmethod
+    def _make_item(kind: str, layer, center: tuple[float, float], size: tuple[int, int]) -> dict:
+        pos = (int(center[0] - size[0] / 2), int(center[1] - size[1] / 2))
+        return {'kind': kind, 'layer': layer, 'center': center, 'pos': pos, 'size': size,
+                'ready': False, 'done': False, 'source': None, 'box': None, 'matrix': None, 'bitmap': None}
+
+    def _estimate_bitmap_size(self, layer) -> tuple[int, int] | None:
+        """텍스트/도형 비트맵의 크기를 그리지 않고 계산합니다."""
+        scale = layer.scale_var.get()
+        if isinstance(layer, TextLayer):
+            if int(scale) < 1:
+                return None
+            bbox = FontService.get_text_bbox(layer.text, layer.font_family, int(scale))
+            size = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+            if size[0] <= 0 or size[1] <= 0:
+                return None
+            return self._service.get_rotated_size(size, layer.angle) if layer.angle != 0 else size
+        if isinstance(layer, ShapeLayer) and layer.shape_type != '자유곡선':
+            return ShapeRasterizer.get_size(layer.shape_type, scale, layer.angle) if scale >= 1 else None
+        return None
+
+    def _materialize(self, item: dict):
+        """띠가 처음 닿은 레이어의 자원을 만들고, 실제 크기로 위치를 다시 맞춥니다."""
+        item['ready'] = True
+        w, h = self.width, self.height
+        layer, (center_x, center_y) = item['layer'], item['center']
+        if item['kind'] == 'resample':
+            plan = self._service._get_resample_plan(layer, w, h, self.settings)
+            if not plan:
+                item['done'] = True
+                return
+            source, box, final_size = plan
+            if layer.angle % 360.0 != 0:
+                # 회전된 레이어: 확대/축소+회전 아핀 행렬을 띠마다 해당 영역만 평가
+                source, item['matrix'], size = self._service.get_affine_plan(source, final_size, layer.angle, box)
+            else:
+                box, size = box or (0, 0, source.width, source.height), final_size
+            item.update(source=source, box=box, size=size)
+        else:
+            if item['kind'] == 'logo':
+                logo = self._service._render_logo_to_pil(self.settings, w, h)
+                bitmap = logo[0] if logo else None
+            else:
+                bitmap = self._service._render_layer_to_pil(layer, w, h, self.settings)
+            if bitmap is None:
+                item['done'] = True
+                return
+            item.update(bitmap=bitmap, size=bitmap.size)
+        item['pos'] = (int(center_x - item['size'][0] / 2), int(center_y - item['size'][1] / 2))
+
+    def render_strip(self, top: int, strip_h: int) -> Image.Image:
+        strip = Image.new("RGBA", (self.width, strip_h), self.bg_color)
+        bottom = top + strip_h
+        for item in self.items:
+            if item['done']:
+                continue
+            x, y = item['pos']
+            item_w, item_h = item['size']
+            if not item['ready']:
+                # 예상 크기와 실제 크기의 반올림 차이를 여유로 흡수
+                if y - STRIP_ITEM_MARGIN >= bottom:
+                    continue
+                self._materialize(item)
+                if item['done']:
+                    continue
+                x, y = item['pos']
+                item_w, item_h = item['size']
+            if y + item_h <= top: # 캔버스 위쪽 밖에서 끝나는 레이어
+                item.update(done=True, source=None, bitmap=None)
+                continue
+            if y >= bottom:
+                continue
+
+            if item['bitmap'] is not None:
+                self._service._composite_clipped(strip, item['bitmap'], (x, y - top))
+            else:
+                # 띠와 겹치는 레이어 행/열만 원본 영역을 계산해 리샘플링
+                row0, row1 = max(top, y) - y, min(bottom, y + item_h) - y
+                col0, col1 = max(0, x) - x, min(self.width, x + item_w) - x
+                if row1 > row0 and col1 > col0:
+                    part = self._service.resample_region(item['source'], item['size'], (col0, row0, col1, row1),
+                                                         box=item['box'], matrix=item['matrix'])
+                    self._service._composite_clipped(strip, part, (x + col0, y + row0 - top))
+            if y + item_h <= bottom:
+                # 이후 띠와 겹치지 않으므로 자원 해제
+                item.update(done=True, source=None, bitmap=None)
+        return strip
+
+    def iter_strips(self, strip_height: int = STRIP_HEIGHT):
+        for top in range(0, self.height, strip_height):
+            yield top, self.render_strip(top, min(strip_height, self.height - top))
+
+
+def write_png_in_strips(settings: dict, layers: list, canvas_objects: dict, save_path: str,
+                        progress=None, strip_height: int = STRIP_HEIGHT):
+    """
+    띠 단위로 렌더링하면서 바로 PNG 로 압축해 기록합니다. 출력 전체 버퍼를 만들지 않으므로
+    최대 메모리는 띠 하나와 그 띠에 걸친 레이어 자원(StripRenderer 참고)으로, 출력 크기에 비례하지 않습니다.
+    """
+    renderer = StripRenderer(settings, layers, canvas_objects)
+    total = (renderer.height + strip_height - 1) // strip_height
+    writer = PngStripWriter(save_path, renderer.width, renderer.height, "RGBA")
+    try:
+        for index, (_top, strip) in enumerate(renderer.iter_strips(strip_height)):
+            if progress: progress(index, total)
+            writer.write(strip)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+
+def render_in_strips(settings: dict, layers: list, canvas_objects: dict, mode: str = "RGBA",
+                     progress=None, strip_height: int = STRIP_HEIGHT) -> Image.Image:
+    """
+    띠 단위로 렌더링해 mode 이미지 한 장에 모읍니다. 인코더가 전체 이미지를 요구하는 형식(JPG/WEBP/PNG8)용.
+    최대 메모리는 출력 버퍼 한 장(RGB 면 픽셀당 3바이트)에 띠 하나와 그 띠에 걸친 레이어 자원을 더한 만큼입니다.
+    """
+    renderer = StripRenderer(settings, layers, canvas_objects)
+    total = (renderer.height + strip_height - 1) // strip_height
+    canvas = Image.new(mode, (renderer.width, renderer.height))
+    for index, (top, strip) in enumerate(renderer.iter_strips(strip_height)):
+        if progress: progress(index, total)
+        canvas.paste(strip if mode == "RGBA" else strip.convert(mode), (0, top))
+    return canvas
@@ -0,0 +1,70 @@
+import math
+from PIL import Image
+
+from .image_service import ImageService
+from .render_cache import display_render_cache
+
+TILE_SIZE = 512
+# 표시용 비트맵이 이 픽셀 수를 넘으면 한 장 대신 타일로 나눠 보이는 부분만 렌더링
+TILED_DISPLAY_MIN_PIXELS = 2048 * 2048
+
+
+class TiledDisplay:
+    """
+    크게 확대된 레이어의 표시용 비트맵을 TILE_SIZE 타일로 나눠 필요한 타일만 렌더링합니다.
+    렌더링된 타일은 display_render_cache 에 (표시 지문, 타일 위치) 로 저장되므로 같은 배율로 돌아오면 재사용됩니다.
+    obj_info['pil_for_display'] 자리에 놓이는 대용 객체이기도 합니다. (width/height/size/mode/getpixel/convert)
+    render_tile 은 작업 스레드에서 호출될 수 있고, items(캔버스 타일 항목)는 메인 스레드에서만 다룹니다.
+    """
+    def __init__(self, fingerprint, source: Image.Image, size: tuple[int, int], angle: float, box=None):
+        self.fingerprint = fingerprint
+        self.items: dict[tuple[int, int], dict] = {}
+        if angle % 360.0 == 0:
+            self.source, self.matrix = source, None
+            self.box = box or (0, 0, source.width, source.height)
+            self.size = tuple(size)
+        else:
+            self.source, self.matrix, self.size = ImageService.get_affine_plan(source, size, angle, box)
+            self.box = None
+        self.width, self.height = self.size
+        self.mode = self.source.mode
+        self.columns = math.ceil(self.width / TILE_SIZE)
+        self.rows = math.ceil(self.height / TILE_SIZE)
+
+    @staticmethod
+    def needs_tiling(size: tuple[int, int]) -> bool:
+        return size[0] * size[1] > TILED_DISPLAY_MIN_PIXELS
+
+    def tile_rect(self, column: int, row: int) -> tuple[int, int, int, int]:
+        x0, y0 = column * TILE_SIZE, row * TILE_SIZE
+        return x0, y0, min(self.width, x0 + TILE_SIZE), min(self.height, y0 + TILE_SIZE)
+
+    def tiles_in_region(self, region: tuple[float, float, float, float]) -> list[tuple[int, int]]:
+        """표시 비트맵 좌표의 region (x0, y0, x1, y1) 과 겹치는 타일 (열, 행) 목록"""
+        x0, y0, x1, y1 = region
+        col0, col1 = max(0, int(x0 // TILE_SIZE)), min(self.columns, math.ceil(x1 / TILE_SIZE))
+        row0, row1 = max(0, int(y0 // TILE_SIZE)), min(self.rows, math.ceil(y1 / TILE_SIZE))
+        return [(column, row) for row in range(row0, row1) for column in range(col0, col1)]
+
+    def get_cached_tile(self, column: int, row: int) -> Image.Image | None:
+        return display_render_cache.get((self.fingerprint, 'tile', column, row))
+
+    def render_tile(self, column: int, row: int) -> Image.Image:
+        key = (self.fingerprint, 'tile', column, row)
+        tile = display_render_cache.get(key)
+        if tile is None:
+            tile = ImageService.resample_region(self.source, self.size, self.tile_rect(column, row),
+                                                box=self.box, matrix=self.matrix)
+            display_render_cache.put(key, tile)
+        return tile
+
+    def getpixel(self, xy: tuple[int, int]):
+        x, y = int(xy[0]), int(xy[1])
+        tile = self.render_tile(x // TILE_SIZE, y // TILE_SIZE)
+        return tile.getpixel((x % TILE_SIZE, y % TILE_SIZE))
+
+    def convert(self, mode: str):
+        # 색상 추출의 convert("RGBA").getpixel(...) 용도만 지원 (타일은 원본 모드 그대로 렌더링됨)
+        if mode != self.mode:
+            raise ValueError(f"타일 표시 이미지는 {mode} 변환을 지원하지 않습니다.")
+        return self